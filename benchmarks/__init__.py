@@ -0,0 +1,4 @@
+"""Benchmarks and load testing tools for monkalot.
+
+Nothing in here is imported by the bot itself.
+"""
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""A local stand-in for Twitch IRC and the web APIs the bot uses, for load and soak tests.
+
+The IRC server speaks enough of the Twitch dialect for the bot: capability
+negotiation, tags, JOIN/PART with membership, PING/PONG, and it generates chat
+from thousands of simulated chatters at a configurable rate, including raids,
+subgifts and emote floods. The HTTP server answers Helix, TMI, BTTV, FFZ, emoji and
+Hearthstone requests with canned json (see fixtures.py).
+
+Run from the repository root:
+
+    python3 -m benchmarks.fake_twitch --rate 50 --chatters 5000 \
+        --write-endpoints config/endpoints.json
+    python3 monkalot.py
+
+With --write-endpoints the server writes the endpoint overrides of bot/paths, which
+make the bot connect to it instead of Twitch. The file is removed again when the
+server stops.
+"""
+import argparse
+import json
+import logging
+import os
+from urllib.parse import urlsplit
+
+from twisted.internet import protocol, reactor, task
+from twisted.protocols.basic import LineReceiver
+from twisted.web import resource, server
+
+from benchmarks.fixtures import CannedApi, EMOJIS, TWITCH_EMOTES
+from benchmarks.traffic import TrafficGenerator
+
+SERVER_NAME = "tmi.twitch.tv"
+CAPABILITIES = {"twitch.tv/membership", "twitch.tv/commands", "twitch.tv/tags"}
+TICK = 0.1  # Seconds between two batches of generated traffic
+STATS_INTERVAL = 10
+
+
+class FakeTwitchIRC(LineReceiver):
+    """One connected IRC client."""
+
+    delimiter = b"\r\n"
+    MAX_LENGTH = 65536
+
+    def __init__(self):
+        self.nickname = None
+        self.capabilities = set()
+        self.channels = set()
+
+    def connectionMade(self):
+        """Register the client with the factory."""
+        self.factory.clients.append(self)
+
+    def connectionLost(self, reason=protocol.connectionDone):
+        """Unregister the client."""
+        if self in self.factory.clients:
+            self.factory.clients.remove(self)
+
+    def send(self, line):
+        """Send a line, dropping the tags if the client did not request them."""
+        if line.startswith("@") and "twitch.tv/tags" not in self.capabilities:
+            line = line.split(" ", 1)[1]
+        self.sendLine(line.encode("utf-8"))
+
+    def lineReceived(self, line):
+        """Handle a line sent by the client."""
+        line = line.decode("utf-8")
+        command, _, rest = line.partition(" ")
+        command = command.upper()
+        if command == "PASS":
+            pass
+        elif command == "NICK":
+            self.nickname = rest.strip().lower()
+            self.welcome()
+        elif command == "CAP":
+            requested = rest.split(":", 1)[-1].split()
+            ack = [c for c in requested if c in CAPABILITIES]
+            self.capabilities.update(ack)
+            if ack:
+                self.send(":{} CAP * ACK :{}".format(SERVER_NAME, " ".join(ack)))
+            nak = [c for c in requested if c not in CAPABILITIES]
+            if nak:
+                self.send(":{} CAP * NAK :{}".format(SERVER_NAME, " ".join(nak)))
+        elif command == "JOIN":
+            for channel in rest.split(","):
+                self.join(channel.strip())
+        elif command == "PART":
+            for channel in rest.split(","):
+                self.channels.discard(channel.strip())
+        elif command == "PING":
+            self.send(":{} PONG {} {}".format(SERVER_NAME, SERVER_NAME, rest))
+        elif command == "PONG":
+            pass
+        elif command == "PRIVMSG":
+            channel, _, text = rest.partition(" :")
+            self.factory.stats["replies"] += 1
+            logging.debug("[{}] {}: {}".format(channel, self.nickname, text))
+        else:
+            self.send(
+                ":{} 421 {} {} :Unknown command".format(
+                    SERVER_NAME, self.nickname, command
+                )
+            )
+
+    def welcome(self):
+        """Send the welcome messages Twitch sends after login."""
+        nick = self.nickname
+        for number, text in [
+            ("001", "Welcome, GLHF!"),
+            ("002", "Your host is " + SERVER_NAME),
+            ("003", "This server is rather new"),
+            ("004", "-"),
+            ("375", "-"),
+            ("372", "You are in a maze of twisty passages, all alike."),
+            ("376", ">"),
+        ]:
+            self.send(":{} {} {} :{}".format(SERVER_NAME, number, nick, text))
+
+    def join(self, channel):
+        """Join a channel and send the state messages Twitch sends on join."""
+        nick = self.nickname
+        self.channels.add(channel)
+        self.send(":{0}!{0}@{0}.{1} JOIN {2}".format(nick, SERVER_NAME, channel))
+        self.send(":{0}.{1} 353 {0} = {2} :{0}".format(nick, SERVER_NAME, channel))
+        self.send(
+            ":{0}.{1} 366 {0} {2} :End of /NAMES list".format(nick, SERVER_NAME, channel)
+        )
+        self.send(
+            "@badge-info=;badges=;color=;display-name={0};emote-sets=0;mod=0;"
+            "subscriber=0;user-type= :{1} USERSTATE {2}".format(
+                nick, SERVER_NAME, channel
+            )
+        )
+        self.send(
+            "@emote-only=0;followers-only=-1;r9k=0;slow=0;subs-only=0 "
+            ":{} ROOMSTATE {}".format(SERVER_NAME, channel)
+        )
+        self.factory.simulation.add_channel(channel)
+
+
+class Simulation:
+    """Generates chat traffic for every joined channel."""
+
+    def __init__(self, factory, args):
+        self.factory = factory
+        self.rate = args.rate
+        self.subgift_rate = args.subgift_rate
+        self.raid_every = args.raid_every
+        self.flood_every = args.flood_every
+        self.flood_size = args.flood_size
+        self.generator = TrafficGenerator([], chatters=args.chatters, seed=args.seed)
+        self.budget = {}
+        self.floods = []
+
+    @property
+    def chatters(self):
+        """Names of all simulated chatters."""
+        return self.generator.chatters
+
+    def add_channel(self, channel):
+        """Start generating traffic for a channel."""
+        if channel in self.budget:
+            return
+        self.generator.channels.append(channel)
+        self.budget[channel] = 0.0
+        # Let a part of the chatters join right away, like on a real stream start.
+        for user in self.generator.random.sample(
+            self.chatters, min(len(self.chatters), 200)
+        ):
+            self.broadcast(channel, self.generator.join(channel, user))
+
+    def broadcast(self, channel, line):
+        """Send a line to every client in the channel."""
+        for client in self.factory.clients:
+            if channel in client.channels:
+                client.send(line)
+                self.factory.stats["lines"] += 1
+
+    def tick(self):
+        """Send the traffic of one tick to every channel."""
+        rnd = self.generator.random
+        for channel in self.budget:
+            self.budget[channel] += self.rate * TICK
+            while self.budget[channel] >= 1:
+                self.budget[channel] -= 1
+                self.broadcast(channel, self.generator.line(channel))
+
+            if rnd.random() < self.subgift_rate * TICK:
+                donor, recipient = rnd.sample(self.chatters, 2)
+                self.broadcast(channel, self.generator.subgift(channel, donor, recipient))
+            if self.raid_every and rnd.random() < TICK / self.raid_every:
+                raider = rnd.choice(self.chatters)
+                viewers = rnd.randint(10, 5000)
+                self.broadcast(channel, self.generator.raid(channel, raider, viewers))
+            if self.flood_every and rnd.random() < TICK / self.flood_every:
+                self.floods.append([channel, rnd.choice(TWITCH_EMOTES + EMOJIS), 0])
+
+        # Emote floods are spread over a few seconds, on top of the normal rate.
+        for flood in list(self.floods):
+            channel, emote, sent = flood
+            batch = max(1, int(self.flood_size * TICK / 3))
+            for _ in range(min(batch, self.flood_size - sent)):
+                user = rnd.choice(self.chatters)
+                text = " ".join([emote] * rnd.randint(1, 3))
+                self.broadcast(channel, self.generator.privmsg(user, channel, text))
+            flood[2] = sent + batch
+            if flood[2] >= self.flood_size:
+                self.floods.remove(flood)
+
+    def ping(self):
+        """Ping all clients, like Twitch does every few minutes."""
+        for client in self.factory.clients:
+            client.send("PING :" + SERVER_NAME)
+
+
+class FakeTwitchFactory(protocol.ServerFactory):
+    """Creates FakeTwitchIRC connections and owns the simulation."""
+
+    protocol = FakeTwitchIRC
+
+    def __init__(self, args):
+        self.clients = []
+        self.stats = {"lines": 0, "replies": 0}
+        self.simulation = Simulation(self, args)
+
+    def report(self):
+        """Log throughput since the last report."""
+        logging.warning(
+            "{} clients, {} channels: sent {:.0f} lines/s, received {:.1f} replies/s".format(
+                len(self.clients),
+                len(self.simulation.budget),
+                self.stats["lines"] / STATS_INTERVAL,
+                self.stats["replies"] / STATS_INTERVAL,
+            )
+        )
+        self.stats["lines"] = 0
+        self.stats["replies"] = 0
+
+
+class CannedApiResource(resource.Resource):
+    """Serves canned json for all APIs, each under its own path prefix."""
+
+    isLeaf = True
+
+    def __init__(self, api):
+        super().__init__()
+        self.api = api
+
+    def render_GET(self, request):
+        """Answer a GET request."""
+        uri = request.uri.decode("utf-8")
+        split = urlsplit(uri)
+        path = split.path.lstrip("/")
+        if split.query:
+            path += "?" + split.query
+        name, _, rest = path.partition("/")
+        if name == "twitch":
+            name, _, rest = rest.partition("/")  # twitch/helix/...
+        elif name == "ffz":
+            rest = rest[len("room/") :]
+
+        payload = self.api.payload(name, rest)
+        request.setHeader(b"content-type", b"application/json")
+        if payload is None:
+            request.setResponseCode(404)
+            return json.dumps({"error": "Not Found", "status": 404}).encode("utf-8")
+        return json.dumps(payload).encode("utf-8")
+
+
+def remove_endpoints(path):
+    """Remove the endpoint overrides, so the bot connects to Twitch again."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def endpoints(host, irc_port, http_port):
+    """Return the endpoint overrides that point the bot at this server."""
+    base = "http://{}:{}/".format(host, http_port)
+    return {
+        "irc_host": host,
+        "irc_port": irc_port,
+        "tmi": base + "tmi/",
+        "twitch_api": base + "twitch/",
+        "oidc": base + "oidc/keys",
+        "bttv": base + "bttv/",
+        "ffz": base + "ffz/",
+        "hearthstone": base + "hearthstone/cards.collectible.json",
+        "emoji": base + "emoji/emoji.json",
+    }
+
+
+def main():
+    """Parse arguments and run the servers."""
+    parser = argparse.ArgumentParser(description="Run a fake Twitch for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--irc-port", type=int, default=6667)
+    parser.add_argument("--http-port", type=int, default=8081)
+    parser.add_argument(
+        "--chatters", type=int, default=2000, help="Number of simulated chatters."
+    )
+    parser.add_argument(
+        "--rate", type=float, default=10, help="Chat lines per second per channel."
+    )
+    parser.add_argument(
+        "--subgift-rate", type=float, default=0.05, help="Subgifts per second per channel."
+    )
+    parser.add_argument(
+        "--raid-every", type=float, default=300, help="Average seconds between raids."
+    )
+    parser.add_argument(
+        "--flood-every",
+        type=float,
+        default=120,
+        help="Average seconds between emote floods.",
+    )
+    parser.add_argument(
+        "--flood-size", type=int, default=300, help="Messages per emote flood."
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--write-endpoints",
+        default=None,
+        help="Where to write the endpoint overrides for the bot, e.g. "
+        "config/endpoints.json. Removed again on shutdown.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="[%(asctime)s] %(message)s")
+
+    factory = FakeTwitchFactory(args)
+    api = CannedApi(chatters=factory.simulation.chatters)
+
+    reactor.listenTCP(args.irc_port, factory, interface=args.host)
+    reactor.listenTCP(
+        args.http_port, server.Site(CannedApiResource(api)), interface=args.host
+    )
+    task.LoopingCall(factory.simulation.tick).start(TICK, now=False)
+    task.LoopingCall(factory.simulation.ping).start(300, now=False)
+    task.LoopingCall(factory.report).start(STATS_INTERVAL, now=False)
+
+    if args.write_endpoints:
+        os.makedirs(os.path.dirname(args.write_endpoints) or ".", exist_ok=True)
+        with open(args.write_endpoints, "w", encoding="utf-8") as file:
+            json.dump(endpoints(args.host, args.irc_port, args.http_port), file, indent=4)
+        logging.warning("Wrote endpoints to {}".format(args.write_endpoints))
+        # Left behind, it would make the next real bot connect to the fake server.
+        reactor.addSystemEventTrigger(
+            "before", "shutdown", remove_endpoints, args.write_endpoints
+        )
+
+    logging.warning(
+        "Fake Twitch running: irc on {0}:{1}, http on {0}:{2}".format(
+            args.host, args.irc_port, args.http_port
+        )
+    )
+    reactor.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Canned responses for every web API the bot talks to.
+
+Used to run the bot without network access. The payloads are small but have the
+same shape as the real ones, so every code path that parses them gets exercised.
+"""
+import zlib
+from datetime import datetime, timedelta
+
+from bot.paths import (
+    BTTV_API,
+    EMOJI_API,
+    FFZ_API,
+    HEARTHSTONE_CARD_API,
+    TWITCH_HELIX_API,
+    TWITCH_TMI,
+)
+
+# fmt: off
+TWITCH_EMOTES = [
+    "Kappa", "PogChamp", "DansGame", "EleGiggle", "WutFace", "BibleThump",
+    "4Head", "SMOrc", "KappaPride", "BabyRage", "MingLee", "FailFish", "Keepo",
+    "ResidentSleeper", "BrokeBack", "SwiftRage", "NotLikeThis", "CoolStoryBob",
+    "Kreygasm", "VoHiYo", "SeemsGood", "LUL", "Jebaited", "PJSalt", "TriHard",
+]
+BTTV_EMOTES = [
+    "FeelsBadMan", "FeelsGoodMan", "gachiGASM", "haHAA", "monkaS", "EZ",
+    "OMEGALUL", "FeelsOkayMan", "POGGERS", "COGGERS", "VapeNation", "SourPls",
+]
+FFZ_EMOTES = ["monkaW", "Pepega", "PepeHands", "WeirdChamp", "5Head"]
+EMOJIS = ["😂", "🤔", "😍", "🔥", "👍", "🍎", "🍍", "🍆", "🍋", "🍐", "🚮"]
+
+CARDS = [
+    {"dbfId": 559, "name": "Leeroy Jenkins", "type": "MINION", "cost": 5,
+     "attack": 6, "health": 2, "rarity": "LEGENDARY", "set": "EXPERT1",
+     "cardClass": "NEUTRAL", "text": "<b>Charge</b>. <b>Battlecry:</b> Summon two 1/1 Whelps for your opponent."},
+    {"dbfId": 1637, "name": "Ragnaros the Firelord", "type": "MINION", "cost": 8,
+     "attack": 8, "health": 8, "rarity": "LEGENDARY", "set": "EXPERT1",
+     "cardClass": "NEUTRAL", "text": "Can't attack. At the end of your turn, deal 8 damage to a random enemy."},
+    {"dbfId": 1986, "name": "Mal'Ganis", "type": "MINION", "cost": 9,
+     "attack": 9, "health": 7, "rarity": "LEGENDARY", "set": "GVG",
+     "cardClass": "WARLOCK", "text": "Your other Demons have +2/+2.\nYour hero is <b>Immune</b>."},
+    {"dbfId": 1004, "name": "Wisp", "type": "MINION", "cost": 0, "attack": 1,
+     "health": 1, "rarity": "COMMON", "set": "EXPERT1", "cardClass": "NEUTRAL"},
+    {"dbfId": 1369, "name": "Murloc Raider", "type": "MINION", "cost": 1,
+     "attack": 2, "health": 1, "rarity": "FREE", "set": "CORE", "cardClass": "NEUTRAL"},
+    {"dbfId": 315, "name": "Fireball", "type": "SPELL", "cost": 4, "rarity": "FREE",
+     "set": "CORE", "cardClass": "MAGE", "text": "Deal $6 damage."},
+    {"dbfId": 1363, "name": "Flamestrike", "type": "SPELL", "cost": 7, "rarity": "FREE",
+     "set": "CORE", "cardClass": "MAGE", "text": "Deal $4 damage to all enemy minions."},
+    {"dbfId": 2021, "name": "Fiery War Axe", "type": "WEAPON", "cost": 3, "attack": 3,
+     "durability": 2, "rarity": "FREE", "set": "CORE", "cardClass": "WARRIOR"},
+    {"dbfId": 43413, "name": "Deathstalker Rexxar", "type": "HERO", "cost": 6, "armor": 5,
+     "rarity": "LEGENDARY", "set": "ICECROWN", "cardClass": "HUNTER",
+     "text": "<b>Battlecry:</b> Deal 2 damage to all enemy minions."},
+    {"dbfId": 38318, "name": "Patches the Pirate", "type": "MINION", "cost": 1,
+     "attack": 1, "health": 1, "rarity": "LEGENDARY", "set": "GANGS",
+     "cardClass": "NEUTRAL", "text": "<b>Charge</b>"},
+]
+# fmt: on
+
+
+def user_id(login):
+    """Return a stable fake twitch id for a login name."""
+    return str(zlib.crc32(login.lower().encode("utf-8")))
+
+
+def _user(login):
+    return {"id": user_id(login), "login": login.lower(), "display_name": login}
+
+
+def _emote_list(names, key="code"):
+    return [{"id": str(i), key: name} for i, name in enumerate(names, 1)]
+
+
+def twitch_emote_ids():
+    """Map twitch emote names to the ids used in the 'emotes' IRC tag."""
+    return {name: str(i) for i, name in enumerate(TWITCH_EMOTES, 1)}
+
+
+class CannedApi:
+    """Produces canned json payloads for API requests.
+
+    Requests are identified by the API they go to and the rest of the url, e.g.
+    ("helix", "users?login=monkalot").
+    """
+
+    def __init__(self, chatters=(), live=True):
+        """Set the chatters returned by the userlist api and whether streams are live."""
+        self.chatters = list(chatters)
+        self.live = live
+
+    def payload(self, api, rest):
+        """Return the json payload for a request, or None if it is unknown."""
+        handler = getattr(self, "_" + api, None)
+        if handler is None:
+            return None
+        return handler(rest)
+
+    def _tmi(self, rest):
+        if rest.startswith("group/user/") and rest.endswith("/chatters"):
+            return {"chatter_count": len(self.chatters), "chatters": {"viewers": self.chatters}}
+        return None
+
+    def _helix(self, rest):
+        parts = rest.split("?", 1)[0].strip("/").split("/")
+        if rest.startswith("users?login="):
+            user = _user(rest[len("users?login="):])
+            return {"data": [user], "users": [user]}
+        if parts[0] == "users" and len(parts) == 3 and parts[2] == "emotes":
+            return {"emoticon_sets": {"0": _emote_list(TWITCH_EMOTES)}}
+        if parts[0] == "users" and len(parts) == 2:
+            return {"display_name": "user" + parts[1], "data": [{"id": parts[1]}]}
+        if parts[0] == "channels" and len(parts) == 2:
+            return {"data": [{"broadcaster_id": parts[1], "game_name": "Hearthstone"}]}
+        if parts[0] == "streams" and len(parts) == 2:
+            if not self.live:
+                return {"stream": None}
+            started = datetime.utcnow() - timedelta(hours=2, minutes=3)
+            created_at = started.strftime("%Y-%m-%dT%H:%M:%SZ")
+            return {"stream": {"average_fps": 59.94, "created_at": created_at}}
+        if rest == "chat/emotes/global":
+            return {"data": _emote_list(TWITCH_EMOTES, key="name")}
+        return None
+
+    def _bttv(self, rest):
+        if rest == "emotes":
+            return {"emotes": _emote_list(BTTV_EMOTES[:6])}
+        if rest.startswith("channels/"):
+            return {"emotes": _emote_list(BTTV_EMOTES[6:])}
+        return None
+
+    def _ffz(self, rest):
+        emoticons = [{"name": name} for name in FFZ_EMOTES]
+        return {"sets": {"1": {"emoticons": emoticons}}}
+
+    @staticmethod
+    def _hearthstone(_):
+        return CARDS
+
+    @staticmethod
+    def _emoji(_):
+        return [{"emoji": e} for e in EMOJIS] + [{"aliases": ["no_emoji"]}]
+
+
+# Where each API lives, as configured in bot.paths.
+API_BASES = [
+    ("tmi", TWITCH_TMI),
+    ("helix", TWITCH_HELIX_API),
+    ("bttv", BTTV_API),
+    ("ffz", FFZ_API.format("")),
+    ("hearthstone", HEARTHSTONE_CARD_API),
+    ("emoji", EMOJI_API),
+]
+
+
+def split_url(url):
+    """Split a full API url into (api, rest), or return (None, url) for unknown urls."""
+    for api, base in API_BASES:
+        if url.startswith(base):
+            return api, url[len(base):]
+    return None, url
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Compare the math parser of !calc with the pyparsing grammar it replaced.
+
+Expressions like the ones chat sends to !calc are evaluated by both parsers. The
+new parser is measured once with an empty cache (every expression parsed) and once
+with a warm cache (repeated expressions, as in chat). The old parser needs pyparsing,
+it is skipped if that is not installed. Expressions with different results are
+listed: the old grammar e.g. read the "e" of "exp" as Euler's number.
+
+Run from the repository root:
+
+    python3 -m benchmarks.math_parser
+    python3 -m benchmarks.math_parser --expressions 20000 --repeat 3
+"""
+import argparse
+import math
+import operator
+import random
+import time
+import warnings
+
+from bot.utilities.math_parser import NumericStringParser
+
+# Expressions as they were sent to !calc in chat
+CORPUS = [
+    "1+1",
+    "2+2*2",
+    "0.1 + 0.2",
+    "9^9",
+    "2^3^2",
+    "-2^2",
+    "(1+2)*3",
+    "100/3",
+    "1/0",
+    "sqrt(2)",
+    "log(5^2) + sin(pi/4)",
+    "cos(pi)",
+    "e^2",
+    "69 + 351",
+    "420 / 69",
+    "1337 * 7",
+    "sqrt(16) + sqrt(9)",
+    "factorial(10)",
+    "abs(-5) * 3",
+    "trunc(3.99) + round(2.5)",
+    "tan(pi/3)",
+    "log10(1000)",
+    "exp(1)",
+    "sgn(-3)",
+    "((((1+1)*2)+3)*4)",
+    "2.5e3 / 5",
+    "3 * (4 + 5) - 6 / 2",
+    "sin(pi/6)^2 + cos(pi/6)^2",
+    "asdf",
+    "1 +",
+]
+
+
+class PyparsingParser(object):
+    """The fourFn.py based parser !calc used before, for comparison."""
+
+    def __init__(self):
+        """Build the grammar."""
+        import pyparsing as pyp
+
+        point = pyp.Literal(".")
+        e = pyp.CaselessLiteral("E")
+        fnumber = pyp.Combine(
+            pyp.Word("+-" + pyp.nums, pyp.nums)
+            + pyp.Optional(point + pyp.Optional(pyp.Word(pyp.nums)))
+            + pyp.Optional(e + pyp.Word("+-" + pyp.nums, pyp.nums))
+        )
+        ident = pyp.Word(pyp.alphas, pyp.alphas + pyp.nums + "_$")
+        lpar = pyp.Literal("(").suppress()
+        rpar = pyp.Literal(")").suppress()
+        addop = pyp.Literal("+") | pyp.Literal("-")
+        multop = pyp.Literal("*") | pyp.Literal("/")
+        expop = pyp.Literal("^")
+        pi = pyp.CaselessLiteral("PI")
+        expr = pyp.Forward()
+        atom = (
+            (
+                pyp.Optional(pyp.oneOf("- +"))
+                + (pi | e | fnumber | ident + lpar + expr + rpar).setParseAction(
+                    self.push_first
+                )
+            )
+            | pyp.Optional(pyp.oneOf("- +")) + pyp.Group(lpar + expr + rpar)
+        ).setParseAction(self.push_u_minus)
+        factor = pyp.Forward()
+        factor << atom + pyp.ZeroOrMore(
+            (expop + factor).setParseAction(self.push_first)
+        )
+        term = factor + pyp.ZeroOrMore(
+            (multop + factor).setParseAction(self.push_first)
+        )
+        expr << term + pyp.ZeroOrMore((addop + term).setParseAction(self.push_first))
+        self.bnf = expr
+        self.opn = {
+            "+": operator.add,
+            "-": operator.sub,
+            "*": operator.mul,
+            "/": operator.truediv,
+            "^": operator.pow,
+        }
+        self.fn = {
+            "abs": abs,
+            "trunc": lambda a: int(a),
+            "round": round,
+            "sgn": lambda a: abs(a) > 1e-12 and a > 0 or 0,
+        }
+        for n in dir(math):
+            f = getattr(math, n)
+            if callable(f):
+                self.fn[n] = f
+        self.exprStack = []
+
+    def push_first(self, _, __, toks):
+        self.exprStack.append(toks[0])
+
+    def push_u_minus(self, _, __, toks):
+        if toks and toks[0] == "-":
+            self.exprStack.append("unary -")
+
+    def evaluate_stack(self, s):
+        op = s.pop()
+        if op == "unary -":
+            return -self.evaluate_stack(s)
+        if op in "+-*/^":
+            op2 = self.evaluate_stack(s)
+            op1 = self.evaluate_stack(s)
+            return self.opn[op](op1, op2)
+        elif op == "PI":
+            return math.pi
+        elif op == "E":
+            return math.e
+        elif op in self.fn:
+            return self.fn[op](self.evaluate_stack(s))
+        elif op[0].isalpha():
+            return 0
+        else:
+            return float(op)
+
+    def eval(self, num_string):
+        self.exprStack = []
+        self.bnf.parseString(num_string, True)
+        return self.evaluate_stack(self.exprStack[:])
+
+
+def run(parser, expressions):
+    """Evaluate all expressions, return (seconds per expression, results)."""
+    results = []
+    start = time.perf_counter()
+    for expression in expressions:
+        try:
+            results.append(parser.eval(expression))
+        except Exception as e:
+            results.append(type(e).__name__)
+    return (time.perf_counter() - start) / len(expressions), results
+
+
+def same(a, b):
+    """Return whether two results agree, errors only by being errors."""
+    if isinstance(a, str) or isinstance(b, str):
+        return isinstance(a, str) and isinstance(b, str)
+    return math.isclose(a, b, rel_tol=1e-12)
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the !calc math parser.")
+    parser.add_argument("--expressions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    expressions = [rng.choice(CORPUS) for _ in range(args.expressions)]
+
+    cold = warm = float("inf")
+    for _ in range(args.repeat):
+        nsp = NumericStringParser()
+        cold = min(cold, run(nsp, CORPUS)[0])
+        seconds, results = run(nsp, expressions)
+        warm = min(warm, seconds)
+    print("{:<20} {:>8.2f} us/expression".format("pratt (uncached)", cold * 1e6))
+    print("{:<20} {:>8.2f} us/expression".format("pratt (chat)", warm * 1e6))
+
+    warnings.simplefilter("ignore", DeprecationWarning)  # camelCase pyparsing names
+    try:
+        old = PyparsingParser()
+    except ImportError:
+        print("pyparsing is not installed, skipping the comparison.")
+        return
+    best = float("inf")
+    for _ in range(args.repeat):
+        seconds, old_results = run(old, expressions)
+        best = min(best, seconds)
+    print("{:<20} {:>8.2f} us/expression".format("pyparsing", best * 1e6))
+
+    differences = {
+        expression
+        for expression, new, previous in zip(expressions, results, old_results)
+        if not same(new, previous)
+    }
+    for expression in sorted(differences):
+        print("Different result for {!r}".format(expression))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Measure how much time the Pyramid command adds to every chat message.
+
+Pyramid matches every message, so its run method is on the path of all chat.
+Messages are generated like in replay.py and run through a real Pyramid of a real
+bot (with canned web data), without the rest of process_command.
+
+Run from the repository root:
+
+    python3 -m benchmarks.pyramid
+    python3 -m benchmarks.pyramid --messages 200000 --max-us 2
+"""
+import argparse
+import logging
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import CannedApi
+from benchmarks.replay import OfflineApi, create_channel_folder, create_client
+from benchmarks.traffic import TrafficGenerator
+
+CHANNEL = "#benchmark"
+
+
+def parsed_messages(client, generator, make_text, n):
+    """Return n (user, msg, tag_info) tuples, parsed like the IRC client does."""
+    messages = []
+    for _ in range(n):
+        user = generator.random.choice(generator.chatters)
+        line = generator.privmsg(user, CHANNEL, make_text())
+        tags, _, _, args = client.parsemsg(line)
+        messages.append((user, args[-1].strip(), client.parse_tag_for_chat_message(tags)))
+    return messages
+
+
+def time_per_message(bot, pyramid, messages, repeat):
+    """Return the best mean time per message in seconds over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for user, msg, tag_info in messages:
+            pyramid.run(bot, user, msg, tag_info)
+        best = min(best, (time.perf_counter() - start) / len(messages))
+    return best
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the Pyramid command.")
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--max-us",
+        type=float,
+        default=2.0,
+        help="Fail if ordinary chat takes longer than this per message (microseconds).",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    generator = TrafficGenerator([CHANNEL], seed=args.seed)
+    offline = OfflineApi(CannedApi(chatters=generator.chatters))
+    with tempfile.TemporaryDirectory() as root, offline.patch():
+        folder = create_channel_folder(root, CHANNEL)
+        client, _, bots = create_client([folder], exclude=["ChatterbotSpeech"])
+        bot = bots[0]
+        pyramid = next(c for c in bot.commands if c.__class__.__name__ == "Pyramid")
+        # Completed pyramids write to chat and give points, which is not measured here.
+        bot.write = lambda msg: None
+        bot.ranking.increment_points = lambda *args: None
+
+        cases = {
+            "chat": lambda: generator.chat_text(),
+            "emotes": lambda: " ".join(
+                [generator.random.choice(pyramid_emotes)]
+                * generator.random.randint(1, 3)
+            ),
+            "pyramids": lambda: generator.pyramid_text(CHANNEL),
+        }
+        pyramid_emotes = sorted(pyramid.non_twitch_emotes)
+
+        results = {}
+        for name, make_text in cases.items():
+            messages = parsed_messages(client, generator, make_text, args.messages)
+            results[name] = time_per_message(bot, pyramid, messages, args.repeat)
+            print("{:<10} {:>8.3f} us/message".format(name, results[name] * 1e6))
+        bot.terminate()
+
+    if results["chat"] * 1e6 > args.max_us:
+        print("Ordinary chat takes longer than {} us per message.".format(args.max_us))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
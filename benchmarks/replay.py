@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""Replay raw Twitch IRC traffic through the bot and measure how fast it gets processed.
+
+Lines are fed into a real MultiBotIRCClient with real TwitchBots, one per channel found
+in the traffic. Every web request is answered with canned data (see fixtures.py), so no
+network access is needed and the numbers only reflect the bot's own work.
+
+Run from the repository root:
+
+    python3 -m benchmarks.replay --synthetic 20000
+    python3 -m benchmarks.replay --input recorded_irc.log --allocations
+    python3 -m benchmarks.replay --json new.json --baseline old.json
+
+A recorded traffic file contains one raw IRC line per line, exactly as received from
+the server (including the '@tags' prefix).
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from unittest import mock
+
+import requests
+from twisted.internet.testing import StringTransport
+
+from benchmarks.fixtures import CannedApi, split_url
+from benchmarks.traffic import TrafficGenerator
+
+BOT_NAME = "monkalot"
+OWNER = "benchmark_owner"
+TEMPLATE_FOLDER = "channels/template"
+
+# Commands which can not run in a benchmark. ChatterbotSpeech trains on a corpus for
+# minutes before answering anything.
+DEFAULT_EXCLUDE = ["ChatterbotSpeech"]
+
+
+class FakeResponse:
+    """Stands in for requests.Response."""
+
+    def __init__(self, url, payload):
+        self.url = url
+        self.payload = payload
+        self.status_code = 404 if payload is None else 200
+
+    def json(self):
+        """Return the canned payload."""
+        if self.payload is None:
+            raise ValueError("No canned payload for {}".format(self.url))
+        return self.payload
+
+    def raise_for_status(self):
+        """Raise for urls without canned payload."""
+        if self.payload is None:
+            raise requests.HTTPError("404 for url: {}".format(self.url))
+
+
+class OfflineApi:
+    """Replaces requests.get with lookups into a CannedApi."""
+
+    def __init__(self, api):
+        self.api = api
+        self.requests = defaultdict(int)
+
+    def get(self, url, *_, **__):
+        """Answer a GET request."""
+        name, rest = split_url(url)
+        self.requests[name or "unknown"] += 1
+        payload = self.api.payload(name, rest) if name else None
+        return FakeResponse(url, payload)
+
+    def patch(self):
+        """Return a context manager in which requests.get is offline."""
+        return mock.patch("requests.get", new=self.get)
+
+
+class CommandStats:
+    """Counters and timings of a single command class."""
+
+    def __init__(self):
+        self.calls = 0
+        self.matched = 0
+        self.runs = 0
+        self.errors = 0
+        self.match_time = 0.0
+        self.run_time = 0.0
+        self.allocated = 0
+
+    def as_dict(self):
+        """Return the stats as dict for json output."""
+        return dict(self.__dict__)
+
+
+def _timed(function, stats, kind):
+    """Wrap a bound match or run method so it records its cost in stats."""
+
+    def wrapper(*args):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            result = function(*args)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if tracing:
+                stats.allocated += tracemalloc.get_traced_memory()[1] - before
+            if kind == "match":
+                stats.calls += 1
+                stats.match_time += elapsed
+            else:
+                stats.runs += 1
+                stats.run_time += elapsed
+        if kind == "match" and result:
+            stats.matched += 1
+        return result
+
+    return wrapper
+
+
+def instrument_commands(bots, stats):
+    """Wrap match and run of every command instance of the bots."""
+    for twitch_bot in bots:
+        for cmd in twitch_bot.commands:
+            cmd_stats = stats[cmd.__class__.__name__]
+            cmd.match = _timed(cmd.match, cmd_stats, "match")
+            cmd.run = _timed(cmd.run, cmd_stats, "run")
+
+
+def channels_in(lines):
+    """Return the channels messages in raw IRC lines are sent to."""
+    channels = []
+    for line in lines:
+        if line.startswith("@"):
+            line = line.split(" ", 1)[1]
+        for word in line.split(" ")[1:3]:
+            if word.startswith("#") and word not in channels:
+                channels.append(word)
+    return channels
+
+
+def line_kind(line):
+    """Return the IRC command of a raw line, e.g. 'privmsg'."""
+    if line.startswith("@"):
+        line = line.split(" ", 1)[1]
+    if line.startswith(":"):
+        line = line.split(" ", 1)[1]
+    return line.split(" ", 1)[0].lower()
+
+
+def create_channel_folder(root, channel):
+    """Create a bot folder for a channel from the template and return its path."""
+    path = os.path.join(root, channel[1:]) + "/"
+    shutil.copytree(TEMPLATE_FOLDER, path)
+    config_path = os.path.join(path, "configs", "bot_config.json")
+    with open(config_path, "r", encoding="utf-8") as file:
+        config = json.load(file)
+    config.update(
+        {
+            "channel": channel[1:],
+            "username": BOT_NAME,
+            "clientID": "benchmark",
+            "oauth_key": "oauth:benchmark",
+            "access_token": "benchmark",
+            "owner_list": [OWNER],
+        }
+    )
+    with open(config_path, "w", encoding="utf-8") as file:
+        json.dump(config, file, indent=4)
+    return path
+
+
+def create_client(folders, exclude):
+    """Create the bots and an IRC client connected to a fake transport."""
+    # Imported here, so the offline patch is active while everything gets set up.
+    import bot.commands
+    from bot.bot import TwitchBot
+    from bot.multibot_irc_client import MultiBotIRCClient
+
+    commands = [name for name in bot.commands.commands if name not in exclude]
+    with mock.patch.object(bot.commands, "commands", commands):
+        bots = [TwitchBot(folder) for folder in folders]
+
+    MultiBotIRCClient.bots = bots
+    client = MultiBotIRCClient()
+    client.tags = defaultdict(dict)
+    client.activity = dict()
+    transport = StringTransport()
+    client.makeConnection(transport)
+    for twitch_bot in bots:
+        twitch_bot.irc = client
+    transport.clear()
+    return client, transport, bots
+
+
+def percentile(values, p):
+    """Return the p-th percentile of a sorted list."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def replay(lines, exclude=DEFAULT_EXCLUDE, warmup=500, allocations=False):
+    """Replay lines through the bot and return the results as dict."""
+    channels = channels_in(lines)
+    if not channels:
+        raise ValueError("The traffic does not contain any channel messages.")
+
+    offline = OfflineApi(CannedApi(chatters=["chatter{}".format(i) for i in range(500)]))
+    with tempfile.TemporaryDirectory() as root, offline.patch():
+        folders = [create_channel_folder(root, c) for c in channels]
+        setup_start = time.perf_counter()
+        client, transport, bots = create_client(folders, exclude)
+        setup_time = time.perf_counter() - setup_start
+
+        for line in lines[:warmup]:
+            client.lineReceived(line.encode("utf-8"))
+        transport.clear()
+        offline.requests.clear()
+
+        stats = defaultdict(CommandStats)
+        instrument_commands(bots, stats)
+        if allocations:
+            tracemalloc.start()
+
+        latencies = defaultdict(list)
+        replies = 0
+        start = time.perf_counter()
+        for line in lines[warmup:]:
+            line_start = time.perf_counter()
+            client.lineReceived(line.encode("utf-8"))
+            latencies[line_kind(line)].append(time.perf_counter() - line_start)
+            if transport.io.tell() > 65536:
+                replies += transport.value().count(b"PRIVMSG")
+                transport.clear()
+        total_time = time.perf_counter() - start
+        replies += transport.value().count(b"PRIVMSG")
+
+        if allocations:
+            tracemalloc.stop()
+        for twitch_bot in bots:
+            twitch_bot.terminate()
+
+    every_latency = sorted(t for kind in latencies.values() for t in kind)
+    n = len(every_latency)
+    return {
+        "lines": n,
+        "channels": len(channels),
+        "setup_seconds": setup_time,
+        "seconds": total_time,
+        "lines_per_second": n / total_time if total_time else 0.0,
+        "p50_ms": percentile(every_latency, 50) * 1000,
+        "p99_ms": percentile(every_latency, 99) * 1000,
+        "max_ms": (every_latency[-1] if every_latency else 0.0) * 1000,
+        "kinds": {
+            kind: {
+                "lines": len(values),
+                "p50_ms": percentile(sorted(values), 50) * 1000,
+                "p99_ms": percentile(sorted(values), 99) * 1000,
+            }
+            for kind, values in latencies.items()
+        },
+        "commands": {name: s.as_dict() for name, s in stats.items()},
+        "replies": replies,
+        "upstream_requests": dict(offline.requests),
+    }
+
+
+def print_report(result, allocations=False):
+    """Print a human readable report."""
+    print(
+        "Replayed {lines} lines to {channels} channel(s) in {seconds:.2f}s "
+        "({lines_per_second:.0f} lines/s, setup took {setup_seconds:.2f}s)".format(
+            **result
+        )
+    )
+    print(
+        "Latency per line: p50 {p50_ms:.3f} ms, p99 {p99_ms:.3f} ms, "
+        "max {max_ms:.3f} ms".format(**result)
+    )
+    for kind, k in sorted(result["kinds"].items(), key=lambda x: -x[1]["lines"]):
+        print(
+            "  {:<12} {:>8} lines  p50 {:.3f} ms  p99 {:.3f} ms".format(
+                kind, k["lines"], k["p50_ms"], k["p99_ms"]
+            )
+        )
+
+    print("\nCommands, by total time:")
+    header = "  {:<20} {:>8} {:>8} {:>7} {:>7} {:>10} {:>10}".format(
+        "command", "calls", "matched", "runs", "errors", "match ms", "run ms"
+    )
+    if allocations:
+        header += " {:>10}".format("alloc KiB")
+    print(header)
+    commands = sorted(
+        result["commands"].items(),
+        key=lambda x: -(x[1]["match_time"] + x[1]["run_time"]),
+    )
+    for name, c in commands:
+        row = "  {:<20} {:>8} {:>8} {:>7} {:>7} {:>10.1f} {:>10.1f}".format(
+            name,
+            c["calls"],
+            c["matched"],
+            c["runs"],
+            c["errors"],
+            c["match_time"] * 1000,
+            c["run_time"] * 1000,
+        )
+        if allocations:
+            row += " {:>10.1f}".format(c["allocated"] / 1024)
+        print(row)
+
+    requests_made = ", ".join(
+        "{} {}".format(n, api) for api, n in sorted(result["upstream_requests"].items())
+    )
+    print("\nBot replies: {}".format(result["replies"]))
+    print("Upstream requests: {}".format(requests_made or "none"))
+
+
+def compare(result, baseline, tolerance):
+    """Compare against a baseline result, return a list of regressions."""
+    regressions = []
+    if result["lines_per_second"] < baseline["lines_per_second"] * (1 - tolerance):
+        regressions.append(
+            "throughput dropped from {:.0f} to {:.0f} lines/s".format(
+                baseline["lines_per_second"], result["lines_per_second"]
+            )
+        )
+    if result["p99_ms"] > baseline["p99_ms"] * (1 + tolerance):
+        regressions.append(
+            "p99 latency rose from {:.3f} to {:.3f} ms".format(
+                baseline["p99_ms"], result["p99_ms"]
+            )
+        )
+    return regressions
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description="Replay IRC traffic through the bot.")
+    parser.add_argument("--input", help="File with recorded raw IRC lines.")
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=20000,
+        help="Number of synthetic lines to generate if no input is given.",
+    )
+    parser.add_argument(
+        "--channels", type=int, default=1, help="Channels for synthetic traffic."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for synthetic traffic.")
+    parser.add_argument(
+        "--warmup", type=int, default=500, help="Lines replayed before measuring."
+    )
+    parser.add_argument(
+        "--allocations",
+        action="store_true",
+        help="Trace memory allocations per command (slows everything down).",
+    )
+    parser.add_argument(
+        "--exclude",
+        nargs="*",
+        default=DEFAULT_EXCLUDE,
+        help="Command classes not to load.",
+    )
+    parser.add_argument("--json", help="Write the results to this file.")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare to.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Allowed relative regression against the baseline.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.input:
+        with open(args.input, "r", encoding="utf-8") as file:
+            lines = [line.rstrip("\r\n") for line in file if line.strip()]
+    else:
+        channels = ["#benchmark{}".format(i) for i in range(args.channels)]
+        generator = TrafficGenerator(channels, seed=args.seed, bot_name=BOT_NAME)
+        lines = list(generator.lines(args.synthetic + args.warmup))
+
+    result = replay(lines, args.exclude, args.warmup, args.allocations)
+    print_report(result, args.allocations)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(result, baseline, args.tolerance)
+        for regression in regressions:
+            print("REGRESSION: " + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
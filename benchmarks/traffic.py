@@ -0,0 +1,266 @@
+"""Generates synthetic raw Twitch IRC traffic.
+
+Lines look like what irc.chat.twitch.tv sends once the membership, commands and tags
+capabilities are requested: PRIVMSG with tags, USERNOTICE (subs, subgifts, raids),
+CLEARCHAT, JOIN and PART.
+"""
+import random
+import time
+import uuid
+
+from benchmarks.fixtures import (
+    BTTV_EMOTES,
+    CARDS,
+    EMOJIS,
+    FFZ_EMOTES,
+    TWITCH_EMOTES,
+    twitch_emote_ids,
+    user_id,
+)
+
+SUB_PLANS = ["Prime", "1000", "2000", "3000"]
+
+# fmt: off
+CHAT_WORDS = [
+    "hello", "chat", "what", "is", "this", "deck", "lol", "nice", "play", "gg",
+    "wp", "why", "would", "you", "do", "that", "streamer", "is", "tilted", "again",
+]
+
+COMMANDS = [
+    "!rank", "!topspammers", "!quote", "!quote 1", "!smorc", "!kpm", "!tkp",
+    "!calc (5+7)/2", "!calc log(5^2) + sin(pi/4)", "!fps", "!uptime", "!bttv",
+    "!total Kappa", "!minute LUL", "!ping", "!triggered",
+]
+# fmt: on
+
+
+def escape_tag(value):
+    """Escape a tag value as described in the IRCv3 message-tags spec."""
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\:")
+        .replace(" ", "\\s")
+        .replace("\r", "\\r")
+        .replace("\n", "\\n")
+    )
+
+
+def format_tags(tags):
+    """Format a tag dict into the '@key=value;...' prefix of an IRC line."""
+    return "@" + ";".join("{}={}".format(k, escape_tag(v)) for k, v in tags.items())
+
+
+class TrafficGenerator:
+    """Builds raw IRC lines for a set of channels and chatters."""
+
+    def __init__(self, channels, chatters=500, seed=None, bot_name="monkalot"):
+        """Create the chatter population.
+
+        channels: list of channels, including the leading '#'.
+        """
+        self.random = random.Random(seed)
+        self.channels = list(channels)
+        self.bot_name = bot_name
+        self.chatters = ["chatter{}".format(i) for i in range(chatters)]
+        self.mods = set(self.random.sample(self.chatters, max(1, chatters // 50)))
+        self.subs = set(self.random.sample(self.chatters, chatters // 5))
+        self.emote_ids = twitch_emote_ids()
+        self.pyramids = {}
+
+    # --- raw lines ---
+
+    def privmsg(self, user, channel, text):
+        """Return a PRIVMSG line with tags for a chat message."""
+        tags = {
+            "badges": self._badges(user),
+            "color": "#1E90FF",
+            "display-name": user.capitalize(),
+            "emotes": self._emote_tag(text),
+            "id": str(uuid.UUID(int=self.random.getrandbits(128))),
+            "mod": "1" if user in self.mods else "0",
+            "room-id": user_id(channel[1:]),
+            "subscriber": "1" if user in self.subs else "0",
+            "tmi-sent-ts": str(int(time.time() * 1000)),
+            "turbo": "0",
+            "user-id": user_id(user),
+            "user-type": "mod" if user in self.mods else "",
+        }
+        words = text.split(" ")
+        if words and all(w in self.emote_ids for w in words):
+            tags["emote-only"] = "1"
+        prefix = "{0}!{0}@{0}.tmi.twitch.tv".format(user)
+        return "{} :{} PRIVMSG {} :{}".format(format_tags(tags), prefix, channel, text)
+
+    def usernotice(self, channel, msg_id, tags, text=None):
+        """Return a USERNOTICE line of the given msg-id."""
+        tags = dict(tags)
+        tags["msg-id"] = msg_id
+        tags.setdefault("room-id", user_id(channel[1:]))
+        line = "{} :tmi.twitch.tv USERNOTICE {}".format(format_tags(tags), channel)
+        if text:
+            line += " :" + text
+        return line
+
+    def sub(self, channel, user, months=1):
+        """Return a sub (or resub) notice."""
+        plan = self.random.choice(SUB_PLANS)
+        tags = {
+            "display-name": user.capitalize(),
+            "login": user,
+            "msg-param-months": str(months),
+            "msg-param-sub-plan": plan,
+            "system-msg": "{} subscribed with {}.".format(user, plan),
+            "user-id": user_id(user),
+        }
+        msg_id = "sub" if months <= 1 else "resub"
+        text = "PogChamp" if msg_id == "resub" else None
+        return self.usernotice(channel, msg_id, tags, text)
+
+    def subgift(self, channel, donor, recipient, months=1):
+        """Return a subgift notice."""
+        plan = self.random.choice(SUB_PLANS[1:])
+        tags = {
+            "display-name": donor.capitalize(),
+            "login": donor,
+            "msg-param-months": str(months),
+            "msg-param-recipient-display-name": recipient.capitalize(),
+            "msg-param-recipient-user-name": recipient,
+            "msg-param-sub-plan": plan,
+            "system-msg": "{} gifted a sub to {}!".format(donor, recipient),
+            "user-id": user_id(donor),
+        }
+        return self.usernotice(channel, "subgift", tags)
+
+    def raid(self, channel, raider, viewers):
+        """Return a raid notice."""
+        tags = {
+            "display-name": raider.capitalize(),
+            "login": raider,
+            "msg-param-displayName": raider.capitalize(),
+            "msg-param-viewerCount": str(viewers),
+            "system-msg": "{} raiders from {} have joined!".format(viewers, raider),
+            "user-id": user_id(raider),
+        }
+        return self.usernotice(channel, "raid", tags)
+
+    @staticmethod
+    def clearchat(channel, user=None, duration=600):
+        """Return a CLEARCHAT line, either for a timeout or a full clear."""
+        if user is None:
+            return ":tmi.twitch.tv CLEARCHAT {}".format(channel)
+        tags = {"ban-duration": str(duration), "target-user-id": user_id(user)}
+        return "{} :tmi.twitch.tv CLEARCHAT {} :{}".format(
+            format_tags(tags), channel, user
+        )
+
+    @staticmethod
+    def join(channel, user):
+        """Return a JOIN line."""
+        return ":{0}!{0}@{0}.tmi.twitch.tv JOIN {1}".format(user, channel)
+
+    @staticmethod
+    def part(channel, user):
+        """Return a PART line."""
+        return ":{0}!{0}@{0}.tmi.twitch.tv PART {1}".format(user, channel)
+
+    # --- message content ---
+
+    def chat_text(self):
+        """Return a random chat message, shaped like what chat usually sends."""
+        roll = self.random.random()
+        if roll < 0.35:
+            words = self.random.choices(CHAT_WORDS, k=self.random.randint(1, 12))
+            if self.random.random() < 0.5:
+                words.append(self.random.choice(TWITCH_EMOTES + BTTV_EMOTES))
+            return " ".join(words)
+        if roll < 0.55:
+            emote = self.random.choice(TWITCH_EMOTES + BTTV_EMOTES + FFZ_EMOTES)
+            return " ".join([emote] * self.random.randint(1, 4))
+        if roll < 0.65:
+            return self.random.choice(COMMANDS)
+        if roll < 0.70:
+            return "[{}]".format(self._misspell(self.random.choice(CARDS)["name"]))
+        if roll < 0.75:
+            return self.random.choice(EMOJIS)
+        if roll < 0.78:
+            return "@{} what is {}+{}?".format(
+                self.bot_name, self.random.randint(1, 99), self.random.randint(1, 99)
+            )
+        # Copypasta, which is what the spam command reacts to.
+        return "{0} {0} chat is spamming again {0}".format(
+            self.random.choice(TWITCH_EMOTES)
+        )
+
+    def pyramid_text(self, channel):
+        """Return the next level of an emote pyramid that is being built in a channel."""
+        emote, levels = self.pyramids.get(channel, (None, []))
+        if not levels:
+            emote = self.random.choice(TWITCH_EMOTES + BTTV_EMOTES)
+            top = self.random.randint(2, 5)
+            levels = list(range(1, top + 1)) + list(range(top - 1, 0, -1))
+        level = levels.pop(0)
+        self.pyramids[channel] = (emote, levels)
+        return " ".join([emote] * level)
+
+    def _badges(self, user):
+        badges = []
+        if user in self.mods:
+            badges.append("moderator/1")
+        if user in self.subs:
+            badges.append("subscriber/12")
+        return ",".join(badges)
+
+    def _emote_tag(self, text):
+        """Build the 'emotes' tag, e.g. '25:0-4,12-16/1902:6-10'."""
+        positions = {}
+        start = 0
+        for word in text.split(" "):
+            if word in self.emote_ids:
+                emote_id = self.emote_ids[word]
+                span = "{}-{}".format(start, start + len(word) - 1)
+                positions.setdefault(emote_id, []).append(span)
+            start += len(word) + 1
+        return "/".join(
+            "{}:{}".format(emote_id, ",".join(spans))
+            for emote_id, spans in positions.items()
+        )
+
+    def _misspell(self, name):
+        """Introduce up to two typos in a name."""
+        name = list(name.lower())
+        for _ in range(self.random.randint(0, 2)):
+            i = self.random.randrange(len(name))
+            name[i] = self.random.choice("abcdefghijklmnopqrstuvwxyz")
+        return "".join(name)
+
+    # --- mixed traffic ---
+
+    def line(self, channel=None):
+        """Return one random line, mostly chat messages with the occasional event.
+
+        If no channel is given, a random one is chosen.
+        """
+        channel = channel or self.random.choice(self.channels)
+        user = self.random.choice(self.chatters)
+        roll = self.random.random()
+        if roll < 0.90:
+            return self.privmsg(user, channel, self.chat_text())
+        if roll < 0.93:
+            return self.privmsg(user, channel, self.pyramid_text(channel))
+        if roll < 0.955:
+            return self.join(channel, user)
+        if roll < 0.975:
+            return self.part(channel, user)
+        if roll < 0.985:
+            return self.clearchat(channel, user)
+        if roll < 0.992:
+            return self.sub(channel, user, months=self.random.randint(1, 24))
+        if roll < 0.997:
+            return self.subgift(channel, user, self.random.choice(self.chatters))
+        return self.raid(channel, user, self.random.randint(1, 2000))
+
+    def lines(self, n):
+        """Yield n random lines."""
+        for _ in range(n):
+            yield self.line()
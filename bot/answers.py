@@ -0,0 +1,59 @@
+"""Matches chat messages against the answers of the running games.
+
+While a guessing game runs, most messages are wrong guesses. Instead of asking every
+game whether a message concerns it, games publish the messages they react to (answers,
+stop commands, ...) and the bot only runs them for those. All games of a bot are
+checked with one dict lookup per message, or two if some answers ignore case.
+"""
+
+
+class AnswerMatcher:
+    """The messages the running games of one bot react to."""
+
+    def __init__(self):
+        """Initialize empty tables."""
+        self.exact = {}  # message -> commands
+        self.folded = {}  # lowercase message -> commands, for answers ignoring case
+        self.keys = {}  # command -> (exact keys, folded keys)
+
+    def __bool__(self):
+        return bool(self.keys)
+
+    def __contains__(self, cmd):
+        return cmd in self.keys
+
+    def publish(self, cmd, exact=(), folded=()):
+        """Run cmd only for the given messages, replacing what it published before.
+
+        exact: messages which have to be written exactly like this, e.g. emotes.
+        folded: messages which are compared ignoring case.
+        """
+        self.withdraw(cmd)
+        exact = frozenset(exact)
+        folded = frozenset(key.lower() for key in folded)
+        self.keys[cmd] = (exact, folded)
+        for key in exact:
+            self.exact.setdefault(key, set()).add(cmd)
+        for key in folded:
+            self.folded.setdefault(key, set()).add(cmd)
+
+    def withdraw(self, cmd):
+        """Let cmd see all messages again, e.g. when its game ended."""
+        keys = self.keys.pop(cmd, None)
+        if keys is None:
+            return
+        for table, table_keys in zip((self.exact, self.folded), keys):
+            for key in table_keys:
+                table[key].discard(cmd)
+                if not table[key]:
+                    del table[key]
+
+    def lookup(self, msg):
+        """Return the commands which published msg."""
+        cmds = self.exact.get(msg)
+        if self.folded:
+            other = self.folded.get(msg.lower())
+            if other:
+                cmds = other if not cmds else cmds | other
+        # Copied, running the commands may change what they published.
+        return frozenset(cmds) if cmds else ()
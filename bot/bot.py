@@ -8,13 +8,22 @@ from collections import defaultdict
 import bot.commands
 import bot.emotecounter
 import bot.ranking
+from bot.answers import AnswerMatcher
+from bot.commands.abstract.lazycommand import LazyCommand, command_name
+from bot.metrics import BotMetrics
 from bot.data_sources.config import ConfigSource
-from bot.data_sources.emotes import EmoteSource
+from bot.data_sources.emotes import EMOTES, EmoteSource
+from bot.data_sources.hearthstone import Hearthstone
+from bot.data_sources.replies import ReplySource
 from bot.data_sources.twitch import TwitchSource
+from bot.filewatcher import FileWatcher
+from bot.paths import CONFIG_PATH, REPLIES_FILE
+from bot.scheduler import scheduler
 from bot.utilities.permission import Permission
 from bot.utilities.tools import replace_vars
 from bot.utilities.tools import sanitize_user_name
 from bot.utilities.webcache import WebCache
+from bot.workerpool import workers
 
 CACHE_DURATION = 10800
 
@@ -30,9 +39,25 @@ class TwitchBot:
 
         # Sources
         self.emotes, self.twitch, self.config = self.load_sources()
+        # Not reloaded with the other sources, its indexes only depend on the card list.
+        self.hearthstone = Hearthstone(self.cache)
+        # Shared by all commands, edited in place instead of reloading them.
+        self.replies = ReplySource(self.root)
+
+        # Reloads changed files, None if disabled
+        self.file_watcher = None
+        self.watch_files(self.config.config.get("watch_files", True))
+
+        # Metrics, None if disabled
+        self.metrics = None
+        if self.config.config.get("metrics", False):
+            self.enable_metrics()
 
         # Commands
         self.commands = []
+        # Messages the running games react to, see bot/answers.py
+        self.answers = AnswerMatcher()
+        self.startup_times = {}  # command name -> seconds to import and create it
         self.games, self.passivegames = self.load_commands()
 
         # States
@@ -55,9 +80,10 @@ class TwitchBot:
         self.subs = set()
         self.users = self.twitch.get_chatters()
 
-    def load_sources(self):
-        """Reloads data sources."""
-        config = ConfigSource(self.root, self.cache)
+    def load_sources(self, config=None):
+        """Reloads data sources, reusing config if given."""
+        if config is None:
+            config = ConfigSource(self.root, self.cache)
         emotes = EmoteSource(
             config.channel,
             cache=self.cache,
@@ -70,47 +96,140 @@ class TwitchBot:
         )
         return emotes, twitch, config
 
-    def reload(self):
-        """Reloads sources (and therefore entire bot)."""
-        logging.warning("Reloading bot!")
-        self.close_commands()
-        self.emotes, self.twitch, self.config = self.load_sources()
-        self.reload_commands()
+    def reload(self, paths=None, data=None):
+        """Reloads sources (and therefore entire bot).
 
-    def reload_commands(self):
-        """Reloads variables."""
-        self.games, self.passivegames = self.load_commands()
+        paths: path templates from bot.paths of changed files. Only sources reading
+        them and commands depending on them are reloaded.
+        data: already parsed content of some of the files, by path template.
+        """
+        if paths is None:
+            logging.warning("Reloading bot!")
+            self.close_commands()
+            self.emotes, self.twitch, self.config = self.load_sources()
+            self.replies.reload()
+            changed = None
+        else:
+            logging.warning("Reloading {}".format(", ".join(paths)))
+            channel, headers = self.config.channel, self.config.twitch_api_headers
+            changed = self.config.reload(paths, data)
+            changed.update(path for path in paths if path not in ConfigSource.FILES)
+            if REPLIES_FILE in paths:
+                self.replies.reload()
+            if (
+                channel != self.config.channel
+                or headers != self.config.twitch_api_headers
+            ):
+                self.emotes, self.twitch, _ = self.load_sources(self.config)
+                changed.add(EMOTES)
+
+        if changed is None or CONFIG_PATH in changed:
+            # Otherwise "!metrics on/off" in chat stays in effect.
+            if self.config.config.get("metrics", False):
+                self.enable_metrics()
+            else:
+                self.metrics = None
+        self.watch_files(self.config.config.get("watch_files", True))
+        self.reload_commands(changed)
+
+    def watch_files(self, enabled):
+        """Start or stop reloading files when they are edited."""
+        if enabled and self.file_watcher is None:
+            self.file_watcher = FileWatcher(self)
+            self.file_watcher.start()
+        elif not enabled and self.file_watcher is not None:
+            self.file_watcher.stop()
+            self.file_watcher = None
+
+    def enable_metrics(self):
+        """Start recording metrics, keeping already recorded ones."""
+        if self.metrics is None:
+            self.metrics = BotMetrics(self.config.channel)
+
+    def reload_commands(self, changed=None):
+        """Reloads variables.
+
+        changed: set of changed dependencies (see Command.depends_on), None for all.
+        """
+        self.games, self.passivegames = self.load_commands(changed)
 
-    def load_commands(self):
+    def load_commands(self, changed=None):
         """Reloads reloadable commands.
 
         For hard reload, set bot.commands = [] prior to calling this.
+        Commands listed in "disabled_commands" of the config are not even imported.
         """
         logging.warning("Reloading commands")
+        start = time.perf_counter()
+        created = []
+
+        existing = {command_name(cmd): cmd for cmd in self.commands}
+        disabled = set(self.config.config.get("disabled_commands", []))
+        commands = []
+        for name in bot.commands.commands:
+            cmd = existing.pop(name, None)
+            if name in disabled:
+                if cmd is not None:
+                    self.close_command(cmd)
+                    cmd = None
+            elif cmd is None:
+                if name in bot.commands.lazy:
+                    cmd = LazyCommand(self, name, bot.commands.lazy[name])
+                else:
+                    cmd = self.create_command(name)
+                    created.append(name)
+            elif name not in bot.commands.non_reload and (
+                changed is None
+                or cmd.depends_on is None
+                or not changed.isdisjoint(cmd.depends_on)
+            ):
+                self.close_command(cmd)
+                cmd = self.create_command(name)
+                created.append(name)
+            if cmd is not None:
+                commands.append(cmd)
+        for cmd in existing.values():
+            self.close_command(cmd)
+        # A new list, commands might be reloaded while the old one is iterated.
+        self.commands = commands
+
+        if created:
+            times = self.startup_times
+            slowest = sorted(created, key=times.get, reverse=True)[:3]
+            logging.warning(
+                "[{}] Created {} commands in {:.0f} ms (slowest: {})".format(
+                    self.config.channel,
+                    len(created),
+                    (time.perf_counter() - start) * 1000,
+                    ", ".join(
+                        "{} {:.0f} ms".format(name, times[name] * 1000)
+                        for name in slowest
+                    ),
+                )
+            )
 
-        # Reload commands
-        self.close_commands()
-        games = []
-        passivegames = []
+        games = [cmd for cmd in commands if command_name(cmd) in bot.commands.games]
+        passivegames = [
+            cmd for cmd in commands if command_name(cmd) in bot.commands.passivegames
+        ]
+        return games, passivegames
 
-        if not self.commands:
-            for cmd in bot.commands.commands:
-                self.commands.append(cmd(self))
-        else:
-            for i, cmd in enumerate(self.commands):
-                reloadable = True
-                for non_reloadable_class in bot.commands.non_reload:
-                    if cmd.__class__ == non_reloadable_class:
-                        reloadable = False
-                if reloadable:
-                    self.commands[i] = cmd.__class__(self)
+    def create_command(self, name):
+        """Create a command, importing it if necessary.
 
-        for cmd in self.commands:
-            if cmd.__class__ in bot.commands.games:
-                games.append(cmd)
-            if cmd.__class__ in bot.commands.passivegames:
-                passivegames.append(cmd)
-        return games, passivegames
+        Records how long it took in startup_times.
+        """
+        start = time.perf_counter()
+        cmd = bot.commands.load(name)(self)
+        self.startup_times[name] = time.perf_counter() - start
+        return cmd
+
+    def replace_command(self, old, new):
+        """Put a command in place of another one in all command lists."""
+        for commands in (self.commands, self.games, self.passivegames):
+            for i, cmd in enumerate(commands):
+                if cmd is old:
+                    commands[i] = new
 
     @staticmethod
     def mode_changed(_, channel, added, __, args):
@@ -208,15 +327,28 @@ class TwitchBot:
         """Emote Count Function"""
         self.ecount.process_message(msg)
 
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.message()
+
         """Limit pleb bot spam. Only allow certain commands to be processed by plebs, if plebcmds on cooldown."""
         cmdlist = self.select_commands(perm)
 
+        # Running games which published their answers only match those.
+        answers = self.answers
+        answered = answers.lookup(msg) if answers else ()
+
         # Flip through commands and execute everyone that matches.
         # Check if user has permission to execute command.
         # Also reduce warning message spam by limiting it to one per minute.
         for cmd in cmdlist:
             try:
-                match = cmd.match(self, user, msg, tag_info)
+                if answers and cmd in answers:
+                    match = cmd in answered
+                elif metrics is None:
+                    match = cmd.match(self, user, msg, tag_info)
+                else:
+                    match = metrics.match(cmd, self, user, msg, tag_info)
                 if not match:
                     continue
                 cname = cmd.__class__.__name__
@@ -231,7 +363,12 @@ class TwitchBot:
                         perm == 0 and cmd not in self.games
                     ):  # Only reset plebtimer if no game was played
                         self.last_plebcmd = time.time()
-                    cmd.run(self, user, msg, tag_info)
+                    if cmd.blocking:
+                        workers.submit(self, cmd, user, msg, tag_info)
+                    elif metrics is None:
+                        cmd.run(self, user, msg, tag_info)
+                    else:
+                        metrics.run(cmd, self, user, msg, tag_info)
             except (ValueError, TypeError):  # Not sure which Errors might happen here.
                 logging.error(traceback.format_exc())
         """Reset antispeech for next command"""
@@ -329,14 +466,20 @@ class TwitchBot:
     def close_commands(self):
         """Gracefully end commands."""
         for cmd in self.commands:
-            try:
-                cmd.close(self)
-            except (TypeError, ValueError):  # Not sure which Errors might happen here.
-                logging.error(traceback.format_exc())
+            self.close_command(cmd)
+
+    def close_command(self, cmd):
+        """Gracefully end a command."""
+        try:
+            cmd.close(self)
+        except (TypeError, ValueError):  # Not sure which Errors might happen here.
+            logging.error(traceback.format_exc())
 
     def terminate(self):
         """Terminate bot."""
+        self.watch_files(False)
         self.close_commands()
+        scheduler.cancel_channel(self.config.channel)
 
     def access_to_emote(self, username, emote):
         """Check if user has access to a certain emote."""
@@ -358,6 +501,7 @@ class TwitchBot:
     def clear_cache(self):
         """Clear the cache."""
         self.cache = WebCache(duration=CACHE_DURATION)
+        self.hearthstone = Hearthstone(self.cache)
 
     def write(self, msg):
         """Write a message."""
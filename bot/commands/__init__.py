@@ -1,99 +1,127 @@
 """Package containing all possible commands.
 
-Splits commands into multiple variables:
+Splits command names into multiple variables:
 activeGames: Commands that should always react (no cooldown), except when another activeGame is running
 passiveGames: Commands that should always react (no cooldown)
 games: activeGames + passiveGames
 commands: all commands
 """
-from typing import Type, List
-from .abstract.command import Command
+import importlib
+from typing import Callable, Dict, List, Type
 
-from .autogames import AutoGames
-from .banme import BanMe
-from .cache import Cache
-from .calculator import Calculator
-from .cardinfo import CardInfo
-from .editcommandlist import EditCommandList
-from .editcommandmods import EditCommandMods
-from .editquotelist import EditQuoteList
-from .guess_driver_game import GuessDriverGame
-from .guess_racetrack_game import GuessRacetrackGame
-from .guessemotegame import GuessEmoteGame
-from .guessminiongame import GuessMinionGame
-from .kappagame import KappaGame
-from .monkalotparty import MonkalotParty
-from .notifications import Notifications
-from .oralpleasure import Oralpleasure
-from .outputquote import OutputQuote
-from .outputstats import OutputStats
-from .pronouns import Pronouns
-from .pyramid import Pyramid
-from .pyramidblock import PyramidBlock
-from .pyramidreply import PyramidReply
-from .questions import Questions
-from .rank import Rank
-from .simplereply import SimpleReply
-from .slaphug import SlapHug
-from .sleep import Sleep
-from .smorc import Smorc
-from .spam import Spam
+from .abstract.command import Command
 
-from .speech_chatterbot import ChatterbotSpeech
-from .streaminfo import StreamInfo
-from .tentareply import TentaReply
-from .tip import Tip
-from .topspammers import TopSpammers
-from .userignore import UserIgnore
+# Command name -> module of this package defining it.
+# Modules are only imported once a bot creates the command, see load().
+modules: Dict[str, str] = {
+    "AutoGames": "autogames",
+    "BanMe": "banme",
+    "Cache": "cache",
+    "Calculator": "calculator",
+    "CardInfo": "cardinfo",
+    "ChatterbotSpeech": "speech_chatterbot",
+    "EditCommandList": "editcommandlist",
+    "EditCommandMods": "editcommandmods",
+    "EditQuoteList": "editquotelist",
+    "EmoteReply": "emotereply",
+    "GuessDriverGame": "guess_driver_game",
+    "GuessEmoteGame": "guessemotegame",
+    "GuessMinionGame": "guessminiongame",
+    "GuessRacetrackGame": "guess_racetrack_game",
+    "KappaGame": "kappagame",
+    "MonkalotParty": "monkalotparty",
+    "Notifications": "notifications",
+    "Oralpleasure": "oralpleasure",
+    "OutputMetrics": "outputmetrics",
+    "OutputQuote": "outputquote",
+    "OutputStats": "outputstats",
+    "Profile": "profile",
+    "Pronouns": "pronouns",
+    "Pyramid": "pyramid",
+    "PyramidBlock": "pyramidblock",
+    "PyramidReply": "pyramidreply",
+    "Questions": "questions",
+    "Rank": "rank",
+    "SimpleReply": "simplereply",
+    "SlapHug": "slaphug",
+    "Sleep": "sleep",
+    "Smorc": "smorc",
+    "Spam": "spam",
+    "StreamInfo": "streaminfo",
+    "TentaReply": "tentareply",
+    "Tip": "tip",
+    "TopSpammers": "topspammers",
+    "UserIgnore": "userignore",
+}
 
 
-active_games: List[Type[Command]] = [
-    KappaGame,
-    # GuessDriverGame,
-    # GuessRacetrackGame,
-    GuessEmoteGame,
-    GuessMinionGame,
-    MonkalotParty,
+active_games: List[str] = [
+    "KappaGame",
+    # "GuessDriverGame",
+    # "GuessRacetrackGame",
+    "GuessEmoteGame",
+    "GuessMinionGame",
+    "MonkalotParty",
 ]
 
-passive_games: List[Type[Command]] = [Pyramid]
+passive_games: List[str] = ["Pyramid"]
 
-other: List[Type[Command]] = [
-    # EmoteReply,     # Deactivated due to request from IGetNoKick in Zetalot's channel 26.09.2017
-    AutoGames,
-    BanMe,
-    Cache,
-    Calculator,
-    CardInfo,
-    EditCommandList,
-    EditCommandMods,
-    EditQuoteList,
-    Notifications,
-    Oralpleasure,
-    OutputQuote,
-    OutputStats,
-    Pronouns,
-    PyramidBlock,
-    PyramidReply,
-    Questions,
-    Rank,
-    SimpleReply,
-    SlapHug,
-    Sleep,
-    Smorc,
-    Spam,
-    StreamInfo,
-    TentaReply,
-    Tip,
-    TopSpammers,
-    UserIgnore,
+other: List[str] = [
+    # "EmoteReply",     # Deactivated due to request from IGetNoKick in Zetalot's channel 26.09.2017
+    "AutoGames",
+    "BanMe",
+    "Cache",
+    "Calculator",
+    "CardInfo",
+    "EditCommandList",
+    "EditCommandMods",
+    "EditQuoteList",
+    "Notifications",
+    "Oralpleasure",
+    "OutputMetrics",
+    "OutputQuote",
+    "OutputStats",
+    "Profile",
+    "Pronouns",
+    "PyramidBlock",
+    "PyramidReply",
+    "Questions",
+    "Rank",
+    "SimpleReply",
+    "SlapHug",
+    "Sleep",
+    "Smorc",
+    "Spam",
+    "StreamInfo",
+    "TentaReply",
+    "Tip",
+    "TopSpammers",
+    "UserIgnore",
     # Speech always has to be the last entry so it does not 'overwrite' commands which include the bots name.
-    ChatterbotSpeech,
+    "ChatterbotSpeech",
 ]
 
 # Repeat here the commands that should not get reloaded if the config gets rewritten
-non_reload = [ChatterbotSpeech]
+non_reload = ["ChatterbotSpeech"]
+
+# Commands which are slow to import or create. They are only created once
+# trigger(bot, msg) is true, which has to hold for every message they match.
+lazy: Dict[str, Callable] = {
+    "ChatterbotSpeech": lambda bot, msg: bot.config.nickname in msg.lower(),
+}
 
 commands = active_games + passive_games + other
 games = active_games + passive_games
 passivegames = passive_games
+
+
+def load(name) -> Type[Command]:
+    """Return the class of a command, importing its module if necessary."""
+    return getattr(importlib.import_module("." + modules[name], __name__), name)
+
+
+def __getattr__(name):
+    """Allow importing command classes from this package, e.g. bot.commands.CardInfo."""
+    if name in modules:
+        return load(name)
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
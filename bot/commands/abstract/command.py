@@ -8,6 +8,15 @@ class Command(ABC):
 
     perm = Permission.Admin
 
+    # Blocking commands are run in a worker thread, see bot/workerpool.py
+    blocking = False
+    max_concurrent = 1  # runs at the same time per bot
+    timeout = 10  # seconds until the replies of a run are no longer waited for
+
+    # What __init__ reads: path templates from bot.paths and bot.data_sources.emotes.EMOTES.
+    # The command is only recreated on reload if one of them changed. None: always.
+    depends_on = None
+
     def __init__(self, bot):
         """Initialize the command."""
         pass
@@ -23,3 +32,7 @@ class Command(ABC):
     def close(self, bot):
         """Clean up."""
         pass
+
+    def timed_out(self, bot, user, msg, tag_info):
+        """Called instead of sending the replies of a blocking run that took too long."""
+        pass
@@ -1,12 +1,12 @@
 import random
-from typing import List
+from typing import List, Union
 
-from twisted.internet import reactor
 from functools import partial
 
+from bot.scheduler import scheduler
+from bot.utilities.objectstore import ObjectStore, normalize_answer
 from bot.utilities.permission import Permission
 from bot.utilities.startgame import start_game
-from bot.utilities.tools import is_call_id_active
 from .command import Command
 
 
@@ -18,13 +18,15 @@ class GuessingGame(Command):
     def __init__(
         self,
         attributes: List[str],
-        object_pool: List[dict],
+        object_pool: Union[ObjectStore, List[dict]],
         command: str,
         stop_command="!stop",
     ):
         """Initialize variables.
 
-        Objects need a "name" field.
+        Objects need a "name" field. Pass an ObjectStore which is kept between reloads
+        (see bot/utilities/objectstore.py) instead of a list if the objects are
+        expensive to load.
 
         When implementing this, you need to implement a method for every hint, called like this:
         '_<stat>_hint(obj)'
@@ -33,7 +35,6 @@ class GuessingGame(Command):
         self.responses = {}
         self.active = False
         self.cluetime = 10  # time between clues in seconds
-        self.callID = None
         self.statToSet = {}
         self.stop_command = stop_command
 
@@ -43,8 +44,14 @@ class GuessingGame(Command):
         self._attributes = attributes
         self.attributes = attributes
 
+        if not isinstance(object_pool, ObjectStore):
+            object_pool = ObjectStore.from_objects(
+                object_pool, set(attributes) | {"name"}
+            )
         self.object_pool = object_pool
+        self.index = None  # index of object_to_guess in object_pool
         self.object_to_guess = None
+        self.hints = {}  # (index, stat) -> hint, hints are the same every game
         self.command = command
 
     def give_clue(self, bot):
@@ -58,14 +65,23 @@ class GuessingGame(Command):
 
         stat = random.choice(self.attributes)
         self.attributes.remove(stat)
+        bot.write(self._hint(stat))
 
-        # Call _<stat>_hint method, e.g.: self._health_hint(self.object_to_guess)
-        function = getattr(
-            self, f"_{stat.lower()}_hint", partial(self._default_hint, stat=stat)
+        scheduler.schedule(
+            bot.config.channel, type(self).__name__, self.cluetime, self.give_clue, bot
         )
-        bot.write(function(self.object_to_guess))
 
-        self.callID = reactor.callLater(self.cluetime, self.give_clue, bot)
+    def _hint(self, stat):
+        """Return the hint for a stat of the object to guess."""
+        hint = self.hints.get((self.index, stat))
+        if hint is None:
+            # Call _<stat>_hint method, e.g.: self._health_hint(self.object_to_guess)
+            function = getattr(
+                self, f"_{stat.lower()}_hint", partial(self._default_hint, stat=stat)
+            )
+            hint = function(self.object_to_guess)
+            self.hints[(self.index, stat)] = hint
+        return hint
 
     @staticmethod
     def _default_hint(obj: dict, stat: str):
@@ -77,7 +93,8 @@ class GuessingGame(Command):
     def init_game(self, bot):
         """Initialize game."""
         self.attributes = self._attributes.copy()
-        self.object_to_guess = random.choice(self.object_pool)
+        self.index = random.randrange(len(self.object_pool))
+        self.object_to_guess = self.object_pool.get(self.index)
 
     def match(self, bot, user, msg, tag_info):
         """Match if the game is active or gets started with !mstart."""
@@ -92,6 +109,9 @@ class GuessingGame(Command):
             self.init_game(bot)
             print("Answer: " + self.object_to_guess["name"])
             bot.write(self._start_message(self.object_to_guess))
+            answers = self._answers(self.object_to_guess)
+            if answers is not None:
+                bot.answers.publish(self, exact=[self.stop_command], folded=answers)
             self.give_clue(bot)
         else:
             if cmd == self.stop_command and bot.get_permission(user) not in [
@@ -102,16 +122,15 @@ class GuessingGame(Command):
                 bot.write(self._stop_message())
                 return
 
-            name = self.object_to_guess["name"].strip()
-            if cmd.strip().lower() == name.lower():
+            if self._is_correct(cmd, self.object_to_guess):
                 bot.write(self._winner_message(self.object_to_guess, user))
                 bot.ranking.increment_points(user, self.points, bot)
                 self.close(bot)
 
     def close(self, bot):
         """Close minion game."""
-        if is_call_id_active(self.callID):
-            self.callID.cancel()
+        scheduler.cancel(bot.config.channel, type(self).__name__)
+        bot.answers.withdraw(self)
         self.active = False
         bot.game_running = False
 
@@ -128,22 +147,17 @@ class GuessingGame(Command):
         """Message sent when the object is guessed."""
         return f"{user} won!"
 
-    # def _<stat>_hint(self, stat):
-    #   pass
+    def _is_correct(self, guess, obj):
+        """Return whether a guess is the name of the object."""
+        return normalize_answer(guess) == self.object_pool.names[self.index]
 
-    @staticmethod
-    def _convert_pandas_dict(data):
-        """Inverts pandas dict, from:
+    def _answers(self, obj):
+        """Return the guesses _is_correct accepts, ignoring case.
 
-        {"a": [1,2,3], "b": [3,4,5]}
-        to
-        [{"a": 1, "b": 3}, {"a": 2, "b": 4}, {"a": 3, "b": 5}]
+        Only these messages are passed to the game while it runs. Return None if they
+        can't be listed, then the game sees every message.
         """
-        items = list(data.items())
-        # assuming all fields are set for all objects
-        objects = [{} for _ in range(0, len(list(items)[0][1]))]
-
-        for column, values in items:
-            for index, _ in enumerate(values):
-                objects[index][column] = values[index]
-        return objects
+        return [self.object_pool.names[self.index]]
+
+    # def _<stat>_hint(self, stat):
+    #   pass
@@ -0,0 +1,52 @@
+"""Contains a placeholder for commands which are slow to import or create."""
+from .command import Command
+
+
+class LazyCommand(Command):
+    """Stands in for a command until a message could match it.
+
+    Once trigger(bot, msg) is true, the command is created and replaces this
+    placeholder in the command lists of the bot.
+    """
+
+    depends_on = ()
+
+    def __init__(self, bot, name, trigger):
+        """Remember which command to create."""
+        self.name = name
+        self.trigger = trigger
+        self.command = None
+
+    def match(self, bot, user, msg, tag_info):
+        """Create the command if the message could match it, then ask it."""
+        if self.command is None:
+            if not self.trigger(bot, msg):
+                return False
+            self.command = bot.create_command(self.name)
+            bot.replace_command(self, self.command)
+            # The current message is still processed with this placeholder.
+            self.perm = self.command.perm
+            self.blocking = self.command.blocking
+            self.max_concurrent = self.command.max_concurrent
+            self.timeout = self.command.timeout
+        return self.command.match(bot, user, msg, tag_info)
+
+    def run(self, bot, user, msg, tag_info):
+        """Run the command."""
+        self.command.run(bot, user, msg, tag_info)
+
+    def timed_out(self, bot, user, msg, tag_info):
+        """Let the command answer a run that took too long."""
+        self.command.timed_out(bot, user, msg, tag_info)
+
+    def close(self, bot):
+        """Close the command, if it was created."""
+        if self.command is not None:
+            self.command.close(bot)
+
+
+def command_name(cmd):
+    """Return the name of a command, also for placeholders."""
+    if isinstance(cmd, LazyCommand):
+        return cmd.name
+    return cmd.__class__.__name__
@@ -3,8 +3,6 @@ import logging
 import random
 from abc import ABC
 
-from twisted.internet import reactor
-
 from bot.commands.abstract.command import Command
 from bot.utilities.permission import Permission
 
@@ -14,25 +12,24 @@ class Speech(Command, ABC):
 
     perm = Permission.User
     reloadable = False
+    blocking = True  # getting a reply can take a while
+    max_concurrent = 2
+    timeout = 30
 
     def __init__(self, bot):
         """Define self.chatbot here"""
         self.chatbot = Chatbot()
 
     def match(self, bot, user, msg, tag_info):
-        """Match if the bot is tagged."""
-        return bot.config.nickname in msg.lower()
+        """Match if the bot is tagged and no other command prevents speech."""
+        return bot.config.nickname in msg.lower() and not bot.antispeech
 
     def run(self, bot, user, msg, tag_info):
-        """Send message to cleverbot only if no other command got triggered."""
-        if not bot.antispeech:
-            msg = msg.lower()
-            msg = msg.replace("@", "")
-            msg = msg.replace(bot.config.nickname, "")
-
-            """Get reply in extra thread, so bot doesnt pause while waiting for the reply. 
-            Problem: Only replies after someone else wrote something in chat."""
-            reactor.callInThread(self.answer, bot, user, msg)
+        """Send message to the chatbot. Runs in a worker thread, see blocking."""
+        msg = msg.lower()
+        msg = msg.replace("@", "")
+        msg = msg.replace(bot.config.nickname, "")
+        self.answer(bot, user, msg)
 
     def answer(self, bot, user, msg):
         """Answer the message of a user."""
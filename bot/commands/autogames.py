@@ -1,23 +1,22 @@
 """Command which automatically starts games."""
 import random
 
-from twisted.internet import reactor
-
 from bot.commands.abstract.command import Command
+from bot.paths import CONFIG_PATH
+from bot.scheduler import scheduler
 from bot.utilities.permission import Permission
-from bot.utilities.tools import is_call_id_active
 
 
 class AutoGames(Command):
     """Start games randomly."""
 
     perm = Permission.Moderator
+    depends_on = (CONFIG_PATH,)
 
     def __init__(self, bot):
         """Initialize variables."""
         self.responses = {}
         self.active = False
-        self.callID = None
         self.auto_game_interval = bot.config.config["auto_game_interval"]
 
     def random_game(self, bot):
@@ -39,8 +38,17 @@ class AutoGames(Command):
             """Trigger one of the commands."""
             bot.process_command(user, cmd, {})
 
-        """ start of threading """
-        self.callID = reactor.callLater(self.auto_game_interval, self.random_game, bot)
+        self.schedule(bot)
+
+    def schedule(self, bot):
+        """Start a random game after auto_game_interval."""
+        scheduler.schedule(
+            bot.config.channel,
+            "AutoGames",
+            self.auto_game_interval,
+            self.random_game,
+            bot,
+        )
 
     def match(self, bot, user, msg, tag_info):
         """Match if message starts with !games."""
@@ -57,15 +65,12 @@ class AutoGames(Command):
         if cmd == "on":
             if not self.active:
                 self.active = True
-                self.callID = reactor.callLater(
-                    self.auto_game_interval, self.random_game, bot
-                )
+                self.schedule(bot)
                 bot.write(self.responses["autogames_activate"]["msg"])
             else:
                 bot.write(self.responses["autogames_already_on"]["msg"])
         elif cmd == "off":
-            if is_call_id_active(self.callID):
-                self.callID.cancel()
+            scheduler.cancel(bot.config.channel, "AutoGames")
             if self.active:
                 self.active = False
                 bot.write(self.responses["autogames_deactivate"]["msg"])
@@ -74,6 +79,5 @@ class AutoGames(Command):
 
     def close(self, bot):
         """Close the game."""
-        if is_call_id_active(self.callID):
-            self.callID.cancel()
+        scheduler.cancel(bot.config.channel, "AutoGames")
         self.active = False
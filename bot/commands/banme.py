@@ -7,6 +7,7 @@ class BanMe(Command):
     """Ban me part in normal messages."""
 
     perm = Permission.User
+    depends_on = ()
 
     def match(self, bot, user, msg, tag_info):
         """Ban if mentioning bot and contains 'ban me'."""
@@ -8,6 +8,7 @@ class Cache(Command):
     """Allows admins and trusted mods to manage the cache of the bot."""
 
     perm = Permission.Moderator
+    depends_on = ()
 
     def __init__(self, _):
         """Initialize variables."""
@@ -2,10 +2,8 @@
 import math
 import re
 
-import pyparsing
-
 from bot.commands.abstract.command import Command
-from bot.utilities.math_parser import NumericStringParser
+from bot.utilities.math_parser import NumericStringParser, ParseError, TooComplexError
 from bot.utilities.permission import Permission
 from bot.utilities.tools import replace_vars
 
@@ -19,6 +17,9 @@ class Calculator(Command):
     """
 
     perm = Permission.User
+    depends_on = ()
+    blocking = True
+    timeout = 3
 
     symbols = ["e", "pi", "sin", "cos", "tan", "abs", "trunc", "round", "sgn"]
 
@@ -51,19 +52,28 @@ class Calculator(Command):
                 result = round(result, PRECISION)
             reply = "{} = {}".format(expr, result)
             bot.write(reply)
+        except TooComplexError:
+            var = {"<USER>": bot.twitch.display_name(user)}
+            bot.write(replace_vars(self.responses["too_complex"]["msg"], var))
         except ZeroDivisionError:
             var = {"<USER>": bot.twitch.display_name(user)}
             bot.write(replace_vars(self.responses["div_by_zero"]["msg"], var))
         except OverflowError:
             var = {"<USER>": bot.twitch.display_name(user)}
             bot.write(replace_vars(self.responses["number_overflow"]["msg"], var))
-        except pyparsing.ParseException:
+        except ParseError:
             var = {"<USER>": bot.twitch.display_name(user)}
             bot.write(replace_vars(self.responses["wrong_input"]["msg"], var))
         except (TypeError, ValueError):  # Not sure which Errors might happen here.
             var = {"<USER>": bot.twitch.display_name(user), "<EXPRESSION>": expr}
             bot.write(replace_vars(self.responses["default_error"]["msg"], var))
 
+    def timed_out(self, bot, user, msg, tag_info):
+        """Tell the user the calculation took too long."""
+        var = {"<USER>": bot.twitch.display_name(user)}
+        msg = bot.config.responses["Calculator"]["too_complex"]["msg"]
+        bot.write(replace_vars(msg, var))
+
     def check_symbols(self, msg):
         """Check whether s contains no letters, except e, pi, sin, cos, tan, abs, trunc, round, sgn."""
         msg = msg.lower()
@@ -1,8 +1,5 @@
 """Commands: "!addcommand"."""
-import json
-
 from bot.commands.abstract.command import Command
-from bot.paths import REPLIES_FILE
 from bot.utilities.permission import Permission
 from bot.utilities.tools import replace_vars
 
@@ -14,12 +11,11 @@ class EditCommandList(Command):
     """
 
     perm = Permission.Moderator
+    depends_on = ()
 
     def __init__(self, bot):
-        """Load command list."""
+        """Initialize variables."""
         self.responses = {}
-        with open(REPLIES_FILE.format(bot.root), "r", encoding="utf-8") as file:
-            self.replies = json.load(file)
 
     def addcommand(self, bot, cmd):
         """Add a new command to the list, make sure there are no duplicates."""
@@ -33,15 +29,10 @@ class EditCommandList(Command):
 
         """Check if the command is already in the list, if not
         add the command to the list"""
-        if entrycmd in self.replies:
+        if entrycmd in bot.replies:
             bot.write(self.responses["cmd_already_exists"]["msg"])
         else:
-            self.replies[entrycmd] = entryarg
-
-            with open(REPLIES_FILE.format(bot.root), "w", encoding="utf-8") as file:
-                json.dump(self.replies, file, indent=4, ensure_ascii=False)
-
-            bot.reload_commands()  # Needs to happen to refresh the list.
+            bot.replies.add(entrycmd, entryarg)
             var = {"<COMMAND>": entrycmd}
             bot.write(replace_vars(self.responses["cmd_added"]["msg"], var))
 
@@ -50,13 +41,7 @@ class EditCommandList(Command):
         entrycmd = cmd[len("!delcommand ") :]
         entrycmd.strip()
 
-        if entrycmd in self.replies:
-            del self.replies[entrycmd]
-
-            with open(REPLIES_FILE.format(bot.root), "w", encoding="utf-8") as file:
-                json.dump(self.replies, file, indent=4, ensure_ascii=False)
-
-            bot.reload_commands()  # Needs to happen to refresh the list.
+        if bot.replies.remove(entrycmd):
             var = {"<COMMAND>": entrycmd}
             bot.write(replace_vars(self.responses["cmd_removed"]["msg"], var))
         else:
@@ -67,7 +52,7 @@ class EditCommandList(Command):
         """Write out the Commandlist in chat."""
         replylist = "Replylist Commands: "
 
-        for key in self.replies:
+        for key in bot.replies.commands():
             replylist = replylist + key + " "
 
         bot.write(str(replylist))
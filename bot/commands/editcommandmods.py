@@ -9,6 +9,7 @@ class EditCommandMods(Command):
     """Command for owners to add or delete mods to list of trusted mods."""
 
     perm = Permission.Admin
+    depends_on = ()
 
     def __init__(self, _):
         """Initialize variables."""
@@ -1,6 +1,7 @@
 """Commands: "!addquote", "!delquote"."""
 import json
 
+from bot import filewatcher
 from bot.commands.abstract.command import Command
 from bot.paths import QUOTES_FILE
 from bot.utilities.permission import Permission
@@ -10,6 +11,7 @@ class EditQuoteList(Command):
     """Add or delete quote from a json-file."""
 
     perm = Permission.Moderator
+    depends_on = (QUOTES_FILE,)
 
     def __init__(self, bot):
         """Load command list."""
@@ -26,7 +28,8 @@ class EditQuoteList(Command):
             self.quotelist.append(quote)
             with open(QUOTES_FILE.format(bot.root), "w", encoding="utf-8") as file:
                 json.dump(self.quotelist, file, indent=4)
-            bot.reload_commands()  # Needs to happen to refresh the list.
+            filewatcher.wrote(QUOTES_FILE.format(bot.root))
+            bot.reload_commands({QUOTES_FILE})  # Refreshes the list of OutputQuote.
             bot.write(self.responses["quote_added"]["msg"])
         else:
             bot.write(self.responses["quote_exists"]["msg"])
@@ -40,7 +43,8 @@ class EditQuoteList(Command):
             self.quotelist.remove(quote)
             with open(QUOTES_FILE.format(bot.root), "w", encoding="utf-8") as file:
                 json.dump(self.quotelist, file, indent=4)
-            bot.reload_commands()  # Needs to happen to refresh the list.
+            filewatcher.wrote(QUOTES_FILE.format(bot.root))
+            bot.reload_commands({QUOTES_FILE})  # Refreshes the list of OutputQuote.
             bot.write(self.responses["quote_removed"]["msg"])
         else:
             bot.write(self.responses["quote_not_found"]["msg"])
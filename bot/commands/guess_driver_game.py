@@ -1,8 +1,8 @@
 """Commands: "!mstart"."""
 
 from bot.commands.abstract.guessinggame import GuessingGame
-from bot.data_sources.hearthstone import Hearthstone
-import pandas as pd
+from bot.data_sources.gamedata import load_table
+from bot.paths import DRIVERS_PATH
 
 
 class GuessDriverGame(GuessingGame):
@@ -13,12 +13,10 @@ class GuessDriverGame(GuessingGame):
     """
 
     def __init__(self, bot):
-        excel_dict = pd.read_excel("data/Drivers.xlsx").to_dict()
-        data = self._convert_pandas_dict(excel_dict)
-        data = [{**x, "name": f"{x['Firstname']} {x['Lastname']}"} for x in data]
+        data = load_table(DRIVERS_PATH, name_columns=["Firstname", "Lastname"])
 
         super().__init__(
-            command="!dstart", attributes=list(excel_dict.keys()), object_pool=data,
+            command="!dstart", attributes=data.attributes, object_pool=data,
         )
         self.bot = bot
         self.points = 30
@@ -1,8 +1,8 @@
 """Commands: "!mstart"."""
 
 from bot.commands.abstract.guessinggame import GuessingGame
-from bot.data_sources.hearthstone import Hearthstone
-import pandas as pd
+from bot.data_sources.gamedata import load_table
+from bot.paths import RACETRACKS_PATH
 
 
 class GuessRacetrackGame(GuessingGame):
@@ -13,12 +13,10 @@ class GuessRacetrackGame(GuessingGame):
     """
 
     def __init__(self, bot):
-        excel_dict = pd.read_excel("data/Racetracks.xlsx").to_dict()
-        data = self._convert_pandas_dict(excel_dict)
-        data = [{**x, "name": x["Name"]} for x in data]
+        data = load_table(RACETRACKS_PATH, name_columns=["Name"])
 
         super().__init__(
-            command="!rstart", attributes=list(excel_dict.keys()), object_pool=data,
+            command="!rstart", attributes=data.attributes, object_pool=data,
         )
         self.bot = bot
         self.points = 30
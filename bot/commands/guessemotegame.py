@@ -2,6 +2,7 @@
 import random
 
 from bot.commands.abstract.command import Command
+from bot.paths import CONFIG_PATH
 from bot.utilities.permission import Permission
 from bot.utilities.startgame import start_game
 from bot.utilities.tools import emote_list_to_string
@@ -17,6 +18,7 @@ class GuessEmoteGame(Command):
     """
 
     perm = Permission.User
+    depends_on = (CONFIG_PATH,)
 
     def __init__(self, bot):
         """Initialize variables."""
@@ -85,6 +87,7 @@ class GuessEmoteGame(Command):
             print("Right emote: " + self.emote)
             var = {"<MULTIEMOTES>": emote_list_to_string(self.emotes)}
             bot.write(replace_vars(self.responses["start_msg"]["msg"], var))
+            bot.answers.publish(self, exact=[self.emote, "!estop", "!emotes"])
         else:
             if cmd == "!estop" and bot.get_permission(user) not in [
                 Permission.User,
@@ -103,13 +106,13 @@ class GuessEmoteGame(Command):
                 }
                 bot.write(replace_vars(self.responses["winner_msg"]["msg"], var))
                 bot.ranking.increment_points(user, self.emote_game_points, bot)
-                bot.game_running = False
-                self.active = False
+                self.close(bot)
             elif cmd == "!emotes":
                 var = {"<MULTIEMOTES>": emote_list_to_string(self.emotes)}
                 bot.write(replace_vars(self.responses["emote_msg"]["msg"], var))
 
     def close(self, bot):
         """Close emote game."""
+        bot.answers.withdraw(self)
         self.active = False
         bot.game_running = False
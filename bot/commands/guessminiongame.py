@@ -1,7 +1,7 @@
 """Commands: "!mstart"."""
 
 from bot.commands.abstract.guessinggame import GuessingGame
-from bot.data_sources.hearthstone import Hearthstone
+from bot.paths import CONFIG_PATH, CUSTOM_RESPONSES_PATH
 from bot.utilities.tools import replace_vars
 
 
@@ -12,8 +12,9 @@ class GuessMinionGame(GuessingGame):
     have to guess which on it is. Give points to the winner.
     """
 
+    depends_on = (CONFIG_PATH, CUSTOM_RESPONSES_PATH)
+
     def __init__(self, bot):
-        hearthstone = Hearthstone(bot.cache)
         super().__init__(
             command="!mstart",
             attributes=[
@@ -25,9 +26,7 @@ class GuessMinionGame(GuessingGame):
                 "cost",
                 "health",
             ],
-            object_pool=[
-                card for card in hearthstone.get_cards() if card["type"] == "MINION"
-            ],
+            object_pool=bot.hearthstone.get_minions(),
         )
         self.responses = bot.config.responses["GuessMinionGame"]
         self.bot = bot
@@ -48,6 +47,13 @@ class GuessMinionGame(GuessingGame):
         }
         return replace_vars(self.responses["winner_msg"]["msg"], var)
 
+    def _is_correct(self, guess, obj):
+        return self.bot.hearthstone.is_name_of(guess, obj)
+
+    def _answers(self, obj):
+        # Guesses with typos are accepted as well.
+        return None
+
     # --- Hints ---
 
     def _cardclass_hint(self, obj):
@@ -2,10 +2,14 @@
 import random
 
 from bot.commands.abstract.command import Command
+from bot.paths import CONFIG_PATH
 from bot.utilities.permission import Permission
 from bot.utilities.startgame import start_game
 from bot.utilities.tools import replace_vars
 
+# Twitch messages have at most 500 characters
+MAX_KAPPAS = 501 // len("Kappa ")
+
 
 class KappaGame(Command):
     """Play the Kappa game.
@@ -14,6 +18,7 @@ class KappaGame(Command):
     """
 
     perm = Permission.User
+    depends_on = (CONFIG_PATH,)
 
     def __init__(self, bot):
         """Initialize variables."""
@@ -39,6 +44,9 @@ class KappaGame(Command):
             self.answered = []
             print("Kappas: " + str(self.n))
             bot.write(self.responses["start_msg"]["msg"])
+            # Every amount of Kappas is answered, not only the right one.
+            kappas = (" ".join(["Kappa"] * i) for i in range(1, MAX_KAPPAS + 1))
+            bot.answers.publish(self, exact=[*kappas, "!kstop"])
         else:
             if msg == "!kstop" and bot.get_permission(user) not in [
                 Permission.User,
@@ -53,9 +61,7 @@ class KappaGame(Command):
                 var = {"<USER>": bot.twitch.display_name(user), "<AMOUNT>": self.n}
                 bot.write(replace_vars(self.responses["winner_msg"]["msg"], var))
                 bot.ranking.increment_points(user, self.kappa_game_points, bot)
-                bot.game_running = False
-                self.active = False
-                self.answered = []
+                self.close(bot)
             elif i != -1:
                 if i not in self.answered:
                     var = {"<AMOUNT>": i}
@@ -74,6 +80,7 @@ class KappaGame(Command):
 
     def close(self, bot):
         """Close kappa game."""
+        bot.answers.withdraw(self)
         self.answered = []
         self.active = False
         bot.game_running = False
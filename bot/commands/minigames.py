@@ -1,4 +1,8 @@
-"""Minigame class. Supply different game which have to be solved very quickly."""
+"""Minigame class. Supply different game which have to be solved very quickly.
+
+The question data is indexed once into QuestionPools when the MonkalotParty command is
+created. A party only generates the questions it actually asks, when it asks them.
+"""
 
 import json
 import random
@@ -7,43 +11,81 @@ from random import randint, shuffle
 DATA_OBJECT = "{}data/monkalot_party.json"
 
 
+class QuestionPools(object):
+    """The content of monkalot_party.json as flat tuples to pick questions from."""
+
+    def __init__(self, data):
+        """Index the question data."""
+        self.opposites = tuple(data["oppositeof"].items())
+        self.capitals = tuple(data["capitalof"].items())
+        # Countries and capitals, picking one is the same as picking a country and
+        # then either it or its capital.
+        self.locations = tuple(data["capitalof"]) + tuple(data["capitalof"].values())
+        self.colors = tuple(
+            (item, color, article)
+            for item, (color, article) in data["colorof"].items()
+        )
+        self.lyrics = tuple(data["completelyric"].items())
+        self.rhymes = tuple(data["completewithemote"].items())
+
+        similars = data["similars"]
+        self.similar_groups = tuple(similars)
+        self.similars = {key: tuple(items) for key, items in similars.items()}
+        self.similars_upper = {
+            key: tuple(item.upper() for item in items)
+            for key, items in similars.items()
+        }
+
+        self.write = tuple(data["write"])
+        self.relatives = tuple(data["relative"])
+        self.archetypes = tuple(data["archetype"])
+        self.devices = tuple(data["device"])
+        self.story_colors = self.similars["colors"]
+        self.vehicles = self.similars["vehicles"]
+        self.toys = self.similars["vehicles"] + self.similars["animals"]
+        self.classes = self.similars["classes"]
+
+    @classmethod
+    def load(cls, bot):
+        """Read and index the question data of a bot."""
+        with open(DATA_OBJECT.format(bot.root), "r", encoding="utf-8") as file:
+            return cls(json.load(file))
+
+
 class MiniGames(object):
     """Small and fast chat games."""
 
-    # global data object
-    data = None
-
-    questtype = [
+    GAMES = (
         "oppositeof",
         "capitalof",
         "colorof",
         "completelyric",
         "completewithemote",
-        "similars",
-        "write",
-    ]
+        "oneisnotliketheother",
+        "bethefirsttowrite",
+        "coolstorybob",
+        "simplecalc",
+        "storycalc",
+    )
+
+    def __init__(self, pools, emotes=()):
+        """Initialize mini game structure.
 
-    def __init__(self, bot):
-        """Initialize mini game structure."""
-        if not MiniGames.data:
-            with open(DATA_OBJECT.format(bot.root), "r", encoding="utf-8") as file:
-                MiniGames.data = json.load(file)
+        emotes: emotes of the channel, answers which are emotes are case sensitive.
+        """
+        self.data = pools
+        self.emotes = frozenset(emotes)
 
         """Reset rankings and games."""
         self.ranks = {}
-        self.games = {}
-
-        """Create the minigames."""
-        self.games.update(self.oppositeof())
-        self.games.update(self.capitalof())
-        self.games.update(self.colorof())
-        self.games.update(self.completelyric())
-        self.games.update(self.completewithemote())
-        self.games.update(self.oneisnotliketheother())
-        self.games.update(self.bethefirsttowrite())
-        self.games.update(self.coolstorybob())
-        self.games.update(self.simplecalc())
-        self.games.update(self.storycalc())
+        self.games = list(self.GAMES)
+
+    def next_question(self):
+        """Pick a game which was not played yet, return its question and answer."""
+        game = random.choice(self.games)
+        self.games.remove(game)
+        quest = getattr(self, game)()
+        return quest["question"], str(quest["answer"])
 
     @staticmethod
     def storycalc():
@@ -105,7 +147,7 @@ class MiniGames(object):
             answer = end_b
 
         question = story + quest
-        return {"storycalc": {"question": question, "answer": answer}}
+        return {"question": question, "answer": answer}
 
     @staticmethod
     def simplecalc():
@@ -134,28 +176,24 @@ class MiniGames(object):
             f"NotLikeThis ▬▬▬▬▬▬M▬A▬T▬H▬▬T▬I▬M▬E▬▬▬▬▬▬▬"
         )
 
-        return {"simplecalc": {"question": question, "answer": answer}}
+        return {"question": question, "answer": answer}
 
     def coolstorybob(self):
         """Tell a story, ask about one detail."""
-        emotes = random.sample(list(self.data["write"]), 2)
+        emotes = random.sample(self.data.write, 2)
         emote = emotes[0]
         emote2 = emotes[1]
 
-        relative = random.choice(list(self.data["relative"]))
+        relative = random.choice(self.data.relatives)
         location = self.random_location()
 
-        color = random.choice(list(self.data["similars"]["colors"]))
-        vehicle = random.choice(list(self.data["similars"]["vehicles"]))
-        toy = random.choice(
-            list(self.data["similars"]["vehicles"] + self.data["similars"]["animals"])
-        )
+        color = random.choice(self.data.story_colors)
+        vehicle = random.choice(self.data.vehicles)
+        toy = random.choice(self.data.toys)
         deck = (
-            random.choice(list(self.data["archetype"]))
-            + " "
-            + random.choice(list(self.data["similars"]["classes"]))
+            random.choice(self.data.archetypes) + " " + random.choice(self.data.classes)
         )
-        device = random.choice(list(self.data["device"]))
+        device = random.choice(self.data.devices)
 
         story = (
             "/me ▬▬▬C▬O▬O▬L▬S▬T▬O▬R▬Y▬B▬O▬B▬▬▬▬ CoolStoryBob Storytime: "
@@ -213,47 +251,33 @@ class MiniGames(object):
             answer = emote
         quest += " :thinking:"
         question = story + quest
-        return {"coolstorybob": {"question": question, "answer": answer}}
+        return {"question": question, "answer": answer}
 
     def random_location(self):
         """Return either a random country or a random capital."""
-        location_key = random.choice(list(self.data["capitalof"]))
-        if bool(random.getrandbits(1)):
-            location = location_key
-        else:
-            location = self.data["capitalof"][location_key]
-        return location
+        return random.choice(self.data.locations)
 
     def bethefirsttowrite(self):
         """Be the first to write OR NOT write a word."""
-        qtype = self.questtype[6]
-
         """if random.randrange(100) < 25:
             DONT = "not "
         else:"""
         _not_ = ""
 
-        answer = random.choice(list(self.data[qtype]))
+        answer = random.choice(self.data.write)
         question = (
             f"/me ▬▬▬G▬O▬T▬T▬A▬▬G▬O▬▬F▬A▬S▬T▬▬▬▬ PogChamp QUICK! PogChamp "
             f"Be the first to {_not_}write {answer} ! ▬▬▬G▬O▬T▬T▬A▬▬G▬O▬▬F▬A▬S▬T▬▬▬▬"
         )
 
-        return {"bethefirsttowrite": {"question": question, "answer": answer}}
+        return {"question": question, "answer": answer}
 
     def oneisnotliketheother(self):
         """Present a list of words, where one doesn't belong in."""
-        qtype = self.questtype[5]
-
-        rngkey = random.choice(list(self.data[qtype]))
-        itemlist = self.data[qtype][rngkey].copy()
-        for i in range(0, len(itemlist)):
-            itemlist[i] = itemlist[i].upper()
-
-        otherkey = random.choice(list(set(self.data[qtype]) - {rngkey}))
-        otheritemlist = self.data[qtype][otherkey]
+        rngkey, otherkey = random.sample(self.data.similar_groups, 2)
+        itemlist = list(self.data.similars_upper[rngkey])
 
-        answer = random.choice(otheritemlist)
+        answer = random.choice(self.data.similars[otherkey])
         itemlist.append(answer.upper())
         shuffle(itemlist)
         item = ", ".join(str(x) for x in itemlist)
@@ -263,57 +287,45 @@ class MiniGames(object):
             f"One of these things is not like the others! - NotLikeThis {item} ▬O▬N▬E▬▬I▬S▬▬N▬O▬T▬▬A▬L▬I▬K▬E▬▬"
         )
 
-        return {"oneisnotliketheother": {"question": question, "answer": answer}}
+        return {"question": question, "answer": answer}
 
     def completewithemote(self):
         """Complete the sentence with an emote."""
-        qtype = self.questtype[4]
-
-        item = random.choice(list(self.data[qtype]))
+        item, answer = random.choice(self.data.rhymes)
         question = (
             f"/me ▬▬C▬O▬M▬P▬L▬E▬T▬E▬▬E▬M▬O▬T▬E▬▬ monkaS "
             f'Complete the following rhyme with an emote! monkaS "{item}"'
         )
-        answer = self.data[qtype][item]
 
-        return {"completewithemote": {"question": question, "answer": answer}}
+        return {"question": question, "answer": answer}
 
     def completelyric(self):
         """Complete the song lyric with the last word."""
-        qtype = self.questtype[3]
-
-        item = random.choice(list(self.data[qtype]))
+        item, answer = random.choice(self.data.lyrics)
         question = (
             f"/me ▬C▬O▬M▬P▬L▬E▬T▬E▬▬L▬Y▬R▬I▬C▬S▬▬ monkaS "
             f'Complete the following lyrics: "{item}" monkaS ▬C▬O▬M▬P▬L▬E▬T▬E▬▬L▬Y▬R▬I▬C▬S▬▬'
         )
-        answer = self.data[qtype][item]
 
-        return {"completelyric": {"question": question, "answer": answer}}
+        return {"question": question, "answer": answer}
 
     def colorof(self):
         """Ask which color an object has."""
-        qtype = self.questtype[2]
-
-        item = random.choice(list(self.data[qtype]))
-        article = self.data[qtype][item][1]
+        item, answer, article = random.choice(self.data.colors)
         question = (
             f"/me ▬W▬H▬A▬T▬S▬▬T▬H▬E▬▬C▬O▬L▬O▬R▬▬ :thinking: "
             f"What's the color of {article}{item}? :thinking: ▬W▬H▬A▬T▬S▬▬T▬H▬E▬▬C▬O▬L▬O▬R▬▬"
         )
-        answer = self.data[qtype][item][0]
 
-        return {"colorof": {"question": question, "answer": answer}}
+        return {"question": question, "answer": answer}
 
     def capitalof(self):
         """Ask the capital of a certain country or which country has a certain capital."""
-        qtype = self.questtype[1]
-
-        key = random.choice(list(self.data[qtype]))
+        key, capital = random.choice(self.data.capitals)
         key_arg = bool(random.getrandbits(1))
 
         if key_arg:
-            item = self.data[qtype][key]
+            item = capital
             question = (
                 f"/me ▬▬▬▬▬▬C▬A▬P▬I▬T▬A▬L▬▬O▬F▬▬▬▬▬▬ :thinking: "
                 f"{item} is the capital of? "
@@ -327,22 +339,20 @@ class MiniGames(object):
                 f"What is the capital of {item}?"
                 f":thinking: ▬▬▬▬▬▬C▬A▬P▬I▬T▬A▬L▬▬O▬F▬▬▬▬▬▬"
             )
-            answer = self.data[qtype][key]
+            answer = capital
 
-        return {"capitalof": {"question": question, "answer": answer}}
+        return {"question": question, "answer": answer}
 
     def oppositeof(self):
         """Ask the opposite of a word."""
-        qtype = self.questtype[0]
-
-        key = random.choice(list(self.data[qtype]))
+        key, opposite = random.choice(self.data.opposites)
         key_arg = bool(random.getrandbits(1))
 
         if key_arg:
             item = key
-            answer = self.data[qtype][key]
+            answer = opposite
         else:
-            item = self.data[qtype][key]
+            item = opposite
             answer = key
 
         question = (
@@ -351,7 +361,7 @@ class MiniGames(object):
             f"▬▬▬▬▬O▬P▬P▬O▬S▬I▬T▬E▬▬O▬F▬▬▬▬▬"
         )
 
-        return {"oppositeof": {"question": question, "answer": answer}}
+        return {"question": question, "answer": answer}
 
     def uprank(self, user):
         """Increase ranking of a user by 1."""
@@ -1,71 +1,78 @@
 """Commands: "!pstart", "!pstop"."""
-import random
-
-from twisted.internet import reactor
-
 from bot.commands.abstract.command import Command
+from bot.scheduler import scheduler
 from bot.utilities.permission import Permission
 from bot.utilities.startgame import start_game
-from bot.utilities.tools import format_list, is_call_id_active
+from bot.utilities.tools import format_list
 from bot.utilities.tools import replace_vars
-from .minigames import MiniGames
+from .minigames import DATA_OBJECT, MiniGames, QuestionPools
 
 
 class MonkalotParty(Command):
     """Play the MonkalotParty."""
 
     perm = Permission.User
+    depends_on = (DATA_OBJECT,)
 
     def __init__(self, bot):
         """Initialize variables."""
         self.active = False
         self.responses = {}
+        self.pools = QuestionPools.load(bot)
         self.monkalotparty = None
         self.answer = ""
-        self.callID = None
+        self.expected = ""  # the answer as it is compared
+        self.case_sensitive = False
 
     def start_game(self, bot):
         """Starts pstart game."""
         self.active = True
         bot.game_running = True
-        self.monkalotparty = MiniGames(bot)
+        self.monkalotparty = MiniGames(self.pools, bot.emotes.get_emotes())
         bot.write(self.responses["start_msg"]["msg"])
+        bot.answers.publish(self, folded=["!pstop"])
 
-        """Start of threading"""
-        self.callID = reactor.callLater(5, self.select_game, bot)
+        scheduler.schedule(
+            bot.config.channel, "MonkalotParty", 5, self.select_game, bot
+        )
 
     def select_game(self, bot):
         """Select a game to play next."""
         if not self.active:
             return
 
-        game = random.choice(list(self.monkalotparty.games))
-        question = self.monkalotparty.games[game]["question"]
-        self.answer = str(self.monkalotparty.games[game]["answer"])
+        question, self.answer = self.monkalotparty.next_question()
+        # Emotes have to be written with the right case, everything else is compared
+        # in lowercase.
+        self.case_sensitive = self.answer in self.monkalotparty.emotes
+        self.expected = self.answer if self.case_sensitive else self.answer.lower()
+        if self.case_sensitive:
+            bot.answers.publish(self, exact=[self.answer], folded=["!pstop"])
+        else:
+            bot.answers.publish(self, folded=[self.answer, "!pstop"])
 
         print("Answer: " + self.answer)
         bot.write(question)
 
-        del self.monkalotparty.games[game]
-
     def handle_answer(self, cmd, user, bot):
         """Handle answer by user."""
-        if (
-            self.answer not in bot.emotes.get_emotes()
-        ):  # If not an emote compare in lowercase.
-            self.answer = self.answer.lower()
+        if not self.case_sensitive:
             cmd = cmd.lower()
-        if cmd == self.answer:
+        if cmd == self.expected:
             var = {
                 "<USER>": bot.twitch.display_name(user),
-                "<ANSWER>": self.answer,
+                "<ANSWER>": self.expected,
             }
             bot.write(replace_vars(self.responses["winner_msg"]["msg"], var))
             self.answer = ""
+            self.expected = ""
+            bot.answers.publish(self, folded=["!pstop"])
             bot.ranking.increment_points(user, 5, bot)
             self.monkalotparty.uprank(user)
             if len(self.monkalotparty.games) > 3:
-                self.callID = reactor.callLater(6, self.select_game, bot)
+                scheduler.schedule(
+                    bot.config.channel, "MonkalotParty", 6, self.select_game, bot
+                )
             else:
                 self.game_winners(bot)
                 self.close(bot)
@@ -113,7 +120,7 @@ class MonkalotParty(Command):
 
     def close(self, bot):
         """Turn off on shutdown or reload."""
-        if is_call_id_active(self.callID):
-            self.callID.cancel()
+        scheduler.cancel(bot.config.channel, "MonkalotParty")
+        bot.answers.withdraw(self)
         self.active = False
         bot.game_running = False
@@ -1,12 +1,15 @@
 """Commands: "!notifications on/off", "!addnotification", "!delnotification"."""
 import json
 
-from twisted.internet import reactor
-
+from bot import filewatcher
 from bot.commands.abstract.command import Command
-from bot.paths import NOTIFICATIONS_FILE
+from bot.paths import CONFIG_PATH, CUSTOM_RESPONSES_PATH, NOTIFICATIONS_FILE
+from bot.scheduler import scheduler
 from bot.utilities.permission import Permission
-from bot.utilities.tools import is_call_id_active
+
+# Part of the interval the first notification is delayed by at random, so channels
+# which turned them on at the same time don't all write at once.
+JITTER = 0.1
 
 
 class Notifications(Command):
@@ -17,12 +20,12 @@ class Notifications(Command):
     """
 
     perm = Permission.Moderator
+    depends_on = (CONFIG_PATH, CUSTOM_RESPONSES_PATH, NOTIFICATIONS_FILE)
 
     def __init__(self, bot):
         """Initialize variables."""
         self.responses = bot.config.responses["Notifications"]
         self.active = False  # It should be configured by the user if the notifications are on or off by default.
-        self.callID = None
         self.listindex = 0
         self.notification_interval = bot.config.config["notification_interval"]
 
@@ -31,9 +34,7 @@ class Notifications(Command):
 
         """If notifications are enabled by default, start the threading."""
         if self.active:
-            self.callID = reactor.callLater(
-                self.notification_interval, self.write_notification, bot
-            )
+            self.schedule(bot, first=True)
 
     def raise_list_index(self):
         """Raise the listindex by 1 if it's exceeding the list's length reset the index.
@@ -58,9 +59,21 @@ class Notifications(Command):
             bot.write(self.notifications[self.listindex])
             self.raise_list_index()
 
-        """Threading to keep notifications running, if class active."""
-        self.callID = reactor.callLater(
-            self.notification_interval, self.write_notification, bot
+        """Keep notifications running, if class active."""
+        self.schedule(bot)
+
+    def schedule(self, bot, first=False):
+        """Write the next notification after notification_interval.
+
+        first: jitter the first notification, later ones keep the exact interval.
+        """
+        scheduler.schedule(
+            bot.config.channel,
+            "Notifications",
+            self.notification_interval,
+            self.write_notification,
+            bot,
+            jitter=self.notification_interval * JITTER if first else 0,
         )
 
     def addnotification(self, bot, arg):
@@ -71,6 +84,7 @@ class Notifications(Command):
                 NOTIFICATIONS_FILE.format(bot.root), "w", encoding="utf-8"
             ) as file:
                 json.dump(self.notifications, file, indent=4)
+            filewatcher.wrote(NOTIFICATIONS_FILE.format(bot.root))
             bot.write(self.responses["notification_added"]["msg"])
         else:
             bot.write(self.responses["notification_exists"]["msg"])
@@ -83,6 +97,7 @@ class Notifications(Command):
                 NOTIFICATIONS_FILE.format(bot.root), "w", encoding="utf-8"
             ) as file:
                 json.dump(self.notifications, file, indent=4)
+            filewatcher.wrote(NOTIFICATIONS_FILE.format(bot.root))
             bot.write(self.responses["notification_removed"]["msg"])
         else:
             bot.write(self.responses["notification_not_found"]["msg"])
@@ -110,15 +125,12 @@ class Notifications(Command):
         if msg.lower().startswith("!notifications on"):
             if not self.active:
                 self.active = True
-                self.callID = reactor.callLater(
-                    self.notification_interval, self.write_notification, bot
-                )
+                self.schedule(bot, first=True)
                 bot.write(self.responses["notifications_activate"]["msg"])
             else:
                 bot.write(self.responses["notifications_already_on"]["msg"])
         elif msg.lower().startswith("!notifications off"):
-            if is_call_id_active(self.callID):
-                self.callID.cancel()
+            scheduler.cancel(bot.config.channel, "Notifications")
             if self.active:
                 self.active = False
                 bot.write(self.responses["notifications_deactivate"]["msg"])
@@ -131,6 +143,5 @@ class Notifications(Command):
 
     def close(self, bot):
         """Close the game."""
-        if is_call_id_active(self.callID):
-            self.callID.cancel()
+        scheduler.cancel(bot.config.channel, "Notifications")
         self.active = False
@@ -8,6 +8,7 @@ class Oralpleasure(Command):
     """Turn oral pleasure on and off."""
 
     perm = Permission.User
+    depends_on = ()
 
     def __init__(self, _):
         """Initialize variables."""
@@ -0,0 +1,84 @@
+"""Commands: "!metrics", "!metrics on/off", "!metrics <command>"."""
+import time
+
+from bot.commands.abstract.command import Command
+from bot.utilities.permission import Permission
+from bot.utilities.tools import replace_vars
+
+
+def _ms(seconds):
+    return "{:.2f}".format(seconds * 1000)
+
+
+class OutputMetrics(Command):
+    """Show or toggle the recorded command metrics."""
+
+    perm = Permission.Admin
+    depends_on = ()
+
+    def __init__(self, _):
+        """Initialize variables."""
+        self.responses = {}
+
+    def match(self, bot, user, msg, tag_info):
+        """Match if message starts with !metrics."""
+        return msg.lower().startswith("!metrics")
+
+    def run(self, bot, user, msg, tag_info):
+        """Write the metrics or enable/disable them."""
+        self.responses = bot.config.responses["Metrics"]
+        arg = msg[len("!metrics") :].strip()
+
+        if arg.lower() == "on":
+            bot.enable_metrics()
+            bot.write(self.responses["metrics_on"]["msg"])
+        elif arg.lower() == "off":
+            bot.metrics = None
+            bot.write(self.responses["metrics_off"]["msg"])
+        elif bot.metrics is None:
+            bot.write(self.responses["metrics_disabled"]["msg"])
+        elif arg:
+            self.output_command(bot, arg)
+        else:
+            self.output_summary(bot)
+
+    def output_summary(self, bot):
+        """Write the message rate and the slowest commands."""
+        metrics = bot.metrics
+        slowest = []
+        for name in metrics.slowest(3):
+            command = metrics.commands[name]
+            slowest.append(
+                "{} ({}/{}ms)".format(
+                    name, _ms(command.match_time.mean()), _ms(command.run_time.mean())
+                )
+            )
+        var = {
+            "<RATE>": "{:.0f}".format(metrics.message_rate()),
+            "<MESSAGES>": metrics.messages,
+            "<MINUTES>": int((time.time() - metrics.started) / 60),
+            "<SLOWEST>": ", ".join(slowest) or "-",
+        }
+        bot.write(replace_vars(self.responses["summary"]["msg"], var))
+
+    def output_command(self, bot, name):
+        """Write the metrics of one command."""
+        commands = {n.lower(): n for n in bot.metrics.commands}
+        if name.lower() not in commands:
+            var = {"<COMMAND>": name}
+            bot.write(replace_vars(self.responses["command_not_found"]["msg"], var))
+            return
+
+        name = commands[name.lower()]
+        command = bot.metrics.commands[name]
+        var = {
+            "<COMMAND>": name,
+            "<MATCHES>": command.matches,
+            "<HITS>": command.hits,
+            "<RUNS>": command.runs,
+            "<ERRORS>": command.errors,
+            "<MATCH_MEAN>": _ms(command.match_time.mean()),
+            "<RUN_MEAN>": _ms(command.run_time.mean()),
+            "<RUN_P95>": _ms(command.run_time.percentile(95)),
+        }
+        bot.write(replace_vars(self.responses["command"]["msg"], var))
@@ -12,6 +12,7 @@ class OutputQuote(Command):
     """Simple Class to output quotes stored in a json-file."""
 
     perm = Permission.User
+    depends_on = (QUOTES_FILE,)
 
     def __init__(self, bot):
         """Load command list."""
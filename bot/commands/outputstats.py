@@ -8,6 +8,7 @@ class OutputStats(Command):
     """Reply total emote stats or stats/per minute."""
 
     perm = Permission.User
+    depends_on = ()
 
     def __init__(self, _):
         """Initialize variables."""
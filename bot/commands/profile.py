@@ -0,0 +1,51 @@
+"""Commands: "!profile [<seconds>]", "!profile stop"."""
+from twisted.internet import reactor
+
+from bot.commands.abstract.command import Command
+from bot.profiler import DEFAULT_DURATION, MAX_DURATION, profiler
+from bot.utilities.permission import Permission
+from bot.utilities.tools import replace_vars
+
+
+class Profile(Command):
+    """Start or stop the sampling profiler."""
+
+    perm = Permission.Admin
+    depends_on = ()
+
+    def __init__(self, _):
+        """Initialize variables."""
+        self.responses = {}
+
+    def match(self, bot, user, msg, tag_info):
+        """Match if message starts with !profile."""
+        return msg.lower().startswith("!profile")
+
+    def run(self, bot, user, msg, tag_info):
+        """Start or stop the profiler."""
+        self.responses = bot.config.responses["Profile"]
+        arg = msg[len("!profile") :].strip().lower()
+
+        if arg == "stop":
+            # The message about the written file is sent by the callback.
+            if profiler.stop() is None:
+                bot.write(self.responses["not_running"]["msg"])
+            return
+
+        try:
+            seconds = int(arg) if arg else DEFAULT_DURATION
+        except ValueError:
+            seconds = DEFAULT_DURATION
+        seconds = min(max(seconds, 1), MAX_DURATION)
+
+        def finished(path, samples):
+            var = {"<PATH>": path, "<SAMPLES>": samples}
+            reply = replace_vars(self.responses["finished"]["msg"], var)
+            reactor.callFromThread(bot.write, reply)
+
+        path = profiler.start(seconds, callback=finished)
+        if path is None:
+            bot.write(self.responses["already_running"]["msg"])
+        else:
+            var = {"<SECONDS>": seconds, "<PATH>": path}
+            bot.write(replace_vars(self.responses["started"]["msg"], var))
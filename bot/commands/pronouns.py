@@ -2,6 +2,7 @@
 import json
 
 from bot.commands.abstract.command import Command
+from bot.paths import CUSTOM_RESPONSES_PATH
 from bot.utilities.permission import Permission
 
 
@@ -12,6 +13,7 @@ class Pronouns(Command):
     """
 
     perm = Permission.Admin
+    depends_on = (CUSTOM_RESPONSES_PATH,)
 
     def __init__(self, _):
         """Initialize variables."""
@@ -1,15 +1,20 @@
 """Commands: "[emote]"."""
 import logging
 import random
-from collections import Counter
 from enum import Enum
 
 from bot.commands.abstract.command import Command
+from bot.data_sources.emotes import EMOTES
+from bot.paths import CONFIG_PATH, CUSTOM_RESPONSES_PATH
 from bot.utilities.permission import Permission
 from bot.utilities.tools import format_list
 from bot.utilities.tools import replace_vars
 
 
+# Messages with more words can't be a pyramid level, they are not even looked at.
+MAX_LEVEL = 50
+
+
 class EmoteType(Enum):
     """Types of twitch emote."""
 
@@ -22,16 +27,18 @@ class Pyramid(Command):
     """Recognizes pyramids of emotes."""
 
     perm = Permission.User
+    depends_on = (CONFIG_PATH, CUSTOM_RESPONSES_PATH, EMOTES)
 
     def __init__(self, bot):
         """Initialize variables."""
         self.responses = bot.config.responses["Pyramid"]
-        self.non_twitch_emotes = (
+        # BTTV, FFZ emotes and emojis, twitch emotes are recognized by their tags
+        self.non_twitch_emotes = frozenset(
             bot.emotes.get_global_bttv_emotes()
             + bot.emotes.get_channel_bttv_emotes()
             + bot.emotes.get_channel_ffz_emotes()
+            + bot.emotes.get_emojis()
         )
-        self.emojis = bot.emotes.get_emojis()
 
         self.pyramid_builders = []
         self.current_type = None
@@ -56,7 +63,8 @@ class Pyramid(Command):
         if msg_type == EmoteType.INVALID:
             # Not single emote message, so we reset earlier
             # print("Invalid input for pyramid -- not even an emote, or multiple emote")
-            self.reset()
+            if self.pyramidLevel:
+                self.reset()
         else:
             if self.valid_next_level(msg_type, msg_count, emote):
                 # print("Valid next level input")
@@ -262,44 +270,37 @@ class Pyramid(Command):
 
     def get_info(self, msg, tag_info):
         """Checks message and returns emote type and their count."""
-        e_type = EmoteType.INVALID
-        count = 0
-        emote = ""  # can be int or str, depends on type
-
         valid_t, count_t, emote_id = self.check_valid_twitch_emote_with_count(tag_info)
-        valid_b, count_b, emote_b = self.check_valid_non_twitch_emote_with_count(msg)
-
         if valid_t:
-            e_type, count = EmoteType.TWITCH, count_t
-            emote = emote_id
-            self.emote_input_str = msg.split()[0]
-        elif valid_b:
-            e_type, count = EmoteType.NONTWITCH, count_b
-            emote = emote_b
+            self.emote_input_str = msg.split(" ", 1)[0]
+            return EmoteType.TWITCH, count_t, emote_id
+
+        valid_b, count_b, emote_b = self.check_valid_non_twitch_emote_with_count(msg)
+        if valid_b:
             self.emote_input_str = emote_b
+            return EmoteType.NONTWITCH, count_b, emote_b
 
-        return e_type, count, emote
+        return EmoteType.INVALID, 0, ""
 
     def check_valid_non_twitch_emote_with_count(self, msg):
         """Checks whether message contains a valid external emote and returns it and its count."""
         invalid_data = (False, -1, "")
 
-        # split msg with space, check if only one emote/emoji only
-        msg_counter = Counter(msg.split())
-
-        if len(msg_counter) != 1:
-            # more than 1 different type of messages splited with whitespace, or 0
+        # Most messages don't start with an emote, so check that before splitting everything.
+        first = msg.split(None, 1)
+        emote = first[0] if first else ""
+        if emote not in self.non_twitch_emotes:
             return invalid_data
 
-        emote, count = msg_counter.popitem()
+        # Every word has to be the same emote
         # Don't use string.count() to count: need to exclude substring like 'Kappa' in 'KappaPride'
-        # count = msg.count(emote)
-
-        if emote not in self.non_twitch_emotes and emote not in self.emojis:
+        words = msg.split(None, MAX_LEVEL)
+        count = len(words)
+        if count > MAX_LEVEL or words.count(emote) != count:
             return invalid_data
-        else:
-            # single valid emote/emoji confirmed
-            return True, count, emote
+
+        # single valid emote/emoji confirmed
+        return True, count, emote
 
         # NOTE: currently there are no regex type of BTTV emote and emoji
         # We need to change our logic if that happens ... have to loop all regex emote to check if any matches
@@ -308,13 +309,11 @@ class Pyramid(Command):
     def check_valid_twitch_emote_with_count(tag_info):
         """Checks whether message contains a valid twitch emote and returns it and its count."""
         if tag_info and tag_info.get("twitch_emote_only"):
-            emote_stats = tag_info[
-                "twitch_emotes"
-            ].copy()  # make a copy since we will popitem()
-            emote_id, freq = emote_stats.popitem()
-            if len(emote_stats) == 0:
+            emote_stats = tag_info["twitch_emotes"]
+            if len(emote_stats) == 1:
                 # only one emote
-                return True, freq, emote_id
+                for emote_id, freq in emote_stats.items():
+                    return True, freq, emote_id
         return False, -1, -1
 
     @staticmethod
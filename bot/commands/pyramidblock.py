@@ -7,6 +7,7 @@ class PyramidBlock(Command):
     """Send a random SMOrc message."""
 
     perm = Permission.Moderator
+    depends_on = ()
     responses = {}
 
     def __init__(self, _):
@@ -10,6 +10,7 @@ class PyramidReply(Command):
     """
 
     perm = Permission.User
+    depends_on = ()
 
     replies = {
         "!pjsalt": "PJSalt",
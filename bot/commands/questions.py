@@ -9,6 +9,10 @@ class Questions(Command):
     """Answer a set of questions directed at the bot."""
 
     perm = Permission.User
+    depends_on = ()
+    # Math questions are answered by the calculator, with its limits.
+    blocking = Calculator.blocking
+    timeout = Calculator.timeout
 
     whatis = ["what's", "whats", "what is"]
 
@@ -57,3 +61,7 @@ class Questions(Command):
                 .replace("?", "")
             )
             self.calc.run(bot, user, "!calc " + cmd, tag_info)
+
+    def timed_out(self, bot, user, msg, tag_info):
+        """Tell the user the calculation took too long."""
+        self.calc.timed_out(bot, user, msg, tag_info)
@@ -9,6 +9,7 @@ class Rank(Command):
     """Get rank of a user."""
 
     perm = Permission.User
+    depends_on = ()
 
     def __init__(self, _):
         """Initialize variables."""
@@ -11,6 +11,7 @@ class SlapHug(Command):
     """Slap or hug a user."""
 
     perm = Permission.User
+    depends_on = (SLAPHUG_FILE,)
 
     def __init__(self, bot):
         """Load command list."""
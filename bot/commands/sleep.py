@@ -8,6 +8,7 @@ class Sleep(Command):
     """Allows admins and trusted mods to pause the bot."""
 
     perm = Permission.Moderator
+    depends_on = ()
 
     def __init__(self, _):
         """Initialize variables."""
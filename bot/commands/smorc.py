@@ -11,6 +11,7 @@ class Smorc(Command):
     """Send a random SMOrc message."""
 
     perm = Permission.User
+    depends_on = (SMORC_FILE,)
 
     def __init__(self, bot):
         """Load command list."""
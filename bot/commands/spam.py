@@ -1,46 +1,99 @@
 """Commands:."""
+from collections import Counter, deque
+
 from bot.commands.abstract.command import Command
+from bot.data_sources.emotes import EMOTES
+from bot.paths import CONFIG_PATH
 from bot.utilities.permission import Permission
 
 
 class Spam(Command):
-    """Spams together with chat."""
+    """Spams together with chat.
+
+    Keeps the last OBSERVED_MESSAGES messages and matches as soon as one of them was
+    sent NECESSARY_SPAM times. Both can be set per channel in bot_config.json:
+    "spam": {"observed_messages": 15, "necessary_spam": 6}
+    """
 
     perm = Permission.User
+    depends_on = (CONFIG_PATH, EMOTES)
 
     OBSERVED_MESSAGES = 15
     NECESSARY_SPAM = 6
 
-    def __init__(self, _):
+    def __init__(self, bot):
         """Initialize variables."""
-        self.fifo = []
-        self.counter = {}
-        self.maxC = 0
-        self.maxMsg = ""
+        config = bot.config.config.get("spam", {})
+        self.observed_messages = config.get("observed_messages", self.OBSERVED_MESSAGES)
+        self.necessary_spam = config.get("necessary_spam", self.NECESSARY_SPAM)
+        self.emotes = frozenset(bot.emotes.get_emotes() + bot.emotes.get_emojis())
+        self.reset()
+
+    def reset(self):
+        """Forget all observed messages."""
+        self.window = deque()  # normalized messages, oldest first
+        self.counter = Counter()  # normalized message -> count in window
+        self.counts = Counter()  # count -> number of messages with that count
+        self.maxC = 0  # highest count in window
+        self.maxMsg = ""  # last message which reached the highest count
+        self.latest = {}  # normalized message -> how it was last written
+
+    def normalize(self, msg):
+        """Return the message as it is counted.
+
+        Ignores case, repeated whitespace and emotes at the end, unless the message
+        only consists of emotes.
+        """
+        words = msg.split()
+        end = len(words)
+        while end > 1 and words[end - 1] in self.emotes:
+            end -= 1
+        if end == 1 and words[0] in self.emotes:
+            end = len(words)
+        return " ".join(words[:end]).casefold()
 
     def match(self, bot, user, msg, tag_info):
         """Add message to queue. Match if a message was spammed more than NECESSARY_SPAM."""
-        self.fifo.append(msg)
-        if msg not in self.counter:
-            self.counter[msg] = 1
-        else:
-            self.counter[msg] = self.counter[msg] + 1
-            if self.counter[msg] > self.maxC:
-                self.maxC = self.counter[msg]
-                self.maxMsg = msg
+        key = self.normalize(msg)
+        if not key:
+            return False
+        if len(self.window) >= self.observed_messages:
+            self._decrement(self.window.popleft())
 
-        if len(self.fifo) > self.OBSERVED_MESSAGES:
-            delmsg = self.fifo.pop(0)
-            self.counter[delmsg] = self.counter[delmsg] - 1
-            if self.counter[delmsg] == 0:
-                self.counter.pop(delmsg, None)
+        self.window.append(key)
+        self.latest[key] = msg
+        self._increment(key)
+        if self.counter[key] >= self.maxC:
+            self.maxC = self.counter[key]
+            self.maxMsg = key
 
-        return self.maxC >= self.NECESSARY_SPAM
+        return self.maxC >= self.necessary_spam
 
     def run(self, bot, user, msg, tag_info):
         """Check if there is spamming."""
-        self.fifo = []
-        self.counter = {}
-        self.maxC = 0
-        bot.write(self.maxMsg)
-        self.maxMsg = ""
+        bot.write(self.latest[self.maxMsg])
+        self.reset()
+
+    def _increment(self, key):
+        count = self.counter[key]
+        if count:
+            self.counts[count] -= 1
+        self.counter[key] = count + 1
+        self.counts[count + 1] += 1
+
+    def _decrement(self, key):
+        """Remove one occurrence of a message and keep the maximum up to date."""
+        count = self.counter[key]
+        self.counts[count] -= 1
+        if count == 1:
+            del self.counter[key]
+            del self.latest[key]
+        else:
+            self.counter[key] = count - 1
+            self.counts[count - 1] += 1
+
+        # Only the last message with the maximum count can lower the maximum, by one.
+        # Counts only grow through the current message, so this is enough to know when
+        # a message reaches NECESSARY_SPAM.
+        if count == self.maxC and self.counts[count] == 0:
+            self.maxC = count - 1
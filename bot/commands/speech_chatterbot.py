@@ -1,10 +1,13 @@
 """Commands: "@[botname] XXXXX"."""
 import logging
-
-from chatterbot import ChatBot
-from chatterbot.trainers import ChatterBotCorpusTrainer
+import os
+import re
+import threading
 
 from bot.commands.abstract.speech import Speech, Chatbot
+from bot.paths import CHATTERBOT_DATABASE_PATH
+
+DEFAULT_CORPUS = "chatterbot.corpus.english"
 
 
 class ChatterbotSpeech(Speech):
@@ -13,32 +16,74 @@ class ChatterbotSpeech(Speech):
     def __init__(self, bot):
         """Initialize variables."""
         trainer = bot.config.config.get("chatterbot_trainer")
-        if trainer:
-            self.chatbot = Chatterbot(trainer)
-        else:
-            self.chatbot = Chatterbot("chatterbot.corpus.english")
+        self.chatbot = Chatterbot.for_corpus(trainer or DEFAULT_CORPUS)
 
 
 class Chatterbot(Chatbot):
-    """A replier that uses chatterbot."""
+    """A replier that uses chatterbot.
+
+    Channels using the same corpus share one instance. It is trained once in a
+    background thread and stored in CHATTERBOT_DATABASE_PATH, later starts only load it.
+    """
 
     name = "chatterbot"
 
+    instances = {}  # corpus -> Chatterbot
+    instances_lock = threading.Lock()
+
+    @classmethod
+    def for_corpus(cls, corpus_string):
+        """Return the chat bot for a corpus, creating it if necessary."""
+        with cls.instances_lock:
+            if corpus_string not in cls.instances:
+                cls.instances[corpus_string] = cls(corpus_string)
+            return cls.instances[corpus_string]
+
     def __init__(self, corpus_string):
         self.trained = False
         self.conversations = {}
+        self.chatterbot = None
         logging.info("Setting up chat bot...")
         # asynchronous training
-        self._train(corpus_string)
+        threading.Thread(
+            target=self._train,
+            args=(corpus_string,),
+            name="chatterbot-" + corpus_string,
+            daemon=True,
+        ).start()
 
     def _train(self, corpus_string):
+        # Imported here, chatterbot takes seconds to import.
+        from chatterbot import ChatBot
+        from chatterbot.trainers import ChatterBotCorpusTrainer
+
+        path = CHATTERBOT_DATABASE_PATH.format(re.sub(r"\W", "_", corpus_string))
+        # Only written once training finished, else the database is incomplete.
+        trained_path = path + ".trained"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        trained = os.path.isfile(trained_path)
+        if not trained and os.path.isfile(path):
+            os.remove(path)
+
         chatbot_logger = logging.Logger("WARNING")
-        # Train based on the english corpus
-        self.chatterbot = ChatBot("Monkalot", read_only=True, logger=chatbot_logger)
-        trainer = ChatterBotCorpusTrainer(self.chatterbot)
-        trainer.train(corpus_string)
+        chatterbot = ChatBot(
+            "Monkalot",
+            read_only=True,
+            logger=chatbot_logger,
+            storage_adapter="chatterbot.storage.SQLStorageAdapter",
+            database_uri="sqlite:///" + os.path.abspath(path),
+        )
+        if trained:
+            logging.info("...chat bot loaded from {}.".format(path))
+        else:
+            # Train based on the corpus
+            trainer = ChatterBotCorpusTrainer(chatterbot)
+            trainer.train(corpus_string)
+            with open(trained_path, "w", encoding="utf-8") as file:
+                file.write(corpus_string)
+            logging.info("...chat bot finished training.")
+        self.chatterbot = chatterbot
         self.trained = True
-        logging.info("...chat bot finished training.")
 
     def get_reply(self, message, name):
         """Get a reply from the chat bot."""
@@ -11,6 +11,8 @@ class StreamInfo(Command):
     """Get stream informations and write them in chat."""
 
     perm = Permission.User
+    depends_on = ()
+    blocking = True  # requests the stream information
 
     def match(self, bot, user, msg, tag_info):
         """Match if a stream information command is triggered."""
@@ -24,7 +26,6 @@ class StreamInfo(Command):
     def run(self, bot, user, msg, tag_info):
         """Get stream object and return requested information."""
         responses = bot.config.responses["StreamInfo"]
-        stream = bot.twitch.get_stream(bot.config.channelID)
         cmd = msg.lower()
 
         if cmd.startswith("!bttv"):
@@ -34,7 +35,10 @@ class StreamInfo(Command):
                 )
             }
             bot.write(replace_vars(responses["bttv_msg"]["msg"], var))
-        elif stream["stream"] is None:
+            return
+
+        stream = bot.twitch.get_stream(bot.config.channelID)
+        if stream["stream"] is None:
             bot.write(responses["stream_off"]["msg"])
         elif cmd.startswith("!fps"):
             fps = format(stream["stream"]["average_fps"], ".2f")
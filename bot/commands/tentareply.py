@@ -7,6 +7,7 @@ class TentaReply(Command):
     """Reply with squid emotes or penta emotes."""
 
     perm = Permission.User
+    depends_on = ()
 
     def match(self, bot, user, msg, tag_info):
         """Match if the message starts with '!tenta ' or '!penta ' followed by an emote."""
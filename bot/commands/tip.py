@@ -3,6 +3,7 @@
 import time
 
 from bot.commands.abstract.command import Command
+from bot.paths import CUSTOM_RESPONSES_PATH
 from bot.utilities.permission import Permission
 from bot.utilities.tools import replace_vars
 
@@ -11,6 +12,7 @@ class Tip(Command):
     """Tip spampoints to another user."""
 
     perm = Permission.User
+    depends_on = (CUSTOM_RESPONSES_PATH,)
 
     def __init__(self, bot):
         """Initialize variables."""
@@ -84,9 +86,7 @@ class Tip(Command):
 
         """If the user has enough points transfer them to the target
         and set tiptimer."""
-        if bot.ranking.get_points(user) >= amount:
-            bot.ranking.increment_points(user, -amount, bot)
-            bot.ranking.increment_points(target, amount, bot)
+        if bot.ranking.transfer(user, target, amount, bot):
             typeemote = self.get_type_emote(amount)
             var = {
                 "<USER>": user,
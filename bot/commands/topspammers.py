@@ -11,6 +11,7 @@ class TopSpammers(Command):
     """Write top spammers."""
 
     perm = Permission.User
+    depends_on = ()
 
     def match(self, bot, user, msg, tag_info):
         """Match if message is !topspammers."""
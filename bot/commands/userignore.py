@@ -1,5 +1,6 @@
 """Commands: "!ignore", "!unignore"."""
 from bot.commands.abstract.command import Command
+from bot.paths import CUSTOM_RESPONSES_PATH
 from bot.utilities.permission import Permission
 from bot.utilities.tools import replace_vars
 
@@ -8,6 +9,7 @@ class UserIgnore(Command):
     """Let mods to make bot ignore/unignore a user."""
 
     perm = Permission.Moderator
+    depends_on = (CUSTOM_RESPONSES_PATH,)
 
     def __init__(self, bot):
         """Initialize responses."""
@@ -9,6 +9,7 @@ from bot.paths import (
 import json
 import logging
 from bot.utilities.dict_utilities import deep_merge_dict
+from bot.utilities.tools import check_responses
 from bot.data_sources.twitch import TwitchSource
 import time
 
@@ -19,36 +20,127 @@ DEFAULT_RAID_ANNOUNCE_THRESHOLD = 15
 class ConfigSource:
     """Provides data from config files."""
 
+    # Files read by this source, see reload()
+    FILES = [
+        CONFIG_PATH,
+        TRUSTED_MODS_PATH,
+        IGNORED_USERS_PATH,
+        PRONOUNS_PATH,
+        CUSTOM_RESPONSES_PATH,
+    ]
+
     def __init__(self, root, cache):
         """Reload the entire config."""
         self.root = root
-        self.config = self._read_json(CONFIG_PATH)
-        self.trusted_mods = self._read_json(TRUSTED_MODS_PATH)
-        self.ignored_users = self._read_json(IGNORED_USERS_PATH)
-        self.pronouns = self._read_json(PRONOUNS_PATH)
-
-        # load template responses first
-        responses = self._read_json(TEMPLATE_RESPONSES_PATH)
-        custom_responses = self._read_json(CUSTOM_RESPONSES_PATH)
-        # then merge with custom responses
-        self.responses = deep_merge_dict(responses, custom_responses)
-
+        self.cache = cache
+        self.config = None
+        self.trusted_mods = None
+        self.ignored_users = None
+        self.pronouns = None
+        self.responses = None
+        self.channel = None
+        self.twitch_api_headers = None
+        for path in self.FILES:
+            self._load(path)
+
+    # Keys every bot_config.json needs
+    REQUIRED_CONFIG = [
+        "channel",
+        "username",
+        "clientID",
+        "oauth_key",
+        "access_token",
+        "owner_list",
+        "pleb_cooldown",
+        "pleb_gametimer",
+    ]
+
+    @staticmethod
+    def validate(path, data):
+        """Raise a ValueError if data can't be the content of a file read by this source.
+
+        Content of other files is not checked.
+        """
+        if path == CONFIG_PATH:
+            if not isinstance(data, dict):
+                raise ValueError("The config has to be a dictionary.")
+            missing = [key for key in ConfigSource.REQUIRED_CONFIG if key not in data]
+            if missing:
+                raise ValueError("Missing config keys: " + ", ".join(missing))
+        elif path in (TRUSTED_MODS_PATH, IGNORED_USERS_PATH):
+            if not isinstance(data, list):
+                raise ValueError("A list of user names is required.")
+        elif path == PRONOUNS_PATH:
+            if not isinstance(data, dict) or "default" not in data:
+                raise ValueError("Pronouns need a 'default' entry.")
+        elif path == CUSTOM_RESPONSES_PATH:
+            if not isinstance(data, dict):
+                raise ValueError("Responses have to be a dictionary.")
+
+    def reload(self, paths, data=None):
+        """Reread the given files, return the ones whose content changed.
+
+        paths: path templates from bot.paths, others are ignored.
+        data: already read content of some of the files, by path template.
+        """
+        data = data or {}
+        changed = set()
+        for path in paths:
+            if path in self.FILES and self._load(path, data.get(path)):
+                changed.add(path)
+        return changed
+
+    def _load(self, path, data=None):
+        """Read one file unless its content is given, return whether it changed."""
+        if data is None:
+            data = self._read_json(path)
+        if path == CONFIG_PATH:
+            config = data
+            if config == self.config:
+                return False
+            self._set_config(config)
+        elif path == CUSTOM_RESPONSES_PATH:
+            # load template responses first
+            responses = self._read_json(TEMPLATE_RESPONSES_PATH)
+            custom_responses = data
+            # then merge with custom responses
+            responses = deep_merge_dict(responses, custom_responses)
+            if responses == self.responses:
+                return False
+            check_responses(responses)
+            self.responses = responses
+        else:
+            attribute = {
+                TRUSTED_MODS_PATH: "trusted_mods",
+                IGNORED_USERS_PATH: "ignored_users",
+                PRONOUNS_PATH: "pronouns",
+            }[path]
+            if data == getattr(self, attribute):
+                return False
+            setattr(self, attribute, data)
+        return True
+
+    def _set_config(self, config):
+        self.config = config
         self.owner_list = self.config["owner_list"]
         self.nickname = str(self.config["username"])
         self.clientID = str(self.config["clientID"])
         self.access_token = str(self.config["access_token"])
         self.oauth_key = str(self.config["oauth_key"])
 
-        self.twitch_api_headers = {
+        twitch_api_headers = {
             "Accept": "application/vnd.twitchtv.v5+json",
             "Client-ID": self.clientID,
             'Authorization': 'Bearer ' + self.access_token,
         }
+        channel = "#" + str(self.config["channel"])
+        # Resolving the channel id needs a request, only do it if the channel changed.
+        if channel != self.channel or twitch_api_headers != self.twitch_api_headers:
+            self.twitch_api_headers = twitch_api_headers
+            self.channel = channel
+            self.twitch = TwitchSource(self.channel, self.cache, self.twitch_api_headers)
+            self.channelID = self.twitch.get_user_id(str(self.config["channel"]))
 
-        self.channel = "#" + str(self.config["channel"])
-        self.twitch = TwitchSource(self.channel, cache, self.twitch_api_headers)
-
-        self.channelID = self.twitch.get_user_id(str(self.config["channel"]))
         self.pleb_cooldowntime = self.config[
             "pleb_cooldown"
         ]  # time between non-sub commands
@@ -11,6 +11,9 @@ from bot.utilities.tools import format_emote_list
 from bot.utilities.webcache import WebCache
 import logging
 
+# Dependency of commands on the emote lists, see Command.depends_on
+EMOTES = "emotes"
+
 
 class EmoteSource:
     """Source for aggregating emotes from different sources."""
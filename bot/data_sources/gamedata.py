@@ -0,0 +1,187 @@
+"""Loads tables of game data, e.g. the drivers of GuessDriverGame.
+
+Sources can be .xlsx (first sheet), .csv or .json files, the first row (or the keys)
+being the header. They are converted once into a columnar JSON file in
+GAME_DATA_CACHE_PATH, which is read instead as long as the source is unchanged.
+"""
+import csv
+import json
+import logging
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from bot.paths import GAME_DATA_CACHE_PATH
+from bot.utilities.objectstore import ObjectStore
+
+_stores = {}  # (path, name columns) -> (source version, ObjectStore)
+
+
+def load_table(path, name_columns):
+    """Return the rows of a table as ObjectStore.
+
+    The names of the rows are their name_columns joined by spaces. The store is kept
+    until the file changes, so recreating a command doesn't load it again.
+    """
+    key = (path, tuple(name_columns))
+    version = _version(path)
+    entry = _stores.get(key)
+    if entry is None or entry[0] != version:
+        columns = load_columns(path, version)
+        names = [
+            " ".join(str(value) for value in row)
+            for row in zip(*(columns[column] for column in name_columns))
+        ]
+        entry = (version, ObjectStore(columns, names))
+        _stores[key] = entry
+    return entry[1]
+
+
+def load_columns(path, version=None):
+    """Return {column: values} of a table, from the cache if it is up to date."""
+    version = version or _version(path)
+    cache_path = GAME_DATA_CACHE_PATH.format(os.path.basename(path))
+    try:
+        with open(cache_path, "r", encoding="utf-8") as file:
+            cache = json.load(file)
+        if cache["version"] == version:
+            return dict(zip(cache["header"], cache["columns"]))
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+
+    header, rows = read_table(path)
+    columns = [[row[i] for row in rows] for i in range(len(header))]
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"version": version, "header": header, "columns": columns},
+                file,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logging.warning("Could not cache {}: {}".format(path, e))
+    return dict(zip(header, columns))
+
+
+def read_table(path):
+    """Parse a source file, return (header, rows), all rows as long as the header."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".xlsx":
+        rows = _read_xlsx(path)
+    elif extension == ".csv":
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            rows = [[_parse_number(value) for value in row] for row in csv.reader(file)]
+    elif extension == ".json":
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if isinstance(data, dict):  # {column: values}
+            header = list(data)
+            return header, [list(row) for row in zip(*data.values())]
+        header = list(data[0]) if data else []  # [{column: value}, ...]
+        return header, [[obj.get(column) for column in header] for obj in data]
+    else:
+        raise ValueError("Unsupported game data file: " + path)
+
+    rows = [row for row in rows if any(value not in (None, "") for value in row)]
+    if not rows:
+        return [], []
+    # Columns without header are left out.
+    used = [i for i, column in enumerate(rows[0]) if column not in (None, "")]
+    header = [str(rows[0][i]) for i in used]
+    rows = [[row[i] if i < len(row) else None for i in used] for row in rows[1:]]
+    return header, rows
+
+
+def _version(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _parse_number(value):
+    """Turn numbers read as text into int or float."""
+    for number_type in (int, float):
+        try:
+            return number_type(value)
+        except ValueError:
+            pass
+    return value
+
+
+# Spreadsheet XML, see ECMA-376
+_NS = {
+    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "rel": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "pkg": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+
+
+def _read_xlsx(path):
+    """Return the cell values of the first sheet of an .xlsx file, row by row."""
+    with zipfile.ZipFile(path) as archive:
+        shared = []
+        if "xl/sharedStrings.xml" in archive.namelist():
+            root = ElementTree.fromstring(archive.read("xl/sharedStrings.xml"))
+            for item in root.iterfind("main:si", _NS):
+                shared.append(_text(item))
+
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        sheet = workbook.find("main:sheets/main:sheet", _NS)
+        rel_id = sheet.get("{{{}}}id".format(_NS["rel"]))
+        rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        target = next(
+            rel.get("Target")
+            for rel in rels.iterfind("pkg:Relationship", _NS)
+            if rel.get("Id") == rel_id
+        )
+        target = target.lstrip("/")
+        sheet_path = target if target.startswith("xl/") else "xl/" + target
+        root = ElementTree.fromstring(archive.read(sheet_path))
+
+    rows = []
+    for row in root.iterfind("main:sheetData/main:row", _NS):
+        values = []
+        for cell in row.iterfind("main:c", _NS):
+            column = _column_index(cell.get("r"), len(values))
+            values.extend([None] * (column - len(values)))
+            values.append(_cell_value(cell, shared))
+        rows.append(values)
+    width = max((len(row) for row in rows), default=0)
+    return [row + [None] * (width - len(row)) for row in rows]
+
+
+def _text(item):
+    """Return the text of a string item, which may consist of formatted runs."""
+    texts = item.findall("main:t", _NS) + item.findall("main:r/main:t", _NS)
+    return "".join(t.text or "" for t in texts)
+
+
+def _column_index(reference, default):
+    """Return the column of a cell reference like "AB12", counting from 0."""
+    if reference is None:
+        return default
+    index = 0
+    for letter in re.match(r"[A-Z]+", reference).group():
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+def _cell_value(cell, shared):
+    cell_type = cell.get("t", "n")
+    if cell_type == "inlineStr":
+        return _text(cell.find("main:is", _NS))
+    value = cell.find("main:v", _NS)
+    if value is None or value.text is None:
+        return None
+    text = value.text
+    if cell_type == "s":
+        return shared[int(text)]
+    if cell_type == "b":
+        return text == "1"
+    if cell_type in ("str", "e"):
+        return text
+    number = float(text)
+    return int(number) if number.is_integer() else number
@@ -1,15 +1,246 @@
-from bot.paths import HEARTHSTONE_CARD_API
+import re
+from bisect import bisect_left
+from collections import Counter
+
+from bot.paths import HEARTHSTONE_CARD_API, SPELLCORRECTION_CACHE_PATH
+from bot.utilities.objectstore import ObjectStore
+from bot.utilities.spellcorrection import SpellCorrection
+from bot.utilities.tools import normalize_name
 from bot.utilities.webcache import WebCache
 
 
+MIN_SEARCH_LENGTH = 3  # shorter queries match too many cards
+RESOLVE_SCORE = 0.5  # minimum search score to take a search result as the meant card
+ANSWER_SIMILARITY = 0.6  # minimum trigram similarity to accept a guessed name
+# Stats of minions kept for GuessMinionGame
+MINION_ATTRIBUTES = ["cardClass", "set", "name", "rarity", "attack", "cost", "health"]
+
+
+def search_key(name):
+    """Lowercase a name and replace punctuation by spaces.
+
+    e.g.: "Ragnaros, Lightlord" -> "ragnaros lightlord"
+    """
+    return " ".join(re.split(r"\W+", name.casefold())).strip()
+
+
+def trigrams(key):
+    """Return the set of trigrams of a search key, padded to weigh the start more."""
+    padded = "  {} ".format(key)
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class CardIndex:
+    """Lookup tables over one version of the card list."""
+
+    def __init__(self, cards, popularity=None):
+        """Build all indexes."""
+        self.cards = cards
+        self.by_name = {}
+        self.by_dbf_id = {}
+        self.by_normalized = {}
+        for card in cards:
+            self.by_name.setdefault(card["name"].lower(), card)
+            self.by_normalized.setdefault(normalize_name(card["name"]), card)
+            if "dbfId" in card:
+                self.by_dbf_id[card["dbfId"]] = card
+        self.spellcorrection = SpellCorrection(
+            self.by_name,
+            popularity=popularity,
+            cache_path=SPELLCORRECTION_CACHE_PATH if cards else None,
+        )
+        self.replies = {}  # id(card) -> formatted reply
+        self.minions = None  # ObjectStore, created when first needed
+
+        # Search indexes, all over search keys
+        self.by_key = {}
+        self.tokens = {}  # token -> keys containing it
+        self.trigrams = {}  # trigram -> keys containing it
+        for card in cards:
+            key = search_key(card["name"])
+            if key in self.by_key:
+                continue
+            self.by_key[key] = card
+            for token in key.split():
+                self.tokens.setdefault(token, set()).add(key)
+            for trigram in trigrams(key):
+                self.trigrams.setdefault(trigram, set()).add(key)
+        self.keys = sorted(self.by_key)
+        self.sorted_tokens = sorted(self.tokens)
+        self.trigram_counts = {key: len(trigrams(key)) for key in self.by_key}
+
+    def prefix_matches(self, prefix, sorted_list):
+        """Return all entries of a sorted list that start with prefix."""
+        matches = []
+        for i in range(bisect_left(sorted_list, prefix), len(sorted_list)):
+            if not sorted_list[i].startswith(prefix):
+                break
+            matches.append(sorted_list[i])
+        return matches
+
+    def search(self, query, limit=5):
+        """Return up to limit (score, card) tuples for a partial or misspelled name.
+
+        Scores are between 0 and 1. Whole names score 1, then names starting with the
+        query, then names containing words starting with every word of the query,
+        then names with similar trigrams.
+        """
+        query = search_key(query)
+        if len(query) < MIN_SEARCH_LENGTH:
+            return []
+        if query in self.by_key:
+            return [(1.0, self.by_key[query])]
+
+        scores = {}
+        # Prefix of the whole name, shorter names are more likely meant.
+        for key in self.prefix_matches(query, self.keys):
+            scores[key] = 0.8 + 0.15 * len(query) / len(key)
+
+        # Every word of the query is the start of a word of the name.
+        matching = None
+        for token in query.split():
+            keys = set()
+            for name_token in self.prefix_matches(token, self.sorted_tokens):
+                keys |= self.tokens[name_token]
+            matching = keys if matching is None else matching & keys
+        for key in matching or ():
+            score = 0.6 + 0.2 * len(query) / len(key)
+            scores[key] = max(scores.get(key, 0), score)
+
+        # Trigram similarity (jaccard), catches typos and missing words.
+        query_trigrams = trigrams(query)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self.trigrams.get(trigram, ()))
+        for key, count in shared.items():
+            similarity = count / (
+                len(query_trigrams) + self.trigram_counts[key] - count
+            )
+            score = 0.75 * similarity
+            if score > scores.get(key, 0):
+                scores[key] = score
+
+        best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(score, self.by_key[key]) for key, score in best]
+
+
 class Hearthstone:
     """Hearthstone information."""
 
     def __init__(self, cache: WebCache):
         self.cache = cache
+        self.index = None
 
     def get_cards(self):
         """
-        Returns dict of hearthstone cards.
+        Returns list of hearthstone cards.
+        """
+        return self.get_index().cards
+
+    def get_index(self):
+        """Return the indexes of the current card list, rebuilt when the cache refreshed it."""
+        cards = self.cache.get(HEARTHSTONE_CARD_API, fallback=[])
+        index = self.index
+        if index is None or cards is not index.cards:
+            popularity = index.spellcorrection.popularity if index else None
+            # Swap in a complete index at once, other threads may be reading the old one.
+            index = CardIndex(cards, popularity)
+            self.index = index
+        return index
+
+    def get_minions(self):
+        """Return an ObjectStore of all minions, kept until the card list changes."""
+        index = self.get_index()
+        if index.minions is None:
+            minions = [card for card in index.cards if card["type"] == "MINION"]
+            index.minions = ObjectStore.from_objects(minions, MINION_ATTRIBUTES)
+        return index.minions
+
+    def get_card(self, name):
+        """Return the card with the given name (case insensitive), or None."""
+        return self.get_index().by_name.get(name.lower())
+
+    def get_card_by_dbf_id(self, dbf_id):
+        """Return the card with the given dbfId, or None."""
+        return self.get_index().by_dbf_id.get(dbf_id)
+
+    def find_card(self, name):
+        """Return the card meant by name, or None.
+
+        Tries the exact name, the name without punctuation, spell correction and
+        finally a search for partial names.
         """
-        return self.cache.get(HEARTHSTONE_CARD_API, fallback=[])
+        index = self.get_index()
+        card = index.by_name.get(name.lower()) or index.by_normalized.get(
+            normalize_name(name)
+        )
+        if card is None:
+            correction = index.spellcorrection.spell(name)
+            if correction:
+                card = index.by_name[correction]
+        if card is None:
+            results = index.search(name, limit=1)
+            if results and results[0][0] >= RESOLVE_SCORE:
+                card = results[0][1]
+        if card is not None:
+            # Cards asked for more often win ties between corrections.
+            index.spellcorrection.popularity[card["name"].lower()] += 1
+        return card
+
+    def search(self, query, limit=5):
+        """Return up to limit (score, card) tuples for a partial or misspelled name."""
+        return self.get_index().search(query, limit)
+
+    def is_name_of(self, guess, card):
+        """Return whether a guess is the name of card, allowing small typos."""
+        guess = search_key(guess)
+        key = search_key(card["name"])
+        if guess == key:
+            return True
+        if len(guess) < MIN_SEARCH_LENGTH or abs(len(guess) - len(key)) > 3:
+            return False
+        guess_trigrams = trigrams(guess)
+        card_trigrams = trigrams(key)
+        shared = len(guess_trigrams & card_trigrams)
+        similarity = shared / (len(guess_trigrams) + len(card_trigrams) - shared)
+        if similarity < ANSWER_SIMILARITY:
+            return False
+        # Don't accept the guess if it is even closer to another card.
+        results = self.get_index().search(guess, limit=1)
+        return bool(results) and search_key(results[0][1]["name"]) == key
+
+    def card_info(self, card):
+        """Return a one line description of a card."""
+        index = self.get_index()
+        reply = index.replies.get(id(card))
+        if reply is None:
+            reply = format_card(card)
+            index.replies[id(card)] = reply
+        return reply
+
+
+def format_card(card):
+    """Format a card as e.g. 'Murloc Raider, Minion - 1 Mana, 2/1'."""
+    # Remove formatting and weird [x] I don't know the meaning of
+    if "text" in card:
+        text = re.sub(r"<.*?>|\[x\]|\$", "", card["text"])
+        text = " - " + re.sub(r"\n", " ", text)
+    else:
+        text = ""
+
+    if card["type"] == "MINION":
+        return "{}, Minion - {} Mana, {}/{}{}".format(
+            card["name"], card["cost"], card["attack"], card["health"], text
+        )
+    elif card["type"] == "SPELL":
+        return "{}, Spell - {} Mana{}".format(card["name"], card["cost"], text)
+    elif card["type"] == "HERO":
+        return "{}, Hero - {} Mana, {} Armor{}".format(
+            card["name"], card["cost"], card["armor"], text
+        )
+    elif card["type"] == "WEAPON":
+        return "{}, Weapon - {} Mana, {}/{}{}".format(
+            card["name"], card["cost"], card["attack"], card["durability"], text
+        )
+    else:
+        return "{}{}".format(card["name"], text)
@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+import threading
+
+from bot import filewatcher
+from bot.paths import REPLIES_FILE, REPLIES_JOURNAL_FILE
+
+ARGS = "<ARGS>"  # replies containing this take the rest of the message as argument
+COMPACT_AFTER = 100  # journal entries before they are merged into the replies file
+_REPLY = ""  # key of the reply in a trie node, tokens are never empty
+
+
+class ReplyIndex:
+    """Lookup tables over one version of the reply list."""
+
+    def __init__(self, replies):
+        """Build the indexes."""
+        self.replies = {}  # command -> reply
+        self.trie = {}  # token -> node, for commands with arguments
+        for command, reply in replies.items():
+            self.add(command, reply)
+
+    def add(self, command, reply):
+        """Add or replace a command."""
+        reply = str(reply)
+        self.remove(command)  # The old reply may be in the trie
+        self.replies[command] = reply
+        if ARGS in reply:
+            node = self.trie
+            for token in command.split():
+                node = node.setdefault(token, {})
+            node[_REPLY] = reply
+
+    def remove(self, command):
+        """Remove a command, return whether it existed."""
+        reply = self.replies.pop(command, None)
+        if reply is None:
+            return False
+        if ARGS in reply:
+            self._remove_from_trie(self.trie, command.split())
+        return True
+
+    def _remove_from_trie(self, node, tokens):
+        if not tokens:
+            node.pop(_REPLY, None)
+        elif tokens[0] in node:
+            self._remove_from_trie(node[tokens[0]], tokens[1:])
+            if not node[tokens[0]]:
+                del node[tokens[0]]
+
+    def get_reply(self, msg):
+        """Return the reply to a message, or None.
+
+        Whole messages are looked up first, then the longest command with arguments
+        the message starts with.
+        """
+        cmd = msg.lower().strip()
+        reply = self.replies.get(cmd)
+        if reply is not None:
+            return reply.replace(ARGS, "").strip()
+
+        words = msg.split()
+        node = self.trie
+        found = None
+        for i, word in enumerate(words):
+            node = node.get(word.lower())
+            if node is None:
+                break
+            if _REPLY in node:
+                found = (node[_REPLY], i + 1)
+        if found is None:
+            return None
+        reply, used = found
+        return reply.replace(ARGS, " ".join(words[used:]))
+
+
+class ReplySource:
+    """Simple replies of a channel, shared by all commands using them.
+
+    Changes are appended to a journal instead of rewriting the whole replies file.
+    The journal is merged into the file once it gets long, when the file is read by
+    someone else (e.g. the web API) and on reload.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.path = REPLIES_FILE.format(root)
+        self.journal_path = REPLIES_JOURNAL_FILE.format(root)
+        self.journal_length = 0
+        self.lock = threading.Lock()
+        self.index = ReplyIndex({})
+        self.reload()
+
+    def reload(self):
+        """Read the replies file and journal and swap in a new index."""
+        with self.lock:
+            replies = self._read_file()
+            changes = self._read_journal()
+            for change in changes:
+                if change["op"] == "add":
+                    replies[change["cmd"]] = change["reply"]
+                else:
+                    replies.pop(change["cmd"], None)
+            # Swap in a complete index at once, other threads may be reading the old one.
+            self.index = ReplyIndex(replies)
+            if changes:
+                self._compact()
+
+    def replace(self, replies):
+        """Replace all replies, e.g. with an edited replies file."""
+        with self.lock:
+            self.index = ReplyIndex(replies)
+            self._compact()
+
+    def get_reply(self, msg):
+        """Return the reply to a message, or None."""
+        return self.index.get_reply(msg)
+
+    def commands(self):
+        """Return all commands."""
+        return list(self.index.replies)
+
+    def __contains__(self, command):
+        return command in self.index.replies
+
+    def add(self, command, reply):
+        """Add or replace a command."""
+        with self.lock:
+            self.index.add(command, reply)
+            self._append({"op": "add", "cmd": command, "reply": str(reply)})
+
+    def remove(self, command):
+        """Remove a command, return whether it existed."""
+        with self.lock:
+            if not self.index.remove(command):
+                return False
+            self._append({"op": "del", "cmd": command})
+            return True
+
+    def flush(self):
+        """Merge the journal into the replies file."""
+        with self.lock:
+            if self.journal_length:
+                self._compact()
+
+    def _read_file(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def _read_journal(self):
+        changes = []
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        changes.append(json.loads(line))
+                    except ValueError:
+                        # Only the last line can be cut off by a crash while writing.
+                        logging.warning("Skipping broken line in " + self.journal_path)
+        except FileNotFoundError:
+            pass
+        return changes
+
+    def _append(self, change):
+        with open(self.journal_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(change, ensure_ascii=False) + "\n")
+        self.journal_length += 1
+        if self.journal_length >= COMPACT_AFTER:
+            self._compact()
+
+    def _compact(self):
+        """Write the current replies to the replies file and empty the journal."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.index.replies, file, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        filewatcher.wrote(self.path)
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+        self.journal_length = 0
@@ -7,10 +7,16 @@ from bot.paths import (
 )
 import requests
 import logging
+from bot.utilities.ttlcache import TTLCache
 from bot.utilities.webcache import WebCache
 from bot.utilities.tools import sanitize_user_name
 from bot.error_classes.error_classes import UserNotFoundError
 
+STREAM_CACHE_DURATION = 30  # seconds stream and channel information is reused
+
+# Shared by all bots and kept on reload, so chat spamming !uptime causes one request.
+stream_cache = TTLCache(STREAM_CACHE_DURATION)
+
 
 class TwitchSource:
     """Data source for everything twitch related, except emotes. Represents one channel."""
@@ -35,16 +41,17 @@ class TwitchSource:
         return user_id
 
     def get_channel(self, channel_id):
-        """Get the channel object from channelID."""
-        return requests.get(
-            CHANNEL_API.format(channel_id), headers=self.twitch_api_headers
-        ).json()
+        """Get the channel object from channelID. Cached for STREAM_CACHE_DURATION."""
+        return self._get_cached(CHANNEL_API.format(channel_id))
 
     def get_stream(self, channel_id):
-        """Get the channel object from channelID."""
-        return requests.get(
-            STREAMS_API.format(channel_id), headers=self.twitch_api_headers
-        ).json()
+        """Get the stream object from channelID. Cached for STREAM_CACHE_DURATION."""
+        return self._get_cached(STREAMS_API.format(channel_id))
+
+    def _get_cached(self, url):
+        return stream_cache.get(
+            url, lambda: requests.get(url, headers=self.twitch_api_headers).json()
+        )
 
     def get_display_name_from_id(self, user_id):
         """Convert user id to display name."""
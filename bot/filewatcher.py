@@ -0,0 +1,139 @@
+"""Reloads a bot when the json files in its configs/ or data/ folder are edited.
+
+The folders are polled, which works the same on every platform and costs a few stat
+calls per second. Files are reloaded once they stopped changing for DEBOUNCE seconds,
+so an editor saving several times or the web API writing a file only causes one reload.
+Files the bot writes itself (see wrote) are not reloaded, it already has their content.
+Changed files are parsed and validated in a worker thread, the bot is reloaded on the
+reactor thread.
+"""
+import json
+import logging
+import os
+import time
+
+from twisted.internet import task, threads
+
+from bot.data_sources.config import ConfigSource
+
+WATCHED_FOLDERS = ["configs", "data"]
+POLL_INTERVAL = 1  # seconds between checking the folders
+DEBOUNCE = 1  # seconds a file has to stay unchanged before it is reloaded
+
+_written = {}  # path -> (mtime, size) of files the bot wrote itself
+
+
+def wrote(path):
+    """Tell the watchers that the bot wrote a file itself, so it isn't reloaded.
+
+    Call it after the file was written, from any thread.
+    """
+    try:
+        _written[os.path.normpath(path)] = _stat(os.stat(path))
+    except FileNotFoundError:
+        pass
+
+
+def _stat(stat):
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class FileWatcher:
+    """Polls the files of a bot and reloads it with the changed ones."""
+
+    def __init__(self, bot, interval=POLL_INTERVAL, debounce=DEBOUNCE):
+        """Remember the current state of the files."""
+        self.bot = bot
+        self.interval = interval
+        self.debounce = debounce
+        self.stats = self._scan()  # path -> (mtime, size)
+        self.pending = {}  # path -> time it was last seen changing
+        self.loading = False
+        self.loop = task.LoopingCall(self.poll)
+
+    def start(self):
+        """Start polling."""
+        if not self.loop.running:
+            self.loop.start(self.interval, now=False)
+
+    def stop(self):
+        """Stop polling."""
+        if self.loop.running:
+            self.loop.stop()
+
+    def poll(self):
+        """Check for changed files and load the ones that settled."""
+        now = time.monotonic()
+        stats = self._scan()
+        for path in stats.keys() | self.stats.keys():
+            if stats.get(path) != self.stats.get(path):
+                self.pending[path] = now
+        self.stats = stats
+
+        if self.loading:
+            # Picked up by a later poll, reloads happen one at a time.
+            return
+        ready = [path for path, t in self.pending.items() if now - t >= self.debounce]
+        if not ready:
+            return
+        for path in ready:
+            del self.pending[path]
+        ready = [
+            path
+            for path in ready
+            if _written.pop(os.path.normpath(path), None) != self.stats.get(path)
+        ]
+        if not ready:
+            return
+
+        self.loading = True
+        d = threads.deferToThread(self.parse, ready)
+        d.addCallback(self.swap)
+        d.addErrback(
+            lambda failure: logging.error(
+                "Reloading files failed: {}".format(failure.getTraceback())
+            )
+        )
+        d.addBoth(self._done)
+
+    def parse(self, paths):
+        """Read and validate changed files, return {path template: content}.
+
+        Runs in a worker thread. Deleted and invalid files are skipped, so the bot
+        keeps their last valid content.
+        """
+        data = {}
+        for path in paths:
+            template = path.replace(self.bot.root, "{}", 1)
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    content = json.load(file)
+                ConfigSource.validate(template, content)
+            except FileNotFoundError:
+                continue
+            except ValueError as e:
+                logging.error("Not reloading {}: {}".format(path, e))
+                continue
+            data[template] = content
+        return data
+
+    def swap(self, data):
+        """Reload the bot with parsed files, on the reactor thread."""
+        if data:
+            self.bot.reload(list(data), data)
+
+    def _done(self, _):
+        self.loading = False
+
+    def _scan(self):
+        stats = {}
+        for folder in WATCHED_FOLDERS:
+            try:
+                entries = os.scandir(self.bot.root + folder)
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        stats[entry.path] = _stat(entry.stat())
+        return stats
@@ -0,0 +1,185 @@
+"""Instrumentation of commands and channels.
+
+Metrics are only recorded for bots which have them enabled, either with "metrics": true
+in bot_config.json or with "!metrics on" in chat. Otherwise bot.metrics is None and
+process_command skips all of this.
+"""
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+
+# Upper bounds of the histogram buckets, in seconds
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+RATE_WINDOW = 60  # Seconds over which the message rate is calculated
+
+
+class Histogram:
+    """Counts observations in buckets, like a Prometheus histogram."""
+
+    def __init__(self):
+        """Initialize empty buckets."""
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Add an observation."""
+        self.buckets[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def mean(self):
+        """Return the mean of all observations."""
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """Return the upper bound of the bucket containing the p-th percentile."""
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return BUCKETS[i] if i < len(BUCKETS) else float("inf")
+        return 0.0
+
+
+class CommandMetrics:
+    """Metrics of one command."""
+
+    def __init__(self):
+        """Initialize counters."""
+        self.matches = 0  # times match was called
+        self.hits = 0  # times match returned something truthy
+        self.runs = 0
+        self.errors = 0
+        self.match_time = Histogram()
+        self.run_time = Histogram()
+
+
+class BotMetrics:
+    """Metrics of one bot, i.e. one channel."""
+
+    def __init__(self, channel):
+        """Initialize counters."""
+        self.channel = channel
+        self.started = time.time()
+        self.messages = 0
+        self.commands = defaultdict(CommandMetrics)
+        self.recent = deque()  # [second, messages in that second]
+
+    def message(self):
+        """Count an incoming chat message."""
+        self.messages += 1
+        now = int(time.time())
+        if self.recent and self.recent[-1][0] == now:
+            self.recent[-1][1] += 1
+        else:
+            self.recent.append([now, 1])
+            while self.recent[0][0] <= now - RATE_WINDOW:
+                self.recent.popleft()
+
+    def message_rate(self):
+        """Return the messages per minute over the last RATE_WINDOW seconds."""
+        limit = int(time.time()) - RATE_WINDOW
+        count = sum(n for second, n in self.recent if second > limit)
+        return count * 60 / RATE_WINDOW
+
+    def match(self, cmd, bot, user, msg, tag_info):
+        """Call cmd.match and record it."""
+        metrics = self.commands[cmd.__class__.__name__]
+        start = time.perf_counter()
+        try:
+            match = cmd.match(bot, user, msg, tag_info)
+        except Exception:
+            metrics.errors += 1
+            raise
+        finally:
+            metrics.match_time.observe(time.perf_counter() - start)
+            metrics.matches += 1
+        if match:
+            metrics.hits += 1
+        return match
+
+    def run(self, cmd, bot, user, msg, tag_info):
+        """Call cmd.run and record it."""
+        metrics = self.commands[cmd.__class__.__name__]
+        start = time.perf_counter()
+        try:
+            return cmd.run(bot, user, msg, tag_info)
+        except Exception:
+            metrics.errors += 1
+            raise
+        finally:
+            metrics.run_time.observe(time.perf_counter() - start)
+            metrics.runs += 1
+
+    def slowest(self, n):
+        """Return the names of the n commands with the most total run time."""
+        return sorted(
+            self.commands,
+            key=lambda name: -(
+                self.commands[name].run_time.sum + self.commands[name].match_time.sum
+            ),
+        )[:n]
+
+
+def _labels(**labels):
+    return ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in labels.items()
+    )
+
+
+def _histogram_lines(name, histogram, labels):
+    lines = []
+    cumulative = 0
+    for bound, n in zip(BUCKETS + ("+Inf",), histogram.buckets):
+        cumulative += n
+        lines.append(
+            "{}_bucket{{{},le=\"{}\"}} {}".format(name, labels, bound, cumulative)
+        )
+    lines.append("{}_sum{{{}}} {}".format(name, labels, histogram.sum))
+    lines.append("{}_count{{{}}} {}".format(name, labels, histogram.count))
+    return lines
+
+
+def prometheus_text(bots):
+    """Return the metrics of all bots with enabled metrics in Prometheus text format."""
+    enabled = [bot for bot in bots if bot.metrics is not None]
+    counters = [
+        ("matches", "Times the match method of a command was called."),
+        ("hits", "Times the match method of a command returned true."),
+        ("runs", "Times the run method of a command was called."),
+        ("errors", "Exceptions raised by the match or run method of a command."),
+    ]
+    out = [
+        "# HELP monkalot_messages_total Chat messages processed.",
+        "# TYPE monkalot_messages_total counter",
+    ]
+    for bot in enabled:
+        out.append(
+            "monkalot_messages_total{{{}}} {}".format(
+                _labels(channel=bot.metrics.channel), bot.metrics.messages
+            )
+        )
+
+    for counter, description in counters:
+        name = "monkalot_command_{}_total".format(counter)
+        out.append("# HELP {} {}".format(name, description))
+        out.append("# TYPE {} counter".format(name))
+        for bot in enabled:
+            for command, metrics in sorted(bot.metrics.commands.items()):
+                labels = _labels(channel=bot.metrics.channel, command=command)
+                out.append("{}{{{}}} {}".format(name, labels, getattr(metrics, counter)))
+
+    for kind in ["match", "run"]:
+        name = "monkalot_command_{}_seconds".format(kind)
+        out.append("# HELP {} Time spent in the {} method of a command.".format(name, kind))
+        out.append("# TYPE {} histogram".format(name))
+        for bot in enabled:
+            for command, metrics in sorted(bot.metrics.commands.items()):
+                labels = _labels(channel=bot.metrics.channel, command=command)
+                histogram = getattr(metrics, kind + "_time")
+                out.extend(_histogram_lines(name, histogram, labels))
+
+    return "\n".join(out) + "\n"
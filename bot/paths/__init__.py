@@ -1,5 +1,7 @@
 """Contains global paths."""
 # pylama:ignore=E221 (whitespace error)
+import json
+import os
 
 # Relative to channel instance
 DATABASE_PATH = "{}data/monkalot.db"
@@ -8,6 +10,7 @@ NOTIFICATIONS_FILE = "{}data/notifications.json"
 PRONOUNS_PATH = "{}data/pronouns.json"
 QUOTES_FILE = "{}data/quotes.json"
 REPLIES_FILE = "{}data/sreply_cmds.json"
+REPLIES_JOURNAL_FILE = "{}data/sreply_cmds.journal"
 SLAPHUG_FILE = "{}data/slaphug.json"
 SMORC_FILE = "{}data/smorc.json"
 TRUSTED_MODS_PATH = "{}data/trusted_mods.json"
@@ -21,18 +24,45 @@ CUSTOM_RESPONSES_PATH = "{}configs/responses.json"
 COMMON_API_JSON_DATA_PATH = "data/common_api_json_data/{}"
 JSON_FILE_INDEX_PATH = "data/common_api_json_data/json_index.json"
 TEMPLATE_RESPONSES_PATH = "channels/template/configs/responses.json"
+PROFILE_PATH = "logs/profile-{}.collapsed"
+SPELLCORRECTION_CACHE_PATH = "data/spellcorrection/{}.json"
+CHATTERBOT_DATABASE_PATH = "data/chatterbot/{}.sqlite3"
+DRIVERS_PATH = "data/Drivers.xlsx"
+RACETRACKS_PATH = "data/Racetracks.xlsx"
+GAME_DATA_CACHE_PATH = "data/game_data/{}.json"
 
 # File names
 CHANNEL_BTTV_EMOTE_JSON_FILE = "channel_bttv.json"
 
 
+# Endpoints
+# Every server the bot talks to can be overridden in ENDPOINTS_PATH, e.g. to run against
+# a local fake Twitch (see benchmarks/fake_twitch.py). Possible keys: irc_host, irc_port,
+# tmi, twitch_api, oidc, bttv, ffz, hearthstone and emoji.
+ENDPOINTS_PATH = os.environ.get("MONKALOT_ENDPOINTS", "config/endpoints.json")
+
+
+def _read_endpoints(path):
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+_ENDPOINTS = _read_endpoints(ENDPOINTS_PATH)
+
+TWITCH_IRC_HOST = _ENDPOINTS.get("irc_host", "irc.chat.twitch.tv")
+TWITCH_IRC_PORT = int(_ENDPOINTS.get("irc_port", 6667))
+
+
 # APIs
-TWITCH_TMI = "http://tmi.twitch.tv/"
+TWITCH_TMI = _ENDPOINTS.get("tmi", "http://tmi.twitch.tv/")
 USERLIST_API = TWITCH_TMI + "group/user/{}/chatters"
 
 
-TWITCH_API = "https://api.twitch.tv/"
-OIDC_API = "https://id.twitch.tv/oauth2/keys"
+TWITCH_API = _ENDPOINTS.get("twitch_api", "https://api.twitch.tv/")
+OIDC_API = _ENDPOINTS.get("oidc", "https://id.twitch.tv/oauth2/keys")
 
 TWITCH_HELIX_API = TWITCH_API + "helix/"
 CHANNEL_API = TWITCH_HELIX_API + "channels/{}"
@@ -43,14 +73,17 @@ USER_NAME_API = TWITCH_HELIX_API + "users?login={}"
 TWITCH_EMOTE_API = TWITCH_HELIX_API + "chat/emotes/global"
 
 
-BTTV_API = "https://api.betterttv.net/2/"
+BTTV_API = _ENDPOINTS.get("bttv", "https://api.betterttv.net/2/")
 GLOBAL_BTTVEMOTES_API = BTTV_API + "emotes"
 CHANNEL_BTTVEMOTES_API = BTTV_API + "channels/{}"
 
 
-HEARTHSTONE_CARD_API = (
-    "http://api.hearthstonejson.com/v1/latest/enUS/cards.collectible.json"
+HEARTHSTONE_CARD_API = _ENDPOINTS.get(
+    "hearthstone",
+    "http://api.hearthstonejson.com/v1/latest/enUS/cards.collectible.json",
+)
+EMOJI_API = _ENDPOINTS.get(
+    "emoji", "https://raw.githubusercontent.com/github/gemoji/master/db/emoji.json"
 )
-EMOJI_API = "https://raw.githubusercontent.com/github/gemoji/master/db/emoji.json"
 
-FFZ_API = "https://api.frankerfacez.com/v1/room/{}"
+FFZ_API = _ENDPOINTS.get("ffz", "https://api.frankerfacez.com/v1/") + "room/{}"
@@ -0,0 +1,144 @@
+"""Sampling profiler which can be started and stopped while the bot is running.
+
+A background thread periodically takes the stack of every other thread and counts
+identical stacks. Samples taken while a bot processes a message are attributed to
+the channel and the command being processed. The result is written in the collapsed
+stack format, which can be turned into a flamegraph with e.g. flamegraph.pl or
+speedscope.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from bot.paths import PROFILE_PATH
+
+DEFAULT_DURATION = 30  # seconds
+MAX_DURATION = 600
+DEFAULT_INTERVAL = 0.005  # seconds between two samples
+
+# Functions whose locals tell which bot and command a sample belongs to.
+# They need a local 'bot' or 'self' (the TwitchBot) and 'cmd' (the command).
+ATTRIBUTION_FUNCTIONS = {"process_command", "run_command"}
+
+
+class SamplingProfiler:
+    """Samples the stacks of all threads for a bounded time."""
+
+    def __init__(self):
+        """Initialize variables."""
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stopping = threading.Event()
+        self.path = None
+        self.labels = {}  # code object -> frame label
+
+    @property
+    def running(self):
+        """Return whether the profiler is currently sampling."""
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, duration=DEFAULT_DURATION, interval=DEFAULT_INTERVAL, callback=None):
+        """Start sampling for at most duration seconds.
+
+        Returns the path the result will be written to, or None if already running.
+        callback(path, samples) is called from the profiler thread when done.
+        """
+        with self.lock:
+            if self.running:
+                return None
+            duration = min(max(duration, 1), MAX_DURATION)
+            self.path = PROFILE_PATH.format(time.strftime("%Y%m%d-%H%M%S"))
+            self.stopping.clear()
+            self.thread = threading.Thread(
+                target=self._sample,
+                args=(time.monotonic() + duration, interval, self.path, callback),
+                name="profiler",
+                daemon=True,
+            )
+            self.thread.start()
+            logging.warning("Profiling for {}s into {}".format(duration, self.path))
+            return self.path
+
+    def stop(self):
+        """Stop sampling and wait until the result is written.
+
+        Returns the path of the result, or None if the profiler was not running.
+        """
+        with self.lock:
+            if not self.running:
+                return None
+            self.stopping.set()
+            self.thread.join()
+            return self.path
+
+    def _sample(self, end, interval, path, callback):
+        """Sample until stopped or the time is up, then write the result."""
+        own = threading.get_ident()
+        stacks = Counter()
+        samples = 0
+        names = {}
+        while not self.stopping.wait(interval) and time.monotonic() < end:
+            frames = sys._current_frames()
+            if frames.keys() - names.keys():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident != own:
+                    stacks[self._collapse(names.get(ident, str(ident)), frame)] += 1
+            samples += 1
+        frames = frame = None  # don't keep the sampled frames alive
+
+        self._write(path, stacks)
+        logging.warning("Profiler took {} samples, written to {}".format(samples, path))
+        if callback is not None:
+            callback(path, samples)
+
+    def _collapse(self, thread_name, frame):
+        """Return the stack of a frame as 'thread;channel;command;outer;...;inner'."""
+        stack = []
+        context = []
+        while frame is not None:
+            code = frame.f_code
+            if code.co_name in ATTRIBUTION_FUNCTIONS and not context:
+                context = _attribution(frame)
+            stack.append(self._label(code))
+            frame = frame.f_back
+        stack.reverse()
+        return ";".join([thread_name] + context + stack)
+
+    def _label(self, code):
+        """Return 'function (file:line)' for a code object."""
+        label = self.labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            if filename.startswith(os.getcwd()):
+                filename = os.path.relpath(filename)
+            label = "{} ({}:{})".format(code.co_name, filename, code.co_firstlineno)
+            label = label.replace(";", ":")
+            self.labels[code] = label
+        return label
+
+    @staticmethod
+    def _write(path, stacks):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in stacks.most_common():
+                file.write("{} {}\n".format(stack, count))
+
+
+def _attribution(frame):
+    """Return [channel, command] of the bot and command a frame is working on."""
+    try:
+        local_vars = frame.f_locals
+        bot = local_vars.get("bot", local_vars.get("self"))
+        channel = bot.config.channel
+    except AttributeError:
+        return []
+    cmd = local_vars.get("cmd")
+    command = cmd.__class__.__name__ if cmd is not None else "-"
+    return [channel, command]
+
+
+profiler = SamplingProfiler()
@@ -2,6 +2,7 @@
 import json
 import math
 import sqlite3
+from contextlib import contextmanager
 
 from bot.paths import CONFIG_PATH, DATABASE_PATH
 from bot.utilities.tools import replace_vars
@@ -71,29 +72,90 @@ class Ranking:
 
         Check if the user reached legend in the process.
         """
-        username = username.lower()
-        viewer_id = self._get_user_id(username)
+        viewer_id = self._get_user_id(username.lower())
+        with self.transaction() as connection:
+            points = self._add_points(connection, viewer_id, amount)
+        self._check_legend(username, points - amount, points, bot)
 
-        points = int(self.get_points(username, new_entry=True))
+    def charge(self, username, amount):
+        """Take amount points from a user, if the user has that many.
 
-        rank = self.get_hs_rank(points)
-        legend = "Legend" in rank
+        Returns whether the points were taken.
+        """
+        viewer_id = self._get_user_id(username.lower())
+        with self.transaction() as connection:
+            return self._take_points(connection, viewer_id, amount)
 
-        points += amount
+    def transfer(self, from_user, to_user, amount, bot):
+        """Move amount points from one user to another, if the first one has that many.
 
-        sql_command = "UPDATE points SET amount = ? WHERE viewer_id = ?;"
-        self.execute_command(sql_command, [points, viewer_id])
+        Both changes happen in one transaction, so points can't be spent twice.
+        Returns whether the points were moved.
+        """
+        from_id = self._get_user_id(from_user.lower())
+        to_id = self._get_user_id(to_user.lower())
+        with self.transaction() as connection:
+            if not self._take_points(connection, from_id, amount):
+                return False
+            points = self._add_points(connection, to_id, amount)
+        self._check_legend(to_user, points - amount, points, bot)
+        return True
+
+    @contextmanager
+    def transaction(self):
+        """Return a connection in a transaction, which is committed after the block.
+
+        The database is locked for writing at the start, so balances read in the
+        transaction can't change until it ends.
+        """
+        connection = sqlite3.connect(
+            DATABASE_PATH.format(self.bot.root), isolation_level=None
+        )
+        try:
+            connection.execute("BEGIN IMMEDIATE;")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK;")
+                raise
+            connection.execute("COMMIT;")
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _add_points(connection, viewer_id, amount):
+        """Add points to a user, creating the user if necessary. Returns the new points."""
+        connection.execute(
+            "INSERT OR IGNORE INTO points (viewer_id, amount) VALUES (?, 0);",
+            (viewer_id,),
+        )
+        connection.execute(
+            "UPDATE points SET amount = amount + ? WHERE viewer_id = ?;",
+            (amount, viewer_id),
+        )
+        return connection.execute(
+            "SELECT amount FROM points WHERE viewer_id = ?;", (viewer_id,)
+        ).fetchone()[0]
+
+    @staticmethod
+    def _take_points(connection, viewer_id, amount):
+        """Take points from a user if the user has enough, return whether they were taken."""
+        cursor = connection.execute(
+            "UPDATE points SET amount = amount - ? WHERE viewer_id = ? AND amount >= ?;",
+            (amount, viewer_id, amount),
+        )
+        return cursor.rowcount == 1
 
+    def _check_legend(self, username, old_points, points, bot):
         """Check for legend rank if user was not legend before."""
-        if not legend:
-            rank = self.get_hs_rank(points)
-            if "Legend" in rank:
-                var = {"<USER>": bot.twitch.display_name(username), "<RANK>": rank}
-                bot.write(
-                    replace_vars(
-                        bot.config.responses["ranking"]["msg_legend"]["msg"], var
-                    )
-                )
+        if "Legend" in self.get_hs_rank(old_points):
+            return
+        rank = self.get_hs_rank(points)
+        if "Legend" in rank:
+            var = {"<USER>": bot.twitch.display_name(username), "<RANK>": rank}
+            bot.write(
+                replace_vars(bot.config.responses["ranking"]["msg_legend"]["msg"], var)
+            )
 
     def get_rank(self, points):
         """Get the absolute for a certain amount of points."""
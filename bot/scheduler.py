@@ -0,0 +1,137 @@
+"""Schedules the timed jobs of all bots, e.g. game clues and notifications.
+
+Jobs are kept in a hierarchical timer wheel: LEVELS wheels of SLOTS slots each, the
+first one with one slot per tick, every next one with slots SLOTS times as long. A job
+is put in the slot of its due tick in the lowest wheel that reaches it, and moved to
+lower wheels as its time comes closer. Scheduling and cancelling are O(1) and one
+reactor call per tick serves all jobs of all channels.
+"""
+import logging
+import math
+import random
+import time
+import traceback
+
+from twisted.internet import task
+
+TICK = 0.5  # seconds
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+LEVELS = 4  # reaches SLOTS ** LEVELS ticks, about 97 days
+
+
+class Job:
+    """A callback to be called at a certain tick."""
+
+    __slots__ = ("channel", "name", "due", "callback", "args", "slot")
+
+    def __init__(self, channel, name, due, callback, args):
+        self.channel = channel
+        self.name = name
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.slot = None  # dict of the slot the job is in
+
+
+class Scheduler:
+    """Runs named jobs of channels after a delay.
+
+    A channel only has one job of a name, scheduling it again replaces the old one.
+    """
+
+    def __init__(self, tick=TICK):
+        """Initialize empty wheels."""
+        self.tick = tick
+        self.wheels = [[{} for _ in range(SLOTS)] for _ in range(LEVELS)]
+        self.jobs = {}  # (channel, name) -> Job
+        self.current = 0  # current tick
+        self.start = 0  # time of tick 0
+        self.loop = task.LoopingCall(self._advance)
+
+    def schedule(self, channel, name, delay, callback, *args, jitter=0):
+        """Call callback(*args) in delay seconds.
+
+        jitter: up to this many seconds are added at random, so jobs started at the
+        same time in many channels don't all run at once.
+        """
+        self.cancel(channel, name)
+        if jitter:
+            delay += random.uniform(0, jitter)
+        ticks = min(max(1, math.ceil(delay / self.tick)), SLOTS ** LEVELS - 1)
+
+        if not self.loop.running:
+            # Ticks continue from where the wheel stopped last time.
+            self.start = time.monotonic() - self.current * self.tick
+            self.loop.start(self.tick, now=False)
+
+        job = Job(channel, name, self.current + ticks, callback, args)
+        self.jobs[(channel, name)] = job
+        self._insert(job)
+        return job
+
+    def cancel(self, channel, name):
+        """Cancel a job, return whether it was scheduled."""
+        job = self.jobs.pop((channel, name), None)
+        if job is None:
+            return False
+        del job.slot[(channel, name)]
+        return True
+
+    def cancel_channel(self, channel):
+        """Cancel all jobs of a channel."""
+        for job_channel, name in list(self.jobs):
+            if job_channel == channel:
+                self.cancel(job_channel, name)
+
+    def is_scheduled(self, channel, name):
+        """Return whether a job is scheduled."""
+        return (channel, name) in self.jobs
+
+    def pending(self, channel=None):
+        """Return (channel, name, seconds until it runs) of all jobs, soonest first."""
+        now = time.monotonic()
+        jobs = [
+            (job.channel, job.name, max(0.0, self.start + job.due * self.tick - now))
+            for job in self.jobs.values()
+            if channel is None or job.channel == channel
+        ]
+        return sorted(jobs, key=lambda job: job[2])
+
+    def _insert(self, job):
+        # The highest digit in which due and current tick differ decides the wheel.
+        level = max(0, ((job.due ^ self.current).bit_length() - 1) // SLOT_BITS)
+        level = min(level, LEVELS - 1)
+        job.slot = self.wheels[level][(job.due >> (SLOT_BITS * level)) & (SLOTS - 1)]
+        job.slot[(job.channel, job.name)] = job
+
+    def _advance(self):
+        """Run all jobs up to the current time, catching up on missed ticks."""
+        target = int((time.monotonic() - self.start) / self.tick)
+        while self.current < target:
+            self.current += 1
+
+            # Move jobs down from higher wheels once their slot is reached.
+            for level in range(LEVELS - 1, 0, -1):
+                if self.current % (SLOTS ** level) == 0:
+                    index = (self.current >> (SLOT_BITS * level)) & (SLOTS - 1)
+                    jobs = list(self.wheels[level][index].values())
+                    self.wheels[level][index].clear()
+                    for job in jobs:
+                        self._insert(job)
+
+            slot = self.wheels[0][self.current & (SLOTS - 1)]
+            due = list(slot.values())
+            slot.clear()
+            for job in due:
+                del self.jobs[(job.channel, job.name)]
+                try:
+                    job.callback(*job.args)
+                except Exception:  # A failing job must not stop the others.
+                    logging.error(traceback.format_exc())
+
+        if not self.jobs and self.loop.running:
+            self.loop.stop()
+
+
+scheduler = Scheduler()
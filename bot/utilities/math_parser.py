@@ -1,84 +1,196 @@
-"""Module for parsing and doing math."""
+"""Module for parsing and doing math.
 
-from __future__ import division
-import pyparsing as pyp
+Expressions are split into tokens and parsed by a Pratt parser (top down operator
+precedence) into a small tree of tuples, in one pass without backtracking. Trees are
+cached by expression, so repeated expressions are only evaluated.
+
+    expr    :: term [ ('+' | '-') term ]*
+    term    :: factor [ ('*' | '/') factor ]*
+    factor  :: atom [ '^' factor ]          (right associative: 2^3^2 = 2^9)
+    atom    :: ['+' | '-'] ( number | pi | e | fn '(' expr ')' | '(' expr ')' )
+
+A sign belongs to the atom, so -2^2 = (-2)^2 = 4.
+"""
 import math
 import operator
+import re
+from functools import lru_cache
 
+# Limits, so an expression can't keep a worker busy (and the reactor, since big
+# integer arithmetic holds the GIL).
+MAX_LENGTH = 200  # characters of an expression
+MAX_OPERATIONS = 500  # numbers, operators and functions in an expression
+MAX_INT_BITS = 1024  # integers up to about the largest float
+MAX_FACTORIAL = 170  # largest n with n! < largest float
+CACHE_SIZE = 1024  # parsed expressions kept
+
+TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<number>(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?)"
+    r"|(?P<name>[a-z_][a-z0-9_$]*)"
+    r"|(?P<symbol>[-+*/^()])"
+    r")"
+)
+
+# Binding power of binary operators, and whether they are right associative
+BINARY = {"+": (10, False), "-": (10, False), "*": (20, False), "/": (20, False)}
+BINARY["^"] = (30, True)
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+
+class ParseError(ValueError):
+    """The expression is no valid math."""
+
+
+class TooComplexError(ArithmeticError):
+    """The expression is too long or needs too many operations."""
 
-class NumericStringParser(object):
-    """
-    Most of this code comes from the fourFn.py pyparsing example.
 
-    http://pyparsing.wikispaces.com/file/view/fourFn.py
-    http://pyparsing.wikispaces.com/message/view/home/15549426
-    __author__='Paul McGuire'
+def _check_int(value):
+    """Raise OverflowError for integers too big to be shown in chat anyway."""
+    if isinstance(value, int) and value.bit_length() > MAX_INT_BITS:
+        raise OverflowError("integer too large")
+    return value
 
-    All I've done is rewrap Paul McGuire's fourFn.py as a class, so I can use it
-    more easily in other places.
+
+def _pow(base, exponent):
+    """Power which doesn't compute huge integers before noticing they are too big."""
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+        if abs(base) > 1 and (abs(base).bit_length() - 1) * exponent > MAX_INT_BITS:
+            raise OverflowError("integer too large")
+    return _check_int(operator.pow(base, exponent))
+
+
+def _mul(a, b):
+    """Multiplication which checks the size of integer results."""
+    if isinstance(a, int) and isinstance(b, int):
+        if a.bit_length() + b.bit_length() > MAX_INT_BITS + 1:
+            raise OverflowError("integer too large")
+    return operator.mul(a, b)
+
+
+def _factorial(n):
+    """Factorial of numbers up to MAX_FACTORIAL."""
+    if isinstance(n, float) and n.is_integer():  # all parsed numbers are floats
+        n = int(n)
+    if n > MAX_FACTORIAL:
+        raise OverflowError("factorial too large")
+    return math.factorial(n)
+
+
+class Parser:
+    """Parses the tokens of one expression, see the grammar above.
+
+    Trees are tuples: ("num", value), ("neg", tree), (operator, left, right) and
+    ("fn", name, tree).
     """
 
+    def __init__(self, expression, functions):
+        """Split the expression into tokens."""
+        self.tokens = tokenize(expression)
+        self.functions = functions
+        self.position = 0
+
+    def parse(self):
+        """Return the tree of the whole expression."""
+        tree = self.expression(0)
+        if self.position < len(self.tokens):
+            raise ParseError("unexpected " + self.tokens[self.position][1])
+        return tree
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None, None
+
+    def next(self):
+        token = self.peek()
+        if token[0] is None:
+            raise ParseError("unexpected end")
+        self.position += 1
+        return token
+
+    def expect(self, symbol):
+        if self.next() != ("symbol", symbol):
+            raise ParseError("expected " + symbol)
+
+    def expression(self, min_power):
+        """Parse operators binding stronger than min_power."""
+        left = self.atom()
+        while True:
+            kind, value = self.peek()
+            if kind != "symbol" or value not in BINARY:
+                return left
+            power, right_associative = BINARY[value]
+            if power <= min_power:
+                return left
+            self.position += 1
+            right = self.expression(power - 1 if right_associative else power)
+            left = (value, left, right)
+
+    def atom(self):
+        """Parse a number, constant, function call or parentheses with a sign."""
+        kind, value = self.next()
+        if kind == "symbol" and value in "+-":
+            atom = self.atom()
+            return ("neg", atom) if value == "-" else atom
+        if kind == "number":
+            return ("num", float(value))
+        if kind == "name":
+            if value in CONSTANTS:
+                return ("num", CONSTANTS[value])
+            if value not in self.functions:
+                raise ParseError("unknown function " + value)
+            self.expect("(")
+            argument = self.expression(0)
+            self.expect(")")
+            return ("fn", value, argument)
+        if (kind, value) == ("symbol", "("):
+            tree = self.expression(0)
+            self.expect(")")
+            return tree
+        raise ParseError("unexpected " + value)
+
+
+def tokenize(expression):
+    """Return the (kind, text) tokens of an expression."""
+    tokens = []
+    position = 0
+    end = len(expression.rstrip())
+    while position < end:
+        match = TOKEN.match(expression, position)
+        if match is None or match.end() == position:
+            raise ParseError("unexpected " + expression[position:].split()[0])
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+
+def _operations(tree):
+    """Return the number of operations evaluating a tree takes."""
+    kind = tree[0]
+    if kind == "num":
+        return 1
+    if kind == "neg":
+        return 1 + _operations(tree[1])
+    if kind == "fn":
+        return 1 + _operations(tree[2])
+    return 1 + _operations(tree[1]) + _operations(tree[2])
+
+
+class NumericStringParser(object):
+    """Evaluates math expressions, e.g. "log(5^2) + sin(pi/4)"."""
+
     def __init__(self):
-        """
-        Initialize parser.
-
-        expop   :: '^'
-        multop  :: '*' | '/'
-        addop   :: '+' | '-'
-        integer :: ['+' | '-'] '0'..'9'+
-        atom    :: PI | E | real | fn '(' expr ')' | '(' expr ')'
-        factor  :: atom [ expop factor ]*
-        term    :: factor [ multop factor ]*
-        expr    :: term [ addop term ]*
-        """
-        point = pyp.Literal(".")
-        e = pyp.CaselessLiteral("E")
-        fnumber = pyp.Combine(
-            pyp.Word("+-" + pyp.nums, pyp.nums)
-            + pyp.Optional(point + pyp.Optional(pyp.Word(pyp.nums)))
-            + pyp.Optional(e + pyp.Word("+-" + pyp.nums, pyp.nums))
-        )
-        ident = pyp.Word(pyp.alphas, pyp.alphas + pyp.nums + "_$")
-        plus = pyp.Literal("+")
-        minus = pyp.Literal("-")
-        mult = pyp.Literal("*")
-        div = pyp.Literal("/")
-        lpar = pyp.Literal("(").suppress()
-        rpar = pyp.Literal(")").suppress()
-        addop = plus | minus
-        multop = mult | div
-        expop = pyp.Literal("^")
-        pi = pyp.CaselessLiteral("PI")
-        expr = pyp.Forward()
-        atom = (
-            (
-                pyp.Optional(pyp.oneOf("- +"))
-                + (pi | e | fnumber | ident + lpar + expr + rpar).setParseAction(
-                    self.push_first
-                )
-            )
-            | pyp.Optional(pyp.oneOf("- +")) + pyp.Group(lpar + expr + rpar)
-        ).setParseAction(self.push_u_minus)
-        # by defining exponentiation as "atom [ ^ factor ]..." instead of
-        # "atom [ ^ atom ]...", we get right-to-left exponents, instead of left-to-right
-        # that is, 2^3^2 = 2^(3^2), not (2^3)^2.
-        factor = pyp.Forward()
-        factor << atom + pyp.ZeroOrMore(
-            (expop + factor).setParseAction(self.push_first)
-        )
-        term = factor + pyp.ZeroOrMore(
-            (multop + factor).setParseAction(self.push_first)
-        )
-        expr << term + pyp.ZeroOrMore((addop + term).setParseAction(self.push_first))
-        self.bnf = expr
+        """Initialize operators, functions and the cache of parsed expressions."""
         # map operator symbols to corresponding arithmetic operations
         epsilon = 1e-12
         self.opn = {
             "+": operator.add,
             "-": operator.sub,
-            "*": operator.mul,
+            "*": _mul,
             "/": operator.truediv,
-            "^": operator.pow,
+            "^": _pow,
         }
         self.fn = {
             "abs": abs,
@@ -91,41 +203,42 @@ class NumericStringParser(object):
             f = getattr(math, n)
             if callable(f):
                 self.fn[n] = f
+        self.fn["factorial"] = _factorial
+
+        self.parse = lru_cache(maxsize=CACHE_SIZE)(self._parse)
 
-        self.exprStack = []
-
-    def push_first(self, _, __, toks):
-        """Push first token."""
-        self.exprStack.append(toks[0])
-
-    def push_u_minus(self, _, __, toks):
-        """Push a unary minus."""
-        if toks and toks[0] == "-":
-            self.exprStack.append("unary -")
-
-    def evaluate_stack(self, s):
-        """Evaluate content of stack."""
-        op = s.pop()
-        if op == "unary -":
-            return -self.evaluate_stack(s)
-        if op in "+-*/^":
-            op2 = self.evaluate_stack(s)
-            op1 = self.evaluate_stack(s)
-            return self.opn[op](op1, op2)
-        elif op == "PI":
-            return math.pi  # 3.1415926535
-        elif op == "E":
-            return math.e  # 2.718281828
-        elif op in self.fn:
-            return self.fn[op](self.evaluate_stack(s))
-        elif op[0].isalpha():
-            return 0
-        else:
-            return float(op)
-
-    def eval(self, num_string, parse_all=True):
-        """Evaluate value of string."""
-        self.exprStack = []
-        self.bnf.parseString(num_string, parse_all)
-        val = self.evaluate_stack(self.exprStack[:])
-        return val
+    def _parse(self, expression):
+        """Return the tree of a normalized expression."""
+        try:
+            tree = Parser(expression, self.fn).parse()
+            # Checked once per tree, the parser is shared by concurrent runs.
+            if _operations(tree) > MAX_OPERATIONS:
+                raise TooComplexError("too many operations")
+        except RecursionError:  # deeply nested parentheses
+            raise TooComplexError("expression too deep")
+        return tree
+
+    def evaluate(self, tree):
+        """Evaluate a parsed expression."""
+        kind = tree[0]
+        if kind == "num":
+            return tree[1]
+        if kind == "neg":
+            return -self.evaluate(tree[1])
+        if kind == "fn":
+            return _check_int(self.fn[tree[1]](self.evaluate(tree[2])))
+        return self.opn[kind](self.evaluate(tree[1]), self.evaluate(tree[2]))
+
+    def eval(self, num_string):
+        """Evaluate value of string.
+
+        Raises ParseError for invalid expressions, TooComplexError and OverflowError
+        if it exceeds the limits above.
+        """
+        if len(num_string) > MAX_LENGTH:
+            raise TooComplexError("expression too long")
+        tree = self.parse(" ".join(num_string.lower().split()))
+        try:
+            return self.evaluate(tree)
+        except RecursionError:
+            raise TooComplexError("expression too deep")
@@ -0,0 +1,44 @@
+"""Module that stores the objects of guessing games column by column."""
+
+
+def normalize_answer(name):
+    """Return a name as guesses are compared to it."""
+    return str(name).strip().lower()
+
+
+class ObjectStore:
+    """A read only table of objects, e.g. minions or race tracks.
+
+    Each column is one tuple, so a store is cheap to keep around and to share between
+    reloads. Objects are only turned into dicts when they are picked.
+    """
+
+    def __init__(self, columns, names=None):
+        """Store columns {column: values}, all of the same length.
+
+        names: names of the objects, which guesses are compared to. Defaults to the
+        "name" column.
+        """
+        self.columns = {column: tuple(values) for column, values in columns.items()}
+        self.attributes = list(self.columns)
+        self.display_names = tuple(self.columns["name"] if names is None else names)
+        self.names = tuple(normalize_answer(name) for name in self.display_names)
+
+    @classmethod
+    def from_objects(cls, objects, attributes):
+        """Create a store with the given attributes of a list of dicts."""
+        return cls(
+            {
+                attribute: [obj.get(attribute) for obj in objects]
+                for attribute in attributes
+            }
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def get(self, index):
+        """Return the object at index as dict."""
+        obj = {column: values[index] for column, values in self.columns.items()}
+        obj["name"] = self.display_names[index]
+        return obj
@@ -1,86 +1,149 @@
 """Spellcorrection module, for custom word sets.
 
-Forked from https://github.com/phatpiglet/autocorrect and modified so it uses
-a fixed set of words.
+Uses a symmetric delete index (see SymSpell by Wolf Garbe): every word is stored
+under all strings that can be made from it by deleting up to max_distance
+characters. A misspelled word then only has to generate its own deletes to find all
+candidates, instead of every possible typo.
 """
+import hashlib
+import json
+import logging
+import os
+from collections import Counter
 
-from itertools import chain
-
-ALPHABET = "abcdefghijklmnopqrstuvwxyz',"
+MAX_DISTANCE = 2
+# Only the first characters of a word are indexed. Keeps the index small, candidates
+# are still checked against the whole word.
+PREFIX_LENGTH = 7
 
 
 class SpellCorrection(object):
     """Corrects a word based on given set of words."""
 
-    def __init__(self, words):
-        """Initialize word set."""
-        self.words = words
+    def __init__(
+        self,
+        words,
+        max_distance=MAX_DISTANCE,
+        prefix_length=PREFIX_LENGTH,
+        popularity=None,
+        cache_path=None,
+    ):
+        """Build the delete index, or load it from cache_path.
+
+        popularity: mapping word -> weight, ranks candidates with the same distance.
+        cache_path: path template with {} for a hash of the words.
+        """
+        self.words = {w.lower() for w in words}
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.popularity = Counter(popularity or {})
+        self.deletes = self._load_or_build(cache_path)
 
     def spell(self, word):
         """Return lowercase correction of word.
 
         If no such word exists, returns False instead.
         """
-        w = Word(word)
-        candidates = (
-            self.known([word]) or self.known(w.typos()) or self.known(w.double_typos())
-        )
+        candidates = self.candidates(word)
         if candidates:
-            # Take the first candidate
-            correction = candidates.pop()
-        else:
-            correction = False
-        return correction
+            return candidates[0]
+        return False
+
+    def candidates(self, word, max_distance=None):
+        """Return all words within max_distance of word, best first.
+
+        Ranked by edit distance, then popularity.
+        """
+        word = word.lower()
+        if word in self.words:
+            return [word]
+        if max_distance is None:
+            max_distance = self.max_distance
+
+        found = {}
+        for delete in self._edits(word[: self.prefix_length], max_distance):
+            for candidate in self.deletes.get(delete, ()):
+                if candidate in found or abs(len(candidate) - len(word)) > max_distance:
+                    continue
+                distance = edit_distance(word, candidate, max_distance)
+                if distance <= max_distance:
+                    found[candidate] = distance
+
+        return sorted(found, key=lambda c: (found[c], -self.popularity[c], c))
 
     def known(self, words):
         """{'Gazpacho', 'gazzpacho'} => {'gazpacho'}."""
         return {w.lower() for w in words} & self.words
 
+    def _build(self):
+        deletes = {}
+        for word in self.words:
+            for delete in self._edits(word[: self.prefix_length], self.max_distance):
+                deletes.setdefault(delete, []).append(word)
+        return deletes
 
-class Word(object):
-    """Container for word-based methods."""
+    def _load_or_build(self, cache_path):
+        if cache_path is None:
+            return self._build()
 
-    def __init__(self, word):
-        """
-        Generate slices to assist with type definitions.
-
-        'the' => (('', 'the'), ('t', 'he'),
-                  ('th', 'e'), ('the', ''))
-
-        """
-        word_ = word.lower()
-        slice_range = range(len(word_) + 1)
-        self.slices = tuple((word_[:i], word_[i:]) for i in slice_range)
-        self.word = word
-
-    def _deletes(self):
-        """th."""
-        return {concat(a, b[1:]) for a, b in self.slices[:-1]}
-
-    def _transposes(self):
-        """teh."""
-        return {concat(a, reversed(b[:2]), b[2:]) for a, b in self.slices[:-2]}
-
-    def _replaces(self):
-        """tge."""
-        return {concat(a, c, b[1:]) for a, b in self.slices[:-1] for c in ALPHABET}
-
-    def _inserts(self):
-        """thwe."""
-        return {concat(a, c, b) for a, b in self.slices for c in ALPHABET}
-
-    def typos(self):
-        """Letter combinations one typo away from word."""
-        return self._deletes() | self._transposes() | self._replaces() | self._inserts()
-
-    def double_typos(self):
-        """Letter combinations two typos away from word."""
-        return {e2 for e1 in self.typos() for e2 in Word(e1).typos()}
-
-
-def concat(*args):
-    """reversed('th'), 'e' => 'hte'."""
-    try:
-        return "".join(args)
-    except TypeError:
-        return "".join(chain.from_iterable(args))
+        key = "{}\n{}\n{}".format(
+            self.max_distance, self.prefix_length, "\n".join(sorted(self.words))
+        )
+        path = cache_path.format(hashlib.sha1(key.encode("utf-8")).hexdigest())
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            pass
+
+        deletes = self._build()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(deletes, file)
+        except OSError:
+            logging.warning("Cannot write spellcorrection cache {}".format(path))
+        return deletes
+
+    @staticmethod
+    def _edits(word, distance):
+        """Return word and all strings up to distance deletes away from it."""
+        edits = {word}
+        current = {word}
+        for _ in range(distance):
+            current = {w[:i] + w[i + 1 :] for w in current for i in range(len(w))}
+            edits |= current
+        return edits
+
+
+def edit_distance(a, b, max_distance):
+    """Return the optimal string alignment distance of a and b.
+
+    Counts insertions, deletions, substitutions and transpositions of adjacent
+    characters. Returns max_distance + 1 as soon as the distance is known to be larger.
+    """
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            if (
+                previous2 is not None
+                and j > 1
+                and a[i - 1] == b[j - 2]
+                and a[i - 2] == b[j - 1]
+            ):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
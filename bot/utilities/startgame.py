@@ -24,11 +24,8 @@ def start_game(bot, user, msg, cmd):
         """Check if pleb_gametimer is not on cooldown."""
         if (time.time() - bot.last_plebgame) > bot.config.pleb_gametimer:
             # The calling user is not a mod, so we subtract 5 points.
-            if bot.ranking.get_points(user) > bot.config.config["points"]["game_start"]:
+            if bot.ranking.charge(user, int(bot.config.config["points"]["game_start"])):
                 bot.last_plebgame = time.time()  # Set pleb_gametimer
-                bot.ranking.increment_points(
-                    user, -int(bot.config.config["points"]["game_start"]), bot
-                )
                 bot.game_running = True
                 return True
             else:
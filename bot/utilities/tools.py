@@ -1,15 +1,11 @@
 """Contains utility functions."""
+import logging
+import re
 from datetime import datetime
+from functools import lru_cache
 
-
-def is_call_id_active(call_id):
-    """Check if reactor.callLater() from callID is active."""
-    if call_id is None:
-        return False
-    elif (call_id.called == 0) and (call_id.cancelled == 0):
-        return True
-    else:
-        return False
+PLACEHOLDER = re.compile(r"(<[A-Z0-9_]+>)")  # e.g. <USER>, see replace_vars
+TEMPLATE_CACHE_SIZE = 1024  # compiled messages kept, about twice the responses
 
 
 def format_list(_list):
@@ -59,6 +55,14 @@ def sanitize_user_name(username):
     return username.lower()
 
 
+def normalize_name(name):
+    """Lowercase a name and remove everything but letters and digits.
+
+    e.g.: "Leeroy Jenkins!" -> "leeroyjenkins"
+    """
+    return "".join(ch for ch in name.casefold() if ch.isalnum())
+
+
 def emote_list_to_string(emote_list):
     """Convert an EmoteList to a string."""
     # Use string.join to glue string of emotes in emoteList
@@ -66,16 +70,65 @@ def emote_list_to_string(emote_list):
     return separator.join(emote_list)
 
 
-def replace_vars(msg, args):
-    """Replace the variables in the message."""
-    oldmsg = msg
-    newmsg = msg
+class Template:
+    """A message split into text and placeholders, filled in with one join."""
+
+    __slots__ = ("segments", "slots")
+
+    def __init__(self, msg):
+        """Split the message, placeholders end up at odd indexes."""
+        self.segments = PLACEHOLDER.split(msg)
+        self.slots = range(1, len(self.segments), 2)
+
+    @property
+    def placeholders(self):
+        """Return the placeholders of the message."""
+        return {self.segments[i] for i in self.slots}
 
-    for key in args:
-        newmsg = newmsg.replace(key, str(args[key]))
-        """Check if something was replaced, otherwise something went wrong."""
-        if newmsg is oldmsg:
-            print("ERROR: Could not replace variable in string!")
+    def render(self, args):
+        """Return the message with the placeholders in args replaced.
 
-        oldmsg = newmsg
-    return newmsg
+        Placeholders missing in args stay as they are.
+        """
+        if not self.slots:
+            return self.segments[0]
+        parts = self.segments.copy()
+        for i in self.slots:
+            if parts[i] in args:
+                parts[i] = str(args[parts[i]])
+        return "".join(parts)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(msg):
+    """Return the Template of a message, messages are only split once."""
+    return Template(msg)
+
+
+def check_responses(responses, path=()):
+    """Compile all messages of responses.json ahead of their first use.
+
+    Warns about placeholders which are not described in the "args_info" of their
+    response. Responses without "args_info" are sent as they are and not checked.
+    """
+    for key, value in responses.items():
+        if not isinstance(value, dict):
+            continue
+        msg = value.get("msg")
+        if isinstance(msg, str):
+            template = compile_template(msg)
+            known = value.get("args_info")
+            if known:
+                for placeholder in sorted(template.placeholders - set(known)):
+                    logging.warning(
+                        "Unknown placeholder {} in response {}".format(
+                            placeholder, "/".join(path + (key,))
+                        )
+                    )
+        else:
+            check_responses(value, path + (key,))
+
+
+def replace_vars(msg, args):
+    """Replace the variables in the message."""
+    return compile_template(msg).render(args)
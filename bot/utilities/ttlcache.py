@@ -0,0 +1,35 @@
+"""Module that caches values for a short time."""
+import threading
+import time
+
+
+class TTLCache:
+    """Caches values for ttl seconds.
+
+    If several threads ask for the same missing value at once, it is only loaded once,
+    the others wait for that result.
+    """
+
+    def __init__(self, ttl):
+        """Initialize variables."""
+        self.ttl = ttl
+        self.data = {}  # key -> (value, expiry time)
+        self.locks = {}  # key -> lock held while loading the key
+        self.lock = threading.Lock()
+
+    def get(self, key, load):
+        """Return the value of key, calling load() if it is missing or expired."""
+        entry = self.data.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+
+        with self.lock:
+            key_lock = self.locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # Loaded by another thread while waiting for the lock
+            entry = self.data.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return entry[0]
+            value = load()
+            self.data[key] = (value, time.monotonic() + self.ttl)
+            return value
@@ -6,10 +6,16 @@ import requests
 import threading
 import urllib.parse
 
-from bottle import ServerAdapter, abort, request, route, run
+from bottle import ServerAdapter, abort, request, response, route, run
 from jwcrypto import jwk, jws, jwt
-
-from bot.paths import CONFIG_PATH
+from twisted.internet import reactor
+
+from bot import filewatcher
+from bot.data_sources.config import ConfigSource
+from bot.metrics import prometheus_text
+from bot.paths import CONFIG_PATH, REPLIES_FILE
+from bot.profiler import DEFAULT_DURATION, profiler
+from bot.scheduler import scheduler
 from bot.paths import OIDC_API, USER_ID_API
 
 # Regarding decoding:
@@ -190,6 +196,10 @@ class WebAPI(object):
         if path is None:
             abort(404, 'File "' + filename + '" not found.')
 
+        if path == REPLIES_FILE.format(bot.root):
+            # Recent changes to replies are only in the journal.
+            bot.replies.flush()
+
         with open(path) as fp:
             data = json.load(fp)
 
@@ -234,10 +244,24 @@ class WebAPI(object):
         if path is None:
             abort(404, 'File "' + filename + '" not found.')
 
+        if path == REPLIES_FILE.format(bot.root):
+            # Merges the journal, which would otherwise be replayed over the new file.
+            bot.replies.replace(json_data)
+            return
+
+        # Path template like in bot.paths, e.g. "{}configs/bot_config.json"
+        template = path.replace(bot.root, "{}", 1)
+        try:
+            ConfigSource.validate(template, json_data)
+        except ValueError as e:
+            abort(400, str(e))
+
         with open(path, mode="w") as file:
             json.dump(json_data, file, indent=4)
+        filewatcher.wrote(path)
 
-        bot.reload()
+        # The bot is only used by the reactor thread.
+        reactor.callFromThread(bot.reload, [template], {template: json_data})
 
     @staticmethod
     @route("/getTwitchUsername", method="POST")
@@ -279,6 +303,83 @@ class WebAPI(object):
         else:
             abort(400, "pause must be either 'True' or 'False'")
 
+    @staticmethod
+    @route("/profile", method="POST")
+    def profile():
+        """Start or stop the sampling profiler of the whole process."""
+        WebAPI.check_if_form_exists(["user", "bot", "auth", "action"])
+        username = urllib.parse.unquote(request.forms.user)
+        botname = urllib.parse.unquote(request.forms.bot)
+        auth = urllib.parse.unquote(request.forms.auth)
+        action = urllib.parse.unquote(request.forms.action)
+
+        bot = WebAPI.get_bot(botname)
+        if not WebAPI.has_user_permission(username, auth):
+            abort(403, "Bad authentication")
+
+        if not WebAPI.has_bot_permission(username, bot):
+            abort(403, "User doesn't have access to this bot.")
+
+        logging.info(
+            "[API] [#{}] [User: {}] /profile {}".format(botname, username, action)
+        )
+
+        if action == "start":
+            try:
+                seconds = int(request.forms.get("seconds", DEFAULT_DURATION))
+            except ValueError:
+                abort(400, "seconds must be a number")
+            path = profiler.start(seconds)
+            if path is None:
+                abort(409, "The profiler is already running.")
+        elif action == "stop":
+            path = profiler.stop()
+            if path is None:
+                abort(409, "The profiler is not running.")
+        else:
+            abort(400, "action must be either 'start' or 'stop'")
+
+        return {"path": path}
+
+    @staticmethod
+    @route("/jobs", method="POST")
+    def jobs():
+        """Return the scheduled jobs of a bot, soonest first."""
+        WebAPI.check_if_form_exists(["user", "bot", "auth"])
+        username = urllib.parse.unquote(request.forms.user)
+        botname = urllib.parse.unquote(request.forms.bot)
+        auth = urllib.parse.unquote(request.forms.auth)
+
+        bot = WebAPI.get_bot(botname)
+        if not WebAPI.has_user_permission(username, auth):
+            abort(403, "Bad authentication")
+
+        if not WebAPI.has_bot_permission(username, bot):
+            abort(403, "User doesn't have access to this bot.")
+
+        jobs = scheduler.pending(bot.config.channel)
+        return {
+            "jobs": [
+                {"name": name, "seconds": round(seconds, 1)}
+                for _, name, seconds in jobs
+            ]
+        }
+
+    @staticmethod
+    @route("/metrics")
+    def metrics():
+        """Return the metrics of the user's bots in Prometheus text format."""
+        username = urllib.parse.unquote(request.query.user)
+        auth = urllib.parse.unquote(request.query.auth)
+        if not username or not auth:
+            abort(400, "Bad Request, expecting the following query: user, auth")
+        if not WebAPI.has_user_permission(username, auth):
+            abort(403, "Bad authentication")
+
+        bots = [bot for bot in api_bots if WebAPI.has_bot_permission(username, bot)]
+        response.content_type = "text/plain; version=0.0.4; charset=utf-8"
+        return prometheus_text(bots)
+
     @staticmethod
     def check_if_form_exists(keys):
         """Get all forms for the given keys."""
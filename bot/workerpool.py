@@ -0,0 +1,194 @@
+"""Runs blocking commands in worker threads, so they never delay other messages.
+
+Commands with blocking = True are matched on the reactor thread as usual, but their
+run method is executed in a thread pool. Everything they send to chat is buffered
+and sent from the reactor thread once they are done, in the order the messages
+that triggered them came in.
+"""
+import logging
+import traceback
+from collections import Counter, defaultdict, deque
+from itertools import count
+
+from twisted.internet import reactor
+from twisted.python.threadpool import ThreadPool
+
+WORKER_THREADS = 4
+MAX_WAITING = 10  # runs of one command per bot that may wait for a free slot
+
+
+class BufferedBot:
+    """Stands in for a bot in a worker thread and buffers what is sent to chat."""
+
+    def __init__(self, bot):
+        """Initialize variables."""
+        object.__setattr__(self, "_bot", bot)
+        object.__setattr__(self, "actions", [])
+
+    def __getattr__(self, name):
+        """Read everything else from the bot."""
+        return getattr(self._bot, name)
+
+    def __setattr__(self, name, value):
+        """Write everything else to the bot."""
+        setattr(self._bot, name, value)
+
+    def write(self, msg):
+        """Buffer a message."""
+        self.actions.append(("write", (msg,)))
+
+    def whisper(self, msg, user):
+        """Buffer a whisper."""
+        self.actions.append(("whisper", (msg, user)))
+
+    def timeout(self, user, duration):
+        """Buffer a timeout."""
+        self.actions.append(("timeout", (user, duration)))
+
+    def ban(self, user):
+        """Buffer a ban."""
+        self.actions.append(("ban", (user,)))
+
+    def unban(self, user):
+        """Buffer an unban."""
+        self.actions.append(("unban", (user,)))
+
+
+class Job:
+    """One run of a blocking command."""
+
+    def __init__(self, ticket, cmd, user, msg, tag_info):
+        """Initialize variables."""
+        self.ticket = ticket
+        self.cmd = cmd
+        self.user = user
+        self.msg = msg
+        self.tag_info = tag_info
+        self.timer = None
+
+
+class BotQueue:
+    """Keeps the order of the replies of one bot."""
+
+    def __init__(self, bot):
+        """Initialize variables."""
+        self.bot = bot
+        self.tickets = count()
+        self.next_flush = 0
+        self.done = {}  # ticket -> buffered actions
+        self.running = Counter()  # cmd -> number of running jobs
+        self.waiting = defaultdict(deque)  # cmd -> jobs waiting for a free slot
+
+    def finish(self, ticket, actions):
+        """Store the actions of a job and send everything that is next in order."""
+        self.done[ticket] = actions
+        while self.next_flush in self.done:
+            for name, args in self.done.pop(self.next_flush):
+                getattr(self.bot, name)(*args)
+            self.next_flush += 1
+
+
+class WorkerPool:
+    """Executes blocking commands of all bots."""
+
+    def __init__(self, threads=WORKER_THREADS):
+        """Initialize variables."""
+        self.threadpool = ThreadPool(minthreads=0, maxthreads=threads, name="commands")
+        self.queues = {}
+
+    def submit(self, bot, cmd, user, msg, tag_info):
+        """Run a command in the pool. Must be called from the reactor thread."""
+        if not reactor.running:
+            # Nothing could be sent back, so just run it right away (e.g. in benchmarks).
+            self.run_command(bot, cmd, user, msg, tag_info)
+            return
+
+        if not self.threadpool.started:
+            self.threadpool.start()
+            reactor.addSystemEventTrigger("during", "shutdown", self.threadpool.stop)
+
+        queue = self.queues.get(bot)
+        if queue is None:
+            queue = self.queues[bot] = BotQueue(bot)
+        job = Job(next(queue.tickets), cmd, user, msg, tag_info)
+
+        if queue.running[cmd] >= cmd.max_concurrent:
+            if len(queue.waiting[cmd]) >= MAX_WAITING:
+                logging.warning(
+                    "[{}] Dropped {}, too many runs waiting.".format(
+                        bot.config.channel, cmd.__class__.__name__
+                    )
+                )
+                queue.finish(job.ticket, [])
+                return
+            queue.waiting[cmd].append(job)
+        else:
+            self._start(queue, job)
+        # The timeout includes the time spent waiting for a free slot.
+        job.timer = reactor.callLater(cmd.timeout, self._expire, queue, job)
+
+    def _start(self, queue, job):
+        queue.running[job.cmd] += 1
+        self.threadpool.callInThread(self._work, queue, job)
+
+    def _start_waiting(self, queue, cmd):
+        waiting = queue.waiting[cmd]
+        if waiting and queue.running[cmd] < cmd.max_concurrent:
+            self._start(queue, waiting.popleft())
+
+    def _work(self, queue, job):
+        """Run a job in a worker thread and hand the result to the reactor thread."""
+        bot = BufferedBot(queue.bot)
+        self.run_command(bot, job.cmd, job.user, job.msg, job.tag_info)
+        reactor.callFromThread(self._done, queue, job, bot.actions)
+
+    @staticmethod
+    def run_command(bot, cmd, user, msg, tag_info):
+        """Run a command and log any exception, since nobody else would."""
+        metrics = bot.metrics
+        try:
+            if metrics is None:
+                cmd.run(bot, user, msg, tag_info)
+            else:
+                metrics.run(cmd, bot, user, msg, tag_info)
+        except Exception:
+            logging.error(traceback.format_exc())
+
+    def _done(self, queue, job, actions):
+        """Send the replies of a finished job and start the next waiting one."""
+        if not job.timer.active():
+            # Already expired, its slot was freed then.
+            if actions:
+                logging.warning(
+                    "[{}] Dropped late replies of {}.".format(
+                        queue.bot.config.channel, job.cmd.__class__.__name__
+                    )
+                )
+            return
+        job.timer.cancel()
+        queue.running[job.cmd] -= 1
+        queue.finish(job.ticket, actions)
+        self._start_waiting(queue, job.cmd)
+
+    def _expire(self, queue, job):
+        """Give up on a job that takes too long, so later replies are not held back."""
+        logging.warning(
+            "[{}] {} took longer than {}s.".format(
+                queue.bot.config.channel, job.cmd.__class__.__name__, job.cmd.timeout
+            )
+        )
+        if job in queue.waiting[job.cmd]:
+            queue.waiting[job.cmd].remove(job)
+        else:
+            # The thread can't be stopped, but the slot is given to the next run.
+            queue.running[job.cmd] -= 1
+            self._start_waiting(queue, job.cmd)
+        bot = BufferedBot(queue.bot)
+        try:
+            job.cmd.timed_out(bot, job.user, job.msg, job.tag_info)
+        except Exception:
+            logging.error(traceback.format_exc())
+        queue.finish(job.ticket, bot.actions)
+
+
+workers = WorkerPool()
@@ -12,6 +12,7 @@ from twisted.internet import protocol, reactor
 
 from bot.bot import TwitchBot
 from bot.multibot_irc_client import MultiBotIRCClient
+from bot.paths import TWITCH_IRC_HOST, TWITCH_IRC_PORT
 from bot.web import WebAPI
 
 logging.config.fileConfig('config/logging.conf')
@@ -82,5 +83,5 @@ if __name__ == "__main__":
     signal.signal(signal.SIGINT, stop)
 
     # Start the client
-    reactor.connectTCP('irc.chat.twitch.tv', 6667, BotFactory())
+    reactor.connectTCP(TWITCH_IRC_HOST, TWITCH_IRC_PORT, BotFactory())
     reactor.run()